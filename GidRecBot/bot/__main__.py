@@ -1,14 +1,18 @@
 # GidRecBot/bot/__main__.py - добавить проверку перед запуском
 import asyncio
 import logging
-from .bot import dp, bot
+from .bot import dp, bot, send_scheduler
 from .utils.http_client import http_client
+from .utils.notifications import ModerationNotifier
+from .utils.metrics import registry, start_metrics_server, log_summary_periodically
+from shared.config import config
 import sys
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
+logger = logging.getLogger(__name__)
 
 async def check_api_connection():
     """Проверка подключения к API перед запуском бота"""
@@ -52,11 +56,35 @@ async def main():
     except Exception as e:
         logger.warning(f"⚠️ Не удалось проверить LLM статус: {e}")
     
+    # Уведомления о модерации из Redis Stream
+    notifier = ModerationNotifier(
+        bot=bot,
+        redis_url=config.REDIS_URL,
+        stream=config.REVIEW_EVENTS_STREAM,
+        moderator_ids=config.MODERATOR_CHAT_IDS
+    )
+    notifier_task = asyncio.create_task(notifier.run())
+    
+    # Метрики хендлеров: /metrics и периодическая сводка в лог
+    registry.register_gauges("bot_send_scheduler", send_scheduler.stats)
+    metrics_runner = None
+    if config.BOT_METRICS_PORT:
+        metrics_runner = await start_metrics_server(config.BOT_METRICS_PORT)
+    summary_task = None
+    if config.BOT_METRICS_SUMMARY_INTERVAL > 0:
+        summary_task = asyncio.create_task(log_summary_periodically(config.BOT_METRICS_SUMMARY_INTERVAL))
+    
     try:
         await dp.start_polling(bot)
     except Exception as e:
         logger.error(f"❌ Ошибка в боте: {e}")
     finally:
+        notifier_task.cancel()
+        if summary_task:
+            summary_task.cancel()
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await notifier.close()
         await http_client.close()
 
 if __name__ == "__main__":
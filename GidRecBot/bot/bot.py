@@ -2,8 +2,46 @@
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from shared.config import config
+from .middlewares.rate_limit import RateLimitMiddleware
+from .middlewares.logging import LoggingMiddleware
+from .middlewares.metrics import MetricsMiddleware
+from .utils.rate_limiter import SendScheduler
+from .utils.metrics import registry
+from .handlers import (
+    main_router,
+    register_router,
+    moderation_router,
+    review_router,
+    inline_router,
+    fallback_router,
+    llm_router
+)
 
 # Инициализация бота и диспетчера
 bot = Bot(token=config.BOT_TOKEN)
 storage = MemoryStorage()
-dp = Dispatcher(storage=storage)
\ No newline at end of file
+dp = Dispatcher(storage=storage)
+
+# Все исходящие запросы в чаты идут через планировщик с лимитами Telegram
+send_scheduler = SendScheduler(
+    global_rate=config.BOT_GLOBAL_RATE_LIMIT,
+    chat_rate=config.BOT_CHAT_RATE_LIMIT,
+    chat_burst=config.BOT_CHAT_BURST
+)
+bot.session.middleware(RateLimitMiddleware(send_scheduler))
+
+# Роутеры: llm_router ловит любой текст, поэтому подключается последним
+dp.include_routers(
+    main_router.router,
+    register_router.router,
+    moderation_router.router,
+    review_router.router,
+    inline_router.router,
+    fallback_router.router,
+    llm_router.router
+)
+
+# Семплированный текстовый лог и метрики хендлеров
+for observer in (dp.message, dp.callback_query, dp.inline_query):
+    observer.outer_middleware(LoggingMiddleware(sample_rate=config.BOT_LOG_SAMPLE_RATE))
+    observer.middleware(MetricsMiddleware(registry))
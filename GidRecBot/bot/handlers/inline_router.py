@@ -0,0 +1,68 @@
+# bot/handlers/inline_router.py
+from aiogram import Router
+from aiogram.types import InlineQuery, InlineQueryResultArticle, InputTextMessageContent
+from shared.config import config
+from ..keyboards.inline import get_place_keyboard
+from ..utils.cache import TTLCache
+from ..utils.http_client import http_client
+import logging
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+# tg_id → город пользователя, чтобы не ходить в /auth на каждый символ запроса
+user_city_cache = TTLCache(ttl=600)
+
+
+async def _get_user_city(tg_id: int) -> str:
+    city = user_city_cache.get(tg_id)
+    if city is None:
+        try:
+            user = await http_client.get_user_by_tg_id(tg_id)
+        except Exception:
+            # Не кэшируем: после регистрации или сбоя API город подтянется сразу
+            return "Moscow"
+        city = user.get("preferences", {}).get("city", "Moscow")
+        user_city_cache.set(tg_id, city)
+    return city
+
+
+# 🔎 Inline-режим: @bot кофе
+@router.inline_query()
+async def inline_search(inline_query: InlineQuery):
+    """Подсказки мест по префиксу названия"""
+    query = inline_query.query.strip()
+    if len(query) < 2:
+        await inline_query.answer([], cache_time=config.INLINE_CACHE_TIME, is_personal=True)
+        return
+    
+    city = await _get_user_city(inline_query.from_user.id)
+    
+    try:
+        places = await http_client.autocomplete_places(query=query, city=city, limit=20)
+    except Exception as e:
+        logger.error(f"Inline search failed for «{query}»: {e}")
+        places = []
+    
+    results = []
+    for place in places:
+        rating = place.get("rating", 0.0)
+        address = place.get("address") or "Адрес не указан"
+        results.append(InlineQueryResultArticle(
+            id=str(place["id"]),
+            title=place["name"],
+            description=f"⭐ {rating:.1f} ({place.get('rating_count', 0)}) · {place.get('category', '')} · {address[:40]}",
+            input_message_content=InputTextMessageContent(
+                message_text=(
+                    f"📍 *{place['name']}*\n\n"
+                    f"⭐ {rating:.1f} ({place.get('rating_count', 0)})\n"
+                    f"🏷️ {place.get('category', 'без категории')}\n"
+                    f"📌 {address}"
+                ),
+                parse_mode="Markdown"
+            ),
+            reply_markup=get_place_keyboard(place["id"])
+        ))
+    
+    # Ответы кэширует сам Telegram (по тексту запроса, отдельно для каждого пользователя)
+    await inline_query.answer(results, cache_time=config.INLINE_CACHE_TIME, is_personal=True)
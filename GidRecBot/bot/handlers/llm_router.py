@@ -1,87 +1,114 @@
 # bot/handlers/llm_router.py
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import default_state
+from aiogram.exceptions import TelegramBadRequest
 from ..utils.http_client import http_client
-from ..keyboards.inline import get_place_keyboard
+from ..keyboards.inline import get_places_page_keyboard
 import logging
+import time
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 3
+NEARBY_RADIUS_M = 2000
+# Сколько секунд присланная геопозиция используется для текстовых запросов
+POINT_TTL_S = 3600
 
-async def show_places_page(message: Message, state: FSMContext, new_search: bool = False):
-    """Показать страницу мест (3 за раз)"""
+
+def _format_place(idx: int, place: dict) -> str:
+    """Карточка места в виде блока текста"""
+    rating = place.get("rating", 0.0)
+    count = place.get("rating_count", 0)
+    price_level = place.get("price_level", 2)
+    
+    # Форматируем рейтинг
+    stars = "⭐" * int(rating) + ("½" if rating % 1 >= 0.5 else "")
+    stars_text = f"{stars} {rating:.1f} ({count})"
+    
+    # Форматируем уровень цен
+    price_display = "💲" * price_level
+    
+    distance = place.get("distance_m")
+    distance_text = f"🚶 {_format_distance(distance)}\n" if distance is not None else ""
+    
+    return (
+        f"*{idx}. {place['name']}*\n"
+        f"{distance_text}"
+        f"{(place.get('description') or '')[:100]}...\n"
+        f"⭐ {stars_text}\n"
+        f"🏷️ {place.get('category', 'без категории')}   💰 {price_display}\n"
+        f"📌 {(place.get('address') or 'Адрес не указан')[:50]}"
+    )
+
+
+def _format_distance(meters: int) -> str:
+    return f"{meters} м" if meters < 1000 else f"{meters / 1000:.1f} км"
+
+
+async def show_places_page(
+    message: Message,
+    state: FSMContext,
+    new_search: bool = False,
+    edit: bool = False
+):
+    """Показать страницу мест (3 за раз) одним сообщением.
+    
+    При edit=True сообщение страницы редактируется на месте,
+    а не удаляется и отправляется заново.
+    """
     data = await state.get_data()
     places = data.get("places", [])
     offset = data.get("offset", 0)
     query = data.get("query", "")
     location = data.get("location", "Moscow")
     
-    page_places = places[offset:offset + 3]
+    page_places = places[offset:offset + PAGE_SIZE]
     if not page_places:
-        await message.answer("🔚 *Больше нет рекомендаций.*", parse_mode="Markdown")
+        # Страница под кнопками уже неактуальна — заменяем её, а не оставляем клавиатуру
+        if edit:
+            await message.edit_text("🔚 *Больше нет рекомендаций.*", parse_mode="Markdown")
+        else:
+            await message.answer("🔚 *Больше нет рекомендаций.*", parse_mode="Markdown")
         if new_search:
             await state.clear()
         return
     
-    # Показываем места
-    for idx, place in enumerate(page_places, 1):
-        place_id = place.get("id", "")
-        rating = place.get("rating", 0.0)
-        count = place.get("rating_count", 0)
-        price_level = place.get("price_level", 2)
-        
-        # Форматируем рейтинг
-        stars = "⭐" * int(rating) + ("½" if rating % 1 >= 0.5 else "")
-        stars_text = f"{stars} {rating:.1f} ({count})"
-        
-        # Форматируем уровень цен
-        price_display = "💲" * price_level
-        
-        # Формируем сообщение
-        place_text = (
-            f"📍 *{place['name']}*\n\n"
-            f"{place.get('description', '')[:100]}...\n\n"
-            f"⭐ {stars_text}\n"
-            f"🏷️ {place.get('category', 'без категории')}\n"
-            f"💰 {price_display}\n"
-            f"📌 {place.get('address', 'Адрес не указан')[:50]}"
-        )
-        
-        await message.answer(
-            place_text,
-            reply_markup=get_place_keyboard(place_id),
-            parse_mode="Markdown"
-        )
-    
-    # Пагинация
-    buttons = []
-    if offset > 0:
-        buttons.append(InlineKeyboardButton(text="⬅️ Назад", callback_data="page:prev"))
-    if offset + 3 < len(places):
-        buttons.append(InlineKeyboardButton(text="➡️ Ещё", callback_data="page:next"))
-    
-    if buttons:
-        await message.answer(
-            f"📍 *Рекомендации для {location}*\n"
-            f"🔍 *Запрос:* «{query}»\n"
-            f"📋 *Найдено мест:* {len(places)}\n"
-            f"📄 *Страница:* {offset//3 + 1}/{(len(places) + 2)//3}",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[buttons]),
-            parse_mode="Markdown"
-        )
+    # Заголовок + все карточки страницы в одном сообщении
+    cards = "\n\n".join(
+        _format_place(offset + idx, place)
+        for idx, place in enumerate(page_places, 1)
+    )
+    text = (
+        f"📍 *Рекомендации для {location}*\n"
+        f"🔍 *Запрос:* «{query}»\n"
+        f"📄 *Страница:* {offset // PAGE_SIZE + 1}/{(len(places) + PAGE_SIZE - 1) // PAGE_SIZE}"
+        f" · найдено мест: {len(places)}\n\n"
+        f"{cards}"
+    )
     
     if new_search:
-        await message.answer(
-            "💡 *Что дальше?*\n"
-            "• Нажмите на кнопку '✍️ Оставить отзыв' под понравившимся местом\n"
+        text += (
+            "\n\n💡 *Что дальше?*\n"
+            "• Нажмите «✍️» с номером места, чтобы оставить отзыв\n"
             "• Напишите новый запрос для поиска\n"
-            "• Используйте кнопки пагинации для просмотра других мест",
-            parse_mode="Markdown"
+            "• Используйте кнопки пагинации для просмотра других мест"
         )
+    
+    keyboard = get_places_page_keyboard(page_places, offset, len(places), PAGE_SIZE)
+    
+    if edit:
+        try:
+            await message.edit_text(text, reply_markup=keyboard, parse_mode="Markdown")
+        except TelegramBadRequest as e:
+            # Повторное нажатие на крайней странице — содержимое не изменилось
+            if "message is not modified" not in str(e):
+                raise
+    else:
+        await message.answer(text, reply_markup=keyboard, parse_mode="Markdown")
 
 
 # 🤖 Основной хендлер: любой текст → LLM + пагинация
@@ -116,6 +143,10 @@ async def handle_natural_query(message: Message, state: FSMContext):
         
         location = user.get("preferences", {}).get("city", "Moscow")
         username = message.from_user.username or message.from_user.first_name or "Пользователь"
+        # Недавно присланная геопозиция (если была) — рекомендации рядом с ней
+        data = await state.get_data()
+        point = data.get("point") if time.time() - data.get("point_at", 0) < POINT_TTL_S else None
+        point = point or (None, None)
         
         # 2. Определяем тип запроса и получаем рекомендации
         if any(word in text.lower() for word in ["хочу", "нужно", "ищу", "посоветуй", "рекомендуй", "где"]):
@@ -123,7 +154,9 @@ async def handle_natural_query(message: Message, state: FSMContext):
             response = await http_client.recommend(
                 tg_id=message.from_user.id,
                 query=text,
-                limit=10
+                limit=10,
+                latitude=point[0],
+                longitude=point[1]
             )
             recommendation_text = response.get("text", "")
             places = response.get("places", [])
@@ -132,7 +165,9 @@ async def handle_natural_query(message: Message, state: FSMContext):
             response = await http_client.search_places(
                 tg_id=message.from_user.id,
                 query=text,
-                limit=10
+                limit=10,
+                latitude=point[0],
+                longitude=point[1]
             )
             recommendation_text = response.get("text", f"Результаты поиска по запросу «{text}»")
             places = response.get("places", [])
@@ -187,16 +222,51 @@ async def handle_natural_query(message: Message, state: FSMContext):
             )
 
 
+# 📍 Геопозиция → места рядом (та же пагинация, что и у поиска)
+@router.message(F.location, StateFilter(default_state))
+async def handle_location(message: Message, state: FSMContext):
+    """Места рядом с присланной точкой"""
+    latitude = message.location.latitude
+    longitude = message.location.longitude
+    
+    try:
+        places = await http_client.get_nearby_places(latitude, longitude, radius=NEARBY_RADIUS_M, limit=15)
+    except Exception as e:
+        logger.exception(f"❌ Ошибка поиска мест рядом: {e}")
+        await message.answer(
+            "❌ *Не удалось найти места рядом.* Попробуйте позже.",
+            parse_mode="Markdown"
+        )
+        return
+    
+    if not places:
+        await message.answer(
+            f"🤷 *Рядом ничего не нашлось* (в радиусе {_format_distance(NEARBY_RADIUS_M)}).\n\n"
+            "Попробуйте отправить другую точку или напишите запрос текстом.",
+            parse_mode="Markdown"
+        )
+        return
+    
+    await state.update_data(
+        places=places,
+        query=f"рядом с вами, до {_format_distance(NEARBY_RADIUS_M)}",
+        offset=0,
+        location="вашей геопозиции",
+        point=(latitude, longitude),
+        point_at=time.time()
+    )
+    await show_places_page(message, state, new_search=True)
+
+
 # 📖 Пагинация: Назад
 @router.callback_query(F.data == "page:prev")
 async def page_prev(callback: CallbackQuery, state: FSMContext):
     """Предыдущая страница"""
     data = await state.get_data()
-    data["offset"] = max(0, data["offset"] - 3)
+    data["offset"] = max(0, data.get("offset", 0) - PAGE_SIZE)
     await state.update_data(offset=data["offset"])
     
-    await callback.message.delete()
-    await show_places_page(callback.message, state)
+    await show_places_page(callback.message, state, edit=True)
     await callback.answer("⬅️ Предыдущая страница")
 
 
@@ -205,11 +275,10 @@ async def page_prev(callback: CallbackQuery, state: FSMContext):
 async def page_next(callback: CallbackQuery, state: FSMContext):
     """Следующая страница"""
     data = await state.get_data()
-    data["offset"] += 3
+    data["offset"] = data.get("offset", 0) + PAGE_SIZE
     await state.update_data(offset=data["offset"])
     
-    await callback.message.delete()
-    await show_places_page(callback.message, state)
+    await show_places_page(callback.message, state, edit=True)
     await callback.answer("➡️ Следующая страница")
 
 
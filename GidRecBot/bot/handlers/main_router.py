@@ -14,6 +14,7 @@ async def cmd_help(message: Message):
         "• `/ask` — получить рекомендацию от ИИ\n"
         "• `/review` — оставить отзыв (после просмотра места)\n"
         "• `/me` — посмотреть профиль\n"
+        "• 📍 отправьте геопозицию — покажу места рядом\n"
         "• `/cancel` — отмена действия\n\n"
         "Для начала работы выполните `/start`.",
         parse_mode="Markdown"
@@ -3,6 +3,7 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
+from aiogram.exceptions import TelegramForbiddenError
 from ..states.review import ReviewStates
 from ..keyboards.inline import get_rating_keyboard, get_place_keyboard
 from ..utils.http_client import http_client
@@ -34,16 +35,25 @@ async def start_review(callback: CallbackQuery, state: FSMContext):
         await callback.answer("❌ Ошибка при получении информации о месте")
         return
     
+    prompt = f"⭐ *Оцените «{place['name']}» от 1 до 5:*"
+    if callback.message:
+        # Отдельным сообщением: страница с карточками и пагинацией остаётся на месте
+        await callback.message.answer(prompt, reply_markup=get_rating_keyboard(), parse_mode="Markdown")
+    else:
+        # Кнопка под сообщением из inline-режима (чужой чат): отзыв — в личке с ботом.
+        # FSM для такого callback привязан к user_id, т.е. к этой же личке
+        try:
+            await callback.bot.send_message(
+                callback.from_user.id, prompt, reply_markup=get_rating_keyboard(), parse_mode="Markdown"
+            )
+        except TelegramForbiddenError:
+            await callback.answer("✍️ Сначала откройте бота и нажмите /start", show_alert=True)
+            return
+    
     # Сохраняем place_id в состоянии
     await state.update_data(place_id=place_id, place_name=place.get("name", "Место"))
     await state.set_state(ReviewForm.rating)
-    
-    await callback.message.edit_text(
-        f"⭐ *Оцените «{place['name']}» от 1 до 5:*",
-        reply_markup=get_rating_keyboard(),
-        parse_mode="Markdown"
-    )
-    await callback.answer()
+    await callback.answer("✍️ Продолжим в личных сообщениях" if not callback.message else None)
 
 
 @router.callback_query(ReviewForm.rating, F.data.startswith("rate:"))
@@ -31,4 +31,24 @@ def get_rating_keyboard() -> InlineKeyboardMarkup:
             InlineKeyboardButton(text="⭐⭐⭐⭐⭐", callback_data="rate:5"),
         ],
         [InlineKeyboardButton(text="❌ Отмена", callback_data="cancel")]
-    ])
\ No newline at end of file
+    ])
+
+def get_places_page_keyboard(places: list, offset: int, total: int, page_size: int = 3) -> InlineKeyboardMarkup:
+    """Общая клавиатура для страницы мест: отзыв по каждому месту + пагинация"""
+    rows = [
+        [InlineKeyboardButton(
+            text=f"✍️ {offset + idx}. {place.get('name', 'Место')[:30]}",
+            callback_data=f"review:{place.get('id', '')}"
+        )]
+        for idx, place in enumerate(places, 1)
+    ]
+    
+    pagination = []
+    if offset > 0:
+        pagination.append(InlineKeyboardButton(text="⬅️ Назад", callback_data="page:prev"))
+    if offset + page_size < total:
+        pagination.append(InlineKeyboardButton(text="➡️ Ещё", callback_data="page:next"))
+    if pagination:
+        rows.append(pagination)
+    
+    return InlineKeyboardMarkup(inline_keyboard=rows)
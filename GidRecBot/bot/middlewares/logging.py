@@ -1,12 +1,21 @@
 # bot/middlewares/logging.py
 import logging
+import random
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 
 logger = logging.getLogger(__name__)
 
 class LoggingMiddleware(BaseMiddleware):
+    """Текстовый лог входящих событий с семплированием (sample_rate от 0 до 1)"""
+    
+    def __init__(self, sample_rate: float = 1.0):
+        self.sample_rate = sample_rate
+    
     async def __call__(self, handler, event, data):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return await handler(event, data)
+        
         if isinstance(event, Message):
             user = event.from_user
             logger.info(f"[{user.id}@{user.username or 'anon'}] {event.text or '[media]'}")
@@ -0,0 +1,36 @@
+# bot/middlewares/metrics.py
+import time
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import SkipHandler
+from ..utils.metrics import MetricsRegistry, backend_calls
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Замеряет хендлер: задержку, исход и запросы к бэкенду за апдейт.
+
+    Регистрируется как inner-middleware, поэтому знает, какой хендлер сработал.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+
+    async def __call__(self, handler, event, data):
+        handler_obj = data.get("handler")
+        callback = getattr(handler_obj, "callback", None)
+        name = getattr(callback, "__name__", "unknown")
+
+        calls = []
+        token = backend_calls.set(calls)
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await handler(event, data)
+        except SkipHandler:
+            outcome = "skipped"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            backend_calls.reset(token)
+            self.registry.observe(name, time.perf_counter() - started, outcome, calls)
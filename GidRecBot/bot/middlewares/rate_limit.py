@@ -0,0 +1,38 @@
+# bot/middlewares/rate_limit.py
+import logging
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from ..utils.rate_limiter import SendScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Пропускает все исходящие запросы в чаты через SendScheduler.
+
+    Подключается к сессии бота, поэтому действует на любые
+    message.answer / edit_text / delete из хендлеров.
+    """
+
+    def __init__(self, scheduler: SendScheduler, max_retries: int = 3):
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    async def __call__(self, make_request, bot, method):
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            # getUpdates, answerCallbackQuery и т.п. не попадают под лимиты чатов
+            return await make_request(bot, method)
+
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"Flood control for chat {chat_id}: retry after {e.retry_after}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                self.scheduler.penalize(chat_id, e.retry_after)
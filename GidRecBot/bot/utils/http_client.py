@@ -1,9 +1,11 @@
 # GidRecBot/bot/utils/http_client.py
 import httpx
 import logging
+import time
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from shared.config import config
+from .metrics import record_backend_call
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +25,15 @@ class HTTPClient:
         self,
         method: str,
         endpoint: str,
+        client_id: Optional[int] = None,
         **kwargs
     ) -> Optional[Dict[str, Any]]:
         """Общий метод для выполнения запросов"""
         url = f"{self.base_url}{endpoint}"
+        started = time.perf_counter()
+        if client_id is not None:
+            # Бэкенд по нему читает с primary сразу после записи пользователя
+            kwargs["headers"] = {**kwargs.get("headers", {}), "X-Client-Id": str(client_id)}
         
         try:
             response = await self.client.request(method, url, **kwargs)
@@ -46,6 +53,8 @@ class HTTPClient:
         except Exception as e:
             logger.error(f"Request error: {e}")
             raise
+        finally:
+            record_backend_call(f"{method} {endpoint}", time.perf_counter() - started)
     
     # ========== АУТЕНТИФИКАЦИЯ ==========
     
@@ -63,6 +72,7 @@ class HTTPClient:
         response = await self._make_request(
             "POST",
             "/api/v1/auth/",
+            client_id=tg_id,
             json=data
         )
         
@@ -78,7 +88,8 @@ class HTTPClient:
         """
         response = await self._make_request(
             "GET",
-            f"/api/v1/auth/by_tg/{tg_id}"
+            f"/api/v1/auth/by_tg/{tg_id}",
+            client_id=tg_id
         )
         
         if response:
@@ -132,6 +143,48 @@ class HTTPClient:
             logger.error(f"Error getting place {place_id}: {e}")
             return None
     
+    async def get_nearby_places(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: int = 2000,
+        category: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Места рядом с точкой (ближе и с рейтингом выше — первыми)
+        GET /api/v1/places/nearby/
+        """
+        params = {"lat": latitude, "lon": longitude, "radius": radius, "limit": limit}
+        if category:
+            params["category"] = category
+        
+        response = await self._make_request(
+            "GET",
+            "/api/v1/places/nearby/",
+            params=params
+        )
+        
+        return response or []
+    
+    async def autocomplete_places(
+        self,
+        query: str,
+        city: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Подсказки мест по префиксу названия
+        GET /api/v1/places/autocomplete/
+        """
+        response = await self._make_request(
+            "GET",
+            "/api/v1/places/autocomplete/",
+            params={"q": query, "city": city, "limit": limit}
+        )
+        
+        return response or []
+    
     # ========== ОТЗЫВЫ ==========
     
     async def create_review(
@@ -155,6 +208,7 @@ class HTTPClient:
         response = await self._make_request(
             "POST",
             "/api/v1/reviews/",
+            client_id=tg_id,
             json=data
         )
         
@@ -187,7 +241,9 @@ class HTTPClient:
         self,
         tg_id: int,
         query: str,
-        limit: int = 5
+        limit: int = 5,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Получить рекомендации через LLM-чат
@@ -198,10 +254,14 @@ class HTTPClient:
             "limit": limit,
             "telegram_id": tg_id
         }
+        if latitude is not None and longitude is not None:
+            # Точка пользователя: места ранжируются по близости
+            data.update(latitude=latitude, longitude=longitude)
         
         response = await self._make_request(
             "POST",
             "/api/v1/recommendations/chat",
+            client_id=tg_id,
             json=data
         )
         
@@ -214,7 +274,9 @@ class HTTPClient:
         self,
         tg_id: int,
         query: str,
-        limit: int = 5
+        limit: int = 5,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Поиск мест по запросу
@@ -225,10 +287,14 @@ class HTTPClient:
             "limit": limit,
             "telegram_id": tg_id
         }
+        if latitude is not None and longitude is not None:
+            # Точка пользователя: места ранжируются по близости
+            data.update(latitude=latitude, longitude=longitude)
         
         response = await self._make_request(
             "POST",
             "/api/v1/recommendations/search",
+            client_id=tg_id,
             json=data
         )
         
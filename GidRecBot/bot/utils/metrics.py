@@ -0,0 +1,164 @@
+# GidRecBot/bot/utils/metrics.py
+"""
+Метрики обработчиков бота.
+
+Собирает по каждому хендлеру число вызовов по исходам, гистограмму задержки
+и число запросов к бэкенду. Отдаёт данные в формате Prometheus по /metrics и
+периодически пишет сводку в лог одной JSON-строкой.
+"""
+import asyncio
+import json
+import logging
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Запросы к бэкенду в рамках текущего апдейта: [(endpoint, секунды), ...]
+backend_calls: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("backend_calls", default=None)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def record_backend_call(endpoint: str, elapsed: float):
+    """Учесть запрос к бэкенду (вызывается из HTTPClient)"""
+    calls = backend_calls.get()
+    if calls is not None:
+        calls.append((endpoint, elapsed))
+
+
+class HandlerStats:
+    """Агрегаты одного хендлера"""
+
+    def __init__(self):
+        self.outcomes: Dict[str, int] = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.backend_calls = 0
+        self.backend_seconds = 0.0
+
+    def observe(self, latency: float, outcome: str, calls: List[Tuple[str, float]]):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        idx = bisect_left(LATENCY_BUCKETS, latency)
+        if idx < len(self.buckets):
+            self.buckets[idx] += 1
+        self.latency_sum += latency
+        self.count += 1
+        self.backend_calls += len(calls)
+        self.backend_seconds += sum(elapsed for _, elapsed in calls)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Оценка перцентиля по гистограмме (верхняя граница бакета)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Реестр метрик хендлеров"""
+
+    def __init__(self):
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.gauges: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def observe(self, handler: str, latency: float, outcome: str, calls: List[Tuple[str, float]]):
+        stats = self.handlers.get(handler)
+        if stats is None:
+            stats = self.handlers[handler] = HandlerStats()
+        stats.observe(latency, outcome, calls)
+
+    def register_gauges(self, prefix: str, source: Callable[[], Dict[str, float]]):
+        """Подключить внешние метрики (например, SendScheduler.stats)"""
+        self.gauges[prefix] = source
+
+    def summary(self) -> Dict[str, Dict]:
+        """Сводка для лога"""
+        result = {}
+        for name, stats in self.handlers.items():
+            result[name] = {
+                "count": stats.count,
+                "outcomes": dict(stats.outcomes),
+                "avg_ms": round(stats.latency_sum / stats.count * 1000, 1) if stats.count else 0,
+                "p95_le_s": stats.percentile(0.95),
+                "backend_calls_per_update": round(stats.backend_calls / stats.count, 2) if stats.count else 0,
+            }
+        return result
+
+    def render_prometheus(self) -> str:
+        """Текстовый формат Prometheus"""
+        lines = [
+            "# HELP bot_handler_updates_total Updates processed by handler and outcome",
+            "# TYPE bot_handler_updates_total counter",
+        ]
+        for name, stats in self.handlers.items():
+            for outcome, n in stats.outcomes.items():
+                lines.append(f'bot_handler_updates_total{{handler="{name}",outcome="{outcome}"}} {n}')
+
+        lines += [
+            "# HELP bot_handler_latency_seconds Handler latency",
+            "# TYPE bot_handler_latency_seconds histogram",
+        ]
+        for name, stats in self.handlers.items():
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += n
+                lines.append(f'bot_handler_latency_seconds_bucket{{handler="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'bot_handler_latency_seconds_bucket{{handler="{name}",le="+Inf"}} {stats.count}')
+            lines.append(f'bot_handler_latency_seconds_sum{{handler="{name}"}} {stats.latency_sum:.6f}')
+            lines.append(f'bot_handler_latency_seconds_count{{handler="{name}"}} {stats.count}')
+
+        lines += [
+            "# HELP bot_handler_backend_calls_total Backend API calls made by handler",
+            "# TYPE bot_handler_backend_calls_total counter",
+        ]
+        for name, stats in self.handlers.items():
+            lines.append(f'bot_handler_backend_calls_total{{handler="{name}"}} {stats.backend_calls}')
+        lines += [
+            "# HELP bot_handler_backend_seconds_total Time spent in backend API calls by handler",
+            "# TYPE bot_handler_backend_seconds_total counter",
+        ]
+        for name, stats in self.handlers.items():
+            lines.append(f'bot_handler_backend_seconds_total{{handler="{name}"}} {stats.backend_seconds:.6f}')
+
+        for prefix, source in self.gauges.items():
+            for key, value in source().items():
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+async def _metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(text=registry.render_prometheus(), content_type="text/plain")
+
+
+async def start_metrics_server(port: int) -> web.AppRunner:
+    """Поднять HTTP-сервер с /metrics в процессе бота"""
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"📈 Метрики доступны на :{port}/metrics")
+    return runner
+
+
+async def log_summary_periodically(interval: float):
+    """Раз в interval секунд писать сводку метрик в лог"""
+    while True:
+        await asyncio.sleep(interval)
+        if registry.handlers:
+            logger.info(f"metrics {json.dumps(registry.summary(), ensure_ascii=False)}")
@@ -0,0 +1,232 @@
+# GidRecBot/bot/utils/notifications.py
+"""
+Доставка уведомлений о модерации отзывов.
+
+Бэкенд публикует смену статуса отзыва в Redis Stream, бот читает его через
+consumer group. Новые записи читаются всегда; неподтверждённые (после ошибки
+или рестарта) перечитываются раз в RETRY_DELAY, а после MAX_DELIVERIES
+попыток переносятся в dead-letter поток и подтверждаются — одна «ядовитая»
+запись не останавливает остальные уведомления.
+
+Каждая пара (событие, получатель) отмечается в Redis после отправки, поэтому
+повторная доставка записи не дублирует сообщения (кроме сбоя ровно между
+отправкой и отметкой).
+"""
+import asyncio
+import logging
+import re
+import socket
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
+
+from .rate_limiter import notification_priority
+
+logger = logging.getLogger(__name__)
+
+STATUS_TEXTS = {
+    "approved": "✅ *Ваш отзыв одобрен модератором и опубликован!*",
+    "rejected": "❌ *Ваш отзыв отклонён модератором.*",
+}
+
+_MARKDOWN_SPECIAL = re.compile(r"([_*`\[])")
+
+
+def _escape(text: str) -> str:
+    """Экранировать пользовательский текст для legacy Markdown"""
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+class ModerationNotifier:
+    """Consumer group над потоком событий отзывов"""
+
+    DELIVERED_TTL = 7 * 24 * 3600
+    RETRY_DELAY = 5
+    MAX_DELIVERIES = 5
+
+    def __init__(
+        self,
+        bot: Bot,
+        redis_url: str,
+        stream: str,
+        moderator_ids: List[int],
+        group: str = "bot-notifier",
+        consumer: Optional[str] = None,
+        batch_size: int = 50,
+        block_ms: int = 5000,
+        dead_letter_stream: Optional[str] = None
+    ):
+        self.bot = bot
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.stream = stream
+        self.moderator_ids = moderator_ids
+        self.group = group
+        self.consumer = consumer or socket.gethostname()
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.dead_letter_stream = dead_letter_stream or f"{stream}:dead"
+
+    async def run(self):
+        """Основной цикл: новые записи, а раз в RETRY_DELAY — неподтверждённые"""
+        while True:
+            try:
+                await self._ensure_group()
+                break
+            except Exception as e:
+                logger.error(f"Notification consumer group setup failed: {e}")
+                await asyncio.sleep(self.RETRY_DELAY)
+        logger.info(f"📬 Уведомления о модерации: поток {self.stream}, группа {self.group}")
+
+        loop = asyncio.get_running_loop()
+        next_retry = 0.0
+        while True:
+            try:
+                if loop.time() >= next_retry:
+                    await self._retry_pending()
+                    next_retry = loop.time() + self.RETRY_DELAY
+
+                response = await self.redis.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {self.stream: ">"},
+                    count=self.batch_size,
+                    block=self.block_ms
+                )
+                # Недоставленные записи остаются в pending до следующего _retry_pending
+                await self._handle_batch(response[0][1] if response else [])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification consumer error: {e}")
+                await asyncio.sleep(self.RETRY_DELAY)
+
+    async def close(self):
+        await self.redis.close()
+
+    async def _ensure_group(self):
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="$", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _retry_pending(self):
+        """Перечитать записи, выданные этому consumer, но не подтверждённые"""
+        start = "0"
+        while True:
+            # Чтение истории (id вместо ">") увеличивает счётчик доставок записи
+            response = await self.redis.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.stream: start},
+                count=self.batch_size
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                return
+            start = entries[-1][0]
+
+            pending = await self.redis.xpending_range(
+                self.stream,
+                self.group,
+                min=entries[0][0],
+                max=start,
+                count=len(entries),
+                consumername=self.consumer
+            )
+            deliveries = {item["message_id"]: item["times_delivered"] for item in pending}
+
+            retry = []
+            for entry_id, fields in entries:
+                if fields and deliveries.get(entry_id, 0) <= self.MAX_DELIVERIES:
+                    retry.append((entry_id, fields))
+                else:
+                    await self._dead_letter(entry_id, fields, deliveries.get(entry_id, 0))
+            await self._handle_batch(retry)
+
+    async def _dead_letter(self, entry_id: str, fields: Optional[Dict[str, str]], deliveries: int):
+        """Убрать запись из pending; содержимое — в dead-letter поток для разбора"""
+        if fields:
+            await self.redis.xadd(
+                self.dead_letter_stream,
+                {**fields, "entry_id": entry_id, "deliveries": str(deliveries)}
+            )
+            logger.error(
+                f"☠️ Notification {entry_id} moved to {self.dead_letter_stream} after {deliveries} attempts"
+            )
+        # Без полей — запись уже вытеснена из потока (MAXLEN), доставлять нечего
+        await self.redis.xack(self.stream, self.group, entry_id)
+
+    async def _handle_batch(self, entries: List[Tuple[str, Dict[str, str]]]):
+        """Разослать пачку событий; доставленные подтвердить"""
+        if not entries:
+            return
+
+        with notification_priority():
+            results = await asyncio.gather(
+                *(self._deliver(fields) for _, fields in entries),
+                return_exceptions=True
+            )
+
+        acked = []
+        for (entry_id, _), result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Notification {entry_id} not delivered: {result}")
+            else:
+                acked.append(entry_id)
+
+        if acked:
+            await self.redis.xack(self.stream, self.group, *acked)
+
+    async def _deliver(self, event: Dict[str, str]):
+        """Отправить событие всем получателям (идемпотентно)"""
+        for chat_id, text in self._build_messages(event):
+            key = f"notify:sent:{event['event_id']}:{chat_id}"
+            if await self.redis.exists(key):
+                continue  # Уже доставлено раньше
+            try:
+                await self.bot.send_message(chat_id, text, parse_mode="Markdown")
+            except (TelegramForbiddenError, TelegramBadRequest) as e:
+                # Пользователь заблокировал бота — повторять бессмысленно
+                logger.warning(f"Notification to {chat_id} dropped: {e}")
+            # Отметка после отправки: сбой посередине даст повтор, а не потерю
+            await self.redis.set(key, "1", ex=self.DELIVERED_TTL)
+
+    def _build_messages(self, event: Dict[str, str]) -> List[Tuple[int, str]]:
+        """Кому и что отправить по событию"""
+        status = event.get("status", "")
+        review_id = event.get("review_id", "")
+        place = _escape(event.get("place_name") or "место")
+        messages = []
+
+        # Автору — решение модератора
+        if event.get("actor") == "moderator" and status in STATUS_TEXTS:
+            text = (
+                f"{STATUS_TEXTS[status]}\n\n"
+                f"⭐ *Оценка:* {event.get('rating', '')}/5\n"
+                f"📝 *Отзыв:* {_escape(event.get('text', '')[:100])}...\n"
+            )
+            if status == "rejected" and event.get("notes"):
+                text += f"💬 *Комментарий:* {_escape(event['notes'])}\n"
+            text += f"\nID отзыва: `{review_id}`"
+            messages.append((int(event["author_telegram_id"]), text))
+
+        # Модераторам — новый отзыв в очереди
+        if status in ("pending", "flagged_by_llm"):
+            flag = "🚩 *Отзыв помечен LLM*" if status == "flagged_by_llm" else "🟡 *Новый отзыв на модерации*"
+            text = (
+                f"{flag}\n\n"
+                f"📍 *Место:* {place}\n"
+                f"⭐ *Оценка:* {event.get('rating', '')}/5\n"
+                # Без курсива: внутри сущности legacy Markdown экранирование не работает
+                f"💬 «{_escape(event.get('text', '')[:100])}»\n\n"
+                f"`/approve {review_id}`\n"
+                f"`/reject {review_id}`"
+            )
+            messages.extend((moderator_id, text) for moderator_id in self.moderator_ids)
+
+        return messages
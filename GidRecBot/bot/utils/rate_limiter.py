@@ -0,0 +1,199 @@
+# GidRecBot/bot/utils/rate_limiter.py
+"""
+Планировщик исходящих запросов к Telegram.
+
+Telegram ограничивает бота ~30 сообщениями в секунду глобально и ~1 сообщением
+в секунду в один чат. Планировщик держит token bucket на весь бот и на каждый чат,
+а ожидающие отправки запросы хранит в очереди с приоритетами: ответы пользователю
+уходят раньше уведомлений.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Приоритеты: чем меньше число, тем раньше отправка
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NOTIFICATION = 10
+
+send_priority: ContextVar[int] = ContextVar("send_priority", default=PRIORITY_INTERACTIVE)
+
+ChatId = Union[int, str]
+
+
+@contextmanager
+def notification_priority():
+    """Все отправки внутри блока получают приоритет уведомлений"""
+    token = send_priority.set(PRIORITY_NOTIFICATION)
+    try:
+        yield
+    finally:
+        send_priority.reset(token)
+
+
+class TokenBucket:
+    """Token bucket: rate токенов в секунду, не больше capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Сколько секунд ждать до появления токена (0 — можно сразу)"""
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, now: float, seconds: float):
+        """Заблокировать bucket (ответ 429 с retry_after)"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.blocked_until <= now
+
+
+class SendScheduler:
+    """Очередь с приоритетами поверх глобального и per-chat token bucket"""
+
+    MAX_IDLE_BUCKETS = 10_000
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: int = 3
+    ):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: Dict[ChatId, TokenBucket] = {}
+        # (priority, seq, chat_id, future, enqueued_at)
+        self._queue: List[Tuple[int, int, ChatId, asyncio.Future, float]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.sent_total = 0
+        self.retry_after_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self, chat_id: ChatId, priority: Optional[int] = None):
+        """Дождаться разрешения на отправку в чат"""
+        self._ensure_worker()
+        if priority is None:
+            priority = send_priority.get()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), chat_id, future, time.monotonic()))
+        self._wakeup.set()
+        await future
+
+    def penalize(self, chat_id: ChatId, retry_after: float):
+        """Учесть retry_after от Telegram: чат ждёт указанное время"""
+        self.retry_after_total += 1
+        self._chat_bucket(chat_id).block(time.monotonic(), retry_after)
+        if self._wakeup:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Метрики планировщика"""
+        return {
+            "queue_size": len(self._queue),
+            "tracked_chats": len(self._chats),
+            "sent_total": self.sent_total,
+            "retry_after_total": self.retry_after_total,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+        }
+
+    def _ensure_worker(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def _chat_bucket(self, chat_id: ChatId) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) > self.MAX_IDLE_BUCKETS:
+                now = time.monotonic()
+                self._chats = {k: b for k, b in self._chats.items() if not b.is_idle(now)}
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _run(self):
+        """Фоновый цикл выдачи разрешений"""
+        while True:
+            wait = self._dispatch() if self._queue else None
+            if wait == 0:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self) -> Optional[float]:
+        """Выдать разрешение самому приоритетному запросу, чей чат не ограничен.
+
+        Возвращает 0, если разрешение выдано, иначе время до следующей попытки
+        (None — очередь пуста).
+        """
+        now = time.monotonic()
+        global_wait = self._global.delay(now)
+        if global_wait > 0:
+            return global_wait
+
+        skipped = []
+        chat_wait = None
+        granted = False
+        while self._queue:
+            item = heapq.heappop(self._queue)
+            _, _, chat_id, future, enqueued_at = item
+            if future.done():  # Отправитель отменил ожидание
+                continue
+
+            bucket = self._chat_bucket(chat_id)
+            delay = bucket.delay(now)
+            if delay > 0:
+                skipped.append(item)
+                chat_wait = delay if chat_wait is None else min(chat_wait, delay)
+                continue
+
+            bucket.consume(now)
+            self._global.consume(now)
+            future.set_result(None)
+
+            waited = now - enqueued_at
+            self.sent_total += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            granted = True
+            break
+
+        for item in skipped:
+            heapq.heappush(self._queue, item)
+
+        return 0 if granted else chat_wait
@@ -0,0 +1,80 @@
+# backend/benchmarks/bench_geo_rank.py
+"""
+Бенчмарк гео-ранжирования кандидатов: прежний путь (haversine по одной
+строке в Python + сортировка всех попавших в радиус) против векторного
+(geo_rank.rank_by_distance: прямоугольник, haversine на массивах, argpartition).
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.bench_geo_rank [--sizes 10000 100000 1000000] [--radius 5000] [--limit 20]
+
+Кандидаты синтетические: точки по области вокруг Москвы примерно 110 x 65 км,
+на вход подаются списки Python, как после выборки колонок из БД, — время
+векторного пути включает их перевод в массивы.
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from backend.src.services.geo_rank import rank_by_distance
+from shared.geo import haversine_m
+
+CENTER = (55.7558, 37.6173)
+
+
+def make_candidates(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    latitudes = [CENTER[0] + rnd.uniform(-0.5, 0.5) for _ in range(n)]
+    longitudes = [CENTER[1] + rnd.uniform(-0.5, 0.5) for _ in range(n)]
+    ratings = [round(rnd.uniform(0, 5), 2) for _ in range(n)]
+    return latitudes, longitudes, ratings
+
+
+def rank_python(latitudes, longitudes, ratings, latitude, longitude, radius_m, rating_weight, limit) -> List[int]:
+    """Прежний rank_nearby: расстояние до каждого кандидата и полная сортировка"""
+    ranked = []
+    for i in range(len(latitudes)):
+        distance = haversine_m(latitude, longitude, latitudes[i], longitudes[i])
+        if distance > radius_m:
+            continue
+        score = (1 - rating_weight) * (1 - distance / radius_m) + rating_weight * (ratings[i] or 0) / 5
+        ranked.append((score, i))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return [i for _, i in ranked[:limit]]
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Гео-ранжирование кандидатов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--radius", type=float, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--weight", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"radius={args.radius:.0f} m, limit={args.limit}, rating_weight={args.weight}\n")
+    print(f"{'candidates':>10} {'python, ms':>12} {'numpy, ms':>12} {'speedup':>9}")
+    for n in args.sizes:
+        data = make_candidates(n)
+        params = (CENTER[0], CENTER[1], args.radius, args.weight, args.limit)
+
+        # Оба пути должны выбирать одни и те же места в одном порядке
+        expected = rank_python(*data, *params)
+        indices, _ = rank_by_distance(*data, *params)
+        assert indices.tolist() == expected, "выдача расходится"
+
+        repeat = max(1, 200_000 // n)
+        slow = timed(lambda: rank_python(*data, *params), repeat)
+        quick = timed(lambda: rank_by_distance(*data, *params), repeat)
+        print(f"{n:>10,} {slow * 1000:>12.2f} {quick * 1000:>12.2f} {slow / quick:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Бенчмарк сериализации списка мест: прежний путь (ORM-объекты →
+PlaceResponse.model_validate → повторная валидация по response_model →
+JSONResponse) против быстрого (кортежи колонок → orjson).
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.bench_serialization [--limit 100] [--repeat 2000]
+    python -m backend.benchmarks.bench_serialization --database   # ещё и выборка из DATABASE_URL
+
+Без --database строки синтетические: ORM-объекты создаются в памяти, а строки
+select(колонки) заменены namedtuple с тем же _asdict().
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.src.models import Place, PlaceStats
+from backend.src.responses import PLACE_COLUMNS, rows_response
+from backend.src.schemas.place import PlaceResponse, PlaceStatsResponse
+
+RESPONSE_FIELD = create_response_field(name="Response_get_places", type_=List[PlaceResponse])
+PlaceRow = namedtuple("PlaceRow", [column.key for column in PLACE_COLUMNS])
+
+
+def make_stats(rnd: random.Random, now: datetime) -> PlaceStats:
+    histogram = [rnd.randint(0, 40) for _ in range(5)]
+    flagged = rnd.randint(0, 5)
+    return PlaceStats(
+        review_count=sum(histogram) + flagged,
+        approved_count=sum(histogram),
+        flagged_count=flagged,
+        rating_sum=sum(count * (i + 1) for i, count in enumerate(histogram)),
+        **{f"rating_{i + 1}": count for i, count in enumerate(histogram)},
+        last_review_at=now - timedelta(minutes=rnd.randint(1, 10_000), microseconds=rnd.randint(1, 999_999)),
+    )
+
+
+def make_places(n: int, seed: int = 7) -> List[dict]:
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Место {i}",
+            "description": "Описание места " * rnd.randint(2, 30),
+            "category": rnd.choice(["cafe", "museum", "park", "theater"]),
+            "city": "Moscow",
+            "address": f"ул. Тестовая, {rnd.randint(1, 100)}",
+            "latitude": 55.7 + rnd.random() / 5,
+            "longitude": 37.5 + rnd.random() / 5,
+            "price_level": rnd.randint(1, 5),
+            "rating": round(rnd.uniform(0, 5), 2),
+            "rating_count": rnd.randint(0, 500),
+            "source": "yandex_afisha",
+            "external_url": f"https://afisha.example/{i}",
+            "is_active": True,
+            "created_at": now - timedelta(days=i),
+            "updated_at": now,
+            "stats": make_stats(rnd, now),
+        }
+        for i in range(n)
+    ]
+
+
+async def legacy_body(places: List[Place]) -> bytes:
+    content = [PlaceResponse.model_validate(p) for p in places]
+    serialized = await serialize_response(field=RESPONSE_FIELD, response_content=content)
+    return JSONResponse(serialized).body
+
+
+def fast_body(rows) -> bytes:
+    return rows_response(rows).body
+
+
+def timed(label: str, fn, repeat: int, limit: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call = (time.perf_counter() - started) / repeat
+    print(f"{label:<34} {per_call * 1000:8.3f} ms/list  {limit / per_call:>12,.0f} rows/s")
+    return per_call
+
+
+def run_synthetic(limit: int, repeat: int):
+    data = make_places(limit)
+    orm = [Place(**fields) for fields in data]
+    # stats в строке — JSON-объект из подзапроса stats_column()
+    rows = [
+        PlaceRow(**{**fields, "stats": PlaceStatsResponse.model_validate(fields["stats"]).model_dump(mode="json")})
+        for fields in data
+    ]
+    loop = asyncio.new_event_loop()
+
+    # Оба пути должны давать одинаковый JSON
+    legacy = json.loads(loop.run_until_complete(legacy_body(orm)))
+    fast = json.loads(fast_body(rows))
+    assert legacy == fast, "ответы расходятся"
+
+    print(f"synthetic, limit={limit}, repeat={repeat}\n")
+    slow = timed("model_validate + response_model", lambda: loop.run_until_complete(legacy_body(orm)), repeat, limit)
+    quick = timed("column rows + orjson", lambda: fast_body(rows), repeat, limit)
+    print(f"\nspeedup: x{slow / quick:.1f}")
+    loop.close()
+
+
+async def run_database(limit: int, repeat: int):
+    from sqlalchemy import select
+    from backend.src.database import AsyncSessionLocal, engine
+
+    order = (Place.rating.desc(), Place.rating_count.desc(), Place.created_at.desc())
+    async with AsyncSessionLocal() as session:
+        async def legacy():
+            result = await session.execute(select(Place).where(Place.is_active == True).order_by(*order).limit(limit))
+            places = result.scalars().all()
+            session.expunge_all()
+            return await legacy_body(places)
+
+        async def fast():
+            result = await session.execute(select(*PLACE_COLUMNS).where(Place.is_active == True).order_by(*order).limit(limit))
+            return fast_body(result)
+
+        print(f"\ndatabase, limit={limit}, repeat={repeat}\n")
+        for label, fn in (("ORM select + validate", legacy), ("column select + orjson", fast)):
+            await fn()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await fn()
+            per_call = (time.perf_counter() - started) / repeat
+            print(f"{label:<34} {per_call * 1000:8.3f} ms/request")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сериализация списка мест")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--database", action="store_true", help="замерить и выборку из DATABASE_URL")
+    args = parser.parse_args()
+
+    run_synthetic(args.limit, args.repeat)
+    if args.database:
+        asyncio.run(run_database(args.limit, max(args.repeat // 10, 10)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# backend/migrations/env.py
+import asyncio
+import sys
+from logging.config import fileConfig
+from pathlib import Path
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# shared лежит в корне репозитория локально и в /app в контейнере
+for root in Path(__file__).resolve().parents[1:3]:
+    if (root / "shared").is_dir() and str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+from shared.config import config as app_config  # noqa: E402
+import shared.models  # noqa: E402
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = shared.models.Base.metadata
+
+
+def run_migrations_offline():
+    """Сгенерировать SQL без подключения к БД (alembic upgrade head --sql)"""
+    context.configure(
+        url=app_config.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    engine = create_async_engine(app_config.DATABASE_URL)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
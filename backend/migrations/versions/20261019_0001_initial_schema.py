@@ -0,0 +1,132 @@
+"""initial schema
+
+Схема, которую раньше создавал create_all при старте бэкенда. Базу, созданную
+так, upgrade не пересоздаёт (alembic stamp для неё не нужен): таблицы уже
+есть, и 0001 добавляет только то, чего в старой базе может не быть, —
+ограничение uq_places_source_external_id (create_all не добавляет его в
+существующую таблицу, а на нём держатся ON CONFLICT парсера и POST /places/)
+и таблицу place_merges, появившуюся позже самой базы. Если в places есть
+повторы (source, external_id), добавление ограничения упадёт: их нужно свести
+до миграции.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 12:00:00
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ]
+
+
+def _existing_schema():
+    """Инспектор, если таблицы уже созданы create_all; иначе None"""
+    if context.is_offline_mode():
+        return None
+    inspector = sa.inspect(op.get_bind())
+    return inspector if inspector.has_table("places") else None
+
+
+def _adopt(inspector):
+    """Довести базу из create_all до схемы 0001"""
+    constraints = {item["name"] for item in inspector.get_unique_constraints("places")}
+    if "uq_places_source_external_id" not in constraints:
+        op.create_unique_constraint("uq_places_source_external_id", "places", ["source", "external_id"])
+    if not inspector.has_table("place_merges"):
+        _create_place_merges()
+
+
+def _create_place_merges():
+    op.create_table(
+        "place_merges",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("canonical_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("places.id"), nullable=False),
+        sa.Column("duplicate_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("places.id"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("method", sa.String(20), nullable=False),
+        sa.Column("details", postgresql.JSONB()),
+        *_timestamps(),
+        sa.UniqueConstraint("duplicate_id"),
+    )
+    op.create_index("ix_place_merges_canonical_id", "place_merges", ["canonical_id"])
+
+
+def upgrade():
+    inspector = _existing_schema()
+    if inspector is not None:
+        _adopt(inspector)
+        return
+
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("telegram_id", sa.BigInteger(), nullable=False),
+        sa.Column("username", sa.String(255)),
+        sa.Column("first_name", sa.String(255)),
+        sa.Column("last_name", sa.String(255)),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("preferences", sa.JSON()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index("ix_users_telegram_id", "users", ["telegram_id"], unique=True)
+
+    op.create_table(
+        "places",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("city", sa.String(100), nullable=False),
+        sa.Column("address", sa.Text()),
+        sa.Column("latitude", sa.Float()),
+        sa.Column("longitude", sa.Float()),
+        sa.Column("price_level", sa.Integer()),
+        sa.Column("rating", sa.Float()),
+        sa.Column("rating_count", sa.Integer()),
+        sa.Column("source", sa.String(50), nullable=False),
+        sa.Column("external_id", sa.String(255)),
+        sa.Column("external_url", sa.Text()),
+        sa.Column("additional_data", postgresql.JSONB()),
+        sa.Column("is_active", sa.Boolean()),
+        *_timestamps(),
+        sa.UniqueConstraint("source", "external_id", name="uq_places_source_external_id"),
+    )
+
+    op.create_table(
+        "reviews",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("place_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("places.id"), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("moderation_status", sa.String(20), nullable=False),
+        sa.Column("moderated_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+        sa.Column("moderation_notes", sa.Text()),
+        sa.Column("llm_check", postgresql.JSONB()),
+        sa.Column("photos", postgresql.JSONB()),
+        *_timestamps(),
+    )
+
+    _create_place_merges()
+
+
+def downgrade():
+    op.drop_index("ix_place_merges_canonical_id", table_name="place_merges")
+    op.drop_table("place_merges")
+    op.drop_table("reviews")
+    op.drop_table("places")
+    op.drop_index("ix_users_telegram_id", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,53 @@
+"""keyset pagination indexes
+
+Индексы под курсорную пагинацию /places/, очереди модерации и отзывов
+пользователя. rating и rating_count становятся NOT NULL: NULL ломает
+сравнение ключей сортировки (и в DESC-порядке встаёт первым).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 14:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE places SET rating = 0 WHERE rating IS NULL")
+    op.execute("UPDATE places SET rating_count = 0 WHERE rating_count IS NULL")
+    op.alter_column("places", "rating", existing_type=sa.Float(), nullable=False, server_default="0")
+    op.alter_column("places", "rating_count", existing_type=sa.Integer(), nullable=False, server_default="0")
+
+    op.create_index(
+        "ix_places_active_rank",
+        "places",
+        [sa.text("rating DESC, rating_count DESC, created_at DESC, id DESC")],
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_places_active_city_rank",
+        "places",
+        [sa.text("city, rating DESC, rating_count DESC, created_at DESC, id DESC")],
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_reviews_moderation_queue",
+        "reviews",
+        ["created_at", "id"],
+        postgresql_where=sa.text("moderation_status IN ('pending', 'flagged_by_llm')"),
+    )
+    op.create_index("ix_reviews_user_recent", "reviews", [sa.text("user_id, created_at DESC, id DESC")])
+
+
+def downgrade():
+    op.drop_index("ix_reviews_user_recent", table_name="reviews")
+    op.drop_index("ix_reviews_moderation_queue", table_name="reviews")
+    op.drop_index("ix_places_active_city_rank", table_name="places")
+    op.drop_index("ix_places_active_rank", table_name="places")
+    op.alter_column("places", "rating_count", existing_type=sa.Integer(), nullable=True, server_default=None)
+    op.alter_column("places", "rating", existing_type=sa.Float(), nullable=True, server_default=None)
@@ -0,0 +1,42 @@
+"""place geohash
+
+Колонка places.geohash (точность 9, collation C) с B-tree индексом для поиска
+мест рядом по префиксам ячеек. Существующие места заполняются пачками.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 16:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from shared.geo import place_geohash
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade():
+    op.add_column("places", sa.Column("geohash", sa.String(12, collation="C")))
+
+    # В режиме --sql строк не видно — заполнение пропускается
+    if not op.get_context().as_sql:
+        conn = op.get_bind()
+        select = sa.text(
+            "SELECT id, latitude, longitude FROM places "
+            "WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL LIMIT :limit"
+        )
+        update = sa.text("UPDATE places SET geohash = :geohash WHERE id = :id")
+        while rows := conn.execute(select, {"limit": BATCH_SIZE}).all():
+            conn.execute(update, [{"id": row.id, "geohash": place_geohash(row.latitude, row.longitude)} for row in rows])
+
+    op.create_index("ix_places_geohash", "places", ["geohash"])
+
+
+def downgrade():
+    op.drop_index("ix_places_geohash", table_name="places")
+    op.drop_column("places", "geohash")
@@ -0,0 +1,182 @@
+"""place stats
+
+Таблица place_stats с агрегатами отзывов места (число отзывов, одобренных и
+отмеченных, распределение оценок, последний отзыв) и триггер на reviews,
+который ведёт её приращениями: старая версия строки вычитается, новая
+прибавляется. Тот же триггер обновляет places.rating / rating_count вместо
+пересчёта в приложении.
+
+Триггер создаётся до заполнения: CREATE TRIGGER держит блокировку reviews до
+конца транзакции миграции, поэтому отзывы, записанные между заполнением и
+включением триггера, не теряются.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Статусы, которые считаются отмеченными (flagged_count)
+FLAGGED = "('flagged_by_llm', 'rejected')"
+
+APPLY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION place_stats_apply(
+    p_place uuid, p_rating integer, p_status text, p_created timestamptz, p_sign integer
+) RETURNS void AS $$
+DECLARE
+    approved integer := CASE WHEN p_status = 'approved' THEN p_sign ELSE 0 END;
+    flagged integer := CASE WHEN p_status IN {FLAGGED} THEN p_sign ELSE 0 END;
+    stats place_stats%ROWTYPE;
+BEGIN
+    INSERT INTO place_stats AS s (
+        place_id, review_count, approved_count, flagged_count, rating_sum,
+        rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at
+    ) VALUES (
+        p_place, p_sign, approved, flagged, approved * p_rating,
+        CASE WHEN p_rating = 1 THEN approved ELSE 0 END,
+        CASE WHEN p_rating = 2 THEN approved ELSE 0 END,
+        CASE WHEN p_rating = 3 THEN approved ELSE 0 END,
+        CASE WHEN p_rating = 4 THEN approved ELSE 0 END,
+        CASE WHEN p_rating = 5 THEN approved ELSE 0 END,
+        CASE WHEN approved > 0 THEN p_created END
+    )
+    ON CONFLICT (place_id) DO UPDATE SET
+        review_count = s.review_count + EXCLUDED.review_count,
+        approved_count = s.approved_count + EXCLUDED.approved_count,
+        flagged_count = s.flagged_count + EXCLUDED.flagged_count,
+        rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+        rating_1 = s.rating_1 + EXCLUDED.rating_1,
+        rating_2 = s.rating_2 + EXCLUDED.rating_2,
+        rating_3 = s.rating_3 + EXCLUDED.rating_3,
+        rating_4 = s.rating_4 + EXCLUDED.rating_4,
+        rating_5 = s.rating_5 + EXCLUDED.rating_5,
+        last_review_at = GREATEST(s.last_review_at, EXCLUDED.last_review_at),
+        updated_at = now()
+    RETURNING * INTO stats;
+
+    IF approved = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Ушёл последний одобренный отзыв: ищем предыдущий (ix_reviews_place_approved)
+    IF approved < 0 AND p_created >= stats.last_review_at THEN
+        UPDATE place_stats SET last_review_at = (
+            SELECT max(created_at) FROM reviews
+            WHERE place_id = p_place AND moderation_status = 'approved'
+        ) WHERE place_id = p_place;
+    END IF;
+
+    -- Без одобренных отзывов у места остаётся рейтинг источника (как в SYNC_RATINGS)
+    IF stats.approved_count > 0 THEN
+        UPDATE places SET
+            rating = round(stats.rating_sum::numeric / stats.approved_count, 2),
+            rating_count = stats.approved_count
+        WHERE id = p_place;
+    END IF;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION reviews_place_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND OLD.place_id = NEW.place_id
+        AND OLD.rating = NEW.rating
+        AND OLD.moderation_status = NEW.moderation_status THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM place_stats_apply(OLD.place_id, OLD.rating, OLD.moderation_status, OLD.created_at, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM place_stats_apply(NEW.place_id, NEW.rating, NEW.moderation_status, NEW.created_at, 1);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+BACKFILL = f"""
+INSERT INTO place_stats (
+    place_id, review_count, approved_count, flagged_count, rating_sum,
+    rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at
+)
+SELECT
+    place_id,
+    count(*),
+    count(*) FILTER (WHERE moderation_status = 'approved'),
+    count(*) FILTER (WHERE moderation_status IN {FLAGGED}),
+    coalesce(sum(rating) FILTER (WHERE moderation_status = 'approved'), 0),
+    count(*) FILTER (WHERE moderation_status = 'approved' AND rating = 1),
+    count(*) FILTER (WHERE moderation_status = 'approved' AND rating = 2),
+    count(*) FILTER (WHERE moderation_status = 'approved' AND rating = 3),
+    count(*) FILTER (WHERE moderation_status = 'approved' AND rating = 4),
+    count(*) FILTER (WHERE moderation_status = 'approved' AND rating = 5),
+    max(created_at) FILTER (WHERE moderation_status = 'approved')
+FROM reviews
+GROUP BY place_id
+"""
+
+SYNC_RATINGS = """
+UPDATE places p SET
+    rating = round(s.rating_sum::numeric / s.approved_count, 2),
+    rating_count = s.approved_count
+FROM place_stats s
+WHERE s.place_id = p.id AND s.approved_count > 0
+"""
+
+
+def _counter(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+
+
+def upgrade():
+    op.create_table(
+        "place_stats",
+        sa.Column(
+            "place_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("places.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        _counter("review_count"),
+        _counter("approved_count"),
+        _counter("flagged_count"),
+        _counter("rating_sum"),
+        *(_counter(f"rating_{value}") for value in range(1, 6)),
+        sa.Column("last_review_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_reviews_place_approved",
+        "reviews",
+        [sa.text("place_id, created_at DESC")],
+        postgresql_where=sa.text("moderation_status = 'approved'"),
+    )
+
+    op.execute(APPLY_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER reviews_place_stats "
+        "AFTER INSERT OR DELETE OR UPDATE OF place_id, rating, moderation_status ON reviews "
+        "FOR EACH ROW EXECUTE FUNCTION reviews_place_stats()"
+    )
+
+    op.execute(BACKFILL)
+    op.execute(SYNC_RATINGS)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS reviews_place_stats ON reviews")
+    op.execute("DROP FUNCTION IF EXISTS reviews_place_stats()")
+    op.execute("DROP FUNCTION IF EXISTS place_stats_apply(uuid, integer, text, timestamptz, integer)")
+    op.drop_index("ix_reviews_place_approved", table_name="reviews")
+    op.drop_table("place_stats")
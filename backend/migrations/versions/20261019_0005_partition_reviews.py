@@ -0,0 +1,128 @@
+"""partition reviews
+
+reviews становится секционированной по LIST (moderation_status):
+reviews_queue (pending, flagged_by_llm), reviews_approved и reviews_rejected.
+Очередь модерации и отзывы места читают только свою секцию, отклонённые
+отзывы лежат отдельно. Первичный ключ — (id, moderation_status): ключ
+секционирования обязан в него входить. Новая колонка llm_check_archive —
+файл, куда архиватор вынес llm_check.
+
+Строки копируются в новую таблицу в той же транзакции (таблица на это время
+заблокирована); триггер place_stats пересоздаётся после копирования, поэтому
+агрегаты не пересчитываются.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 20:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+PARTITIONS = {
+    "reviews_queue": "'pending', 'flagged_by_llm'",
+    "reviews_approved": "'approved'",
+    "reviews_rejected": "'rejected'",
+}
+
+COLUMNS = (
+    "id, user_id, place_id, rating, text, summary, moderation_status, moderated_by, "
+    "moderation_notes, llm_check, photos, created_at, updated_at"
+)
+
+TRIGGER = (
+    "CREATE TRIGGER reviews_place_stats "
+    "AFTER INSERT OR DELETE OR UPDATE OF place_id, rating, moderation_status ON reviews "
+    "FOR EACH ROW EXECUTE FUNCTION reviews_place_stats()"
+)
+
+INDEXES = ("ix_reviews_moderation_queue", "ix_reviews_user_recent", "ix_reviews_place_approved")
+
+
+def _create_indexes():
+    op.create_index(
+        "ix_reviews_moderation_queue",
+        "reviews",
+        ["created_at", "id"],
+        postgresql_where=sa.text("moderation_status IN ('pending', 'flagged_by_llm')"),
+    )
+    op.create_index("ix_reviews_user_recent", "reviews", [sa.text("user_id, created_at DESC, id DESC")])
+    op.create_index(
+        "ix_reviews_place_approved",
+        "reviews",
+        [sa.text("place_id, created_at DESC")],
+        postgresql_where=sa.text("moderation_status = 'approved'"),
+    )
+
+
+def _detach_old(new_name: str):
+    """Убрать старую таблицу с дороги: имя, первичный ключ, индексы, триггер"""
+    op.execute("DROP TRIGGER reviews_place_stats ON reviews")
+    for index in INDEXES:
+        op.drop_index(index, table_name="reviews")
+    op.rename_table("reviews", new_name)
+    op.execute(f"ALTER INDEX reviews_pkey RENAME TO {new_name}_pkey")
+
+
+def upgrade():
+    _detach_old("reviews_unpartitioned")
+
+    op.create_table(
+        "reviews",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("place_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("places.id"), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("moderation_status", sa.String(20), nullable=False),
+        sa.Column("moderated_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+        sa.Column("moderation_notes", sa.Text()),
+        sa.Column("llm_check", postgresql.JSONB()),
+        sa.Column("llm_check_archive", sa.String(255)),
+        sa.Column("photos", postgresql.JSONB()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.PrimaryKeyConstraint("id", "moderation_status", name="reviews_pkey"),
+        postgresql_partition_by="LIST (moderation_status)",
+    )
+    for name, statuses in PARTITIONS.items():
+        op.execute(f"CREATE TABLE {name} PARTITION OF reviews FOR VALUES IN ({statuses})")
+
+    op.execute(f"INSERT INTO reviews ({COLUMNS}) SELECT {COLUMNS} FROM reviews_unpartitioned")
+    op.drop_table("reviews_unpartitioned")
+
+    _create_indexes()
+    op.execute(TRIGGER)
+
+
+def downgrade():
+    # llm_check уже вынесенных в архив отзывов остаётся в файлах архива
+    _detach_old("reviews_partitioned")
+
+    op.create_table(
+        "reviews",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("place_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("places.id"), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("summary", sa.Text()),
+        sa.Column("moderation_status", sa.String(20), nullable=False),
+        sa.Column("moderated_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+        sa.Column("moderation_notes", sa.Text()),
+        sa.Column("llm_check", postgresql.JSONB()),
+        sa.Column("photos", postgresql.JSONB()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.execute(f"INSERT INTO reviews ({COLUMNS}) SELECT {COLUMNS} FROM reviews_partitioned")
+    op.drop_table("reviews_partitioned")
+
+    _create_indexes()
+    op.execute(TRIGGER)
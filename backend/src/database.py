@@ -1,31 +1,113 @@
 # backend/src/database.py
+from pathlib import Path
+from fastapi import Request
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
 from shared.config import config
+from .services.db_metrics import InstrumentedPool, instrument_engine
+from .services.replicas import ReplicaSet
 
-# Создаем асинхронный движок БД
-engine = create_async_engine(
-    config.DATABASE_URL,
-    echo=True,  # В продакшене установить False
-    future=True,
+def _make_engine(url: str, application_name: str, **kwargs):
+    return create_async_engine(
+        url,
+        echo=config.DB_ECHO,  # Только для отладки: логирует каждый запрос
+        future=True,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args={
+            # За pgbouncer в transaction mode кэш prepared statements нужно выключить (0)
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS),
+                "application_name": application_name,
+            },
+        },
+        **kwargs,
+    )
+
+# Создаем асинхронный движок БД (primary)
+engine = _make_engine(config.DATABASE_URL, "recombot-backend", poolclass=InstrumentedPool)
+instrument_engine(engine, slow_query_ms=config.DB_SLOW_QUERY_MS)
+
+# Реплики только для чтения
+replicas = ReplicaSet(
+    [
+        _make_engine(url, "recombot-backend-replica")
+        for url in config.DATABASE_REPLICA_URLS
+    ],
+    max_lag=config.REPLICA_MAX_LAG_SECONDS,
+    check_interval=config.REPLICA_LAG_CHECK_SECONDS,
+    sticky_seconds=config.READ_YOUR_WRITES_SECONDS,
 )
+for replica_engine in replicas.engines:
+    instrument_engine(replica_engine, slow_query_ms=config.DB_SLOW_QUERY_MS, track_pool=False)
+
+class PrimarySession(Session):
+    """Сессия primary: запоминает, что клиент что-то записал"""
+
+@event.listens_for(PrimarySession, "after_commit")
+def _remember_write(session):
+    client_key = session.info.get("client_key")
+    if client_key:
+        replicas.mark_write(client_key)
 
 # Фабрика сессий
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
 )
 
-async def get_db() -> AsyncSession:
-    """Dependency для получения сессии БД"""
+def client_key(request: Request) -> str:
+    """Кто читает: X-Client-Id (бот передаёт Telegram ID) или адрес клиента"""
+    return request.headers.get("X-Client-Id") or (request.client.host if request.client else "")
+
+async def get_db(request: Request) -> AsyncSession:
+    """Dependency для получения сессии БД (primary, для записи)"""
     async with AsyncSessionLocal() as session:
+        session.info["client_key"] = client_key(request)
         try:
             yield session
         finally:
             await session.close()
 
+def read_session() -> AsyncSession:
+    """Сессия для фонового чтения (кэши, индексы): реплика, если есть здоровая"""
+    return (replicas.pick("") or AsyncSessionLocal)()
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Dependency для эндпоинтов только для чтения: реплика, если можно"""
+    key = client_key(request)
+    session_factory = replicas.pick(key) or AsyncSessionLocal
+    async with session_factory() as session:
+        session.info["client_key"] = key
+        try:
+            yield session
+        finally:
+            await session.close()
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+async def check_schema_version() -> str:
+    """Проверить, что БД на последней миграции Alembic (схемой управляют миграции)"""
+    from alembic.script import ScriptDirectory
+    head = ScriptDirectory(str(MIGRATIONS_DIR)).get_current_head()
+    try:
+        async with engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except Exception as e:
+        raise RuntimeError(f"Не удалось прочитать версию схемы ({e}): выполните alembic upgrade head") from e
+    if current != head:
+        raise RuntimeError(f"Схема БД на версии {current}, код ожидает {head}: выполните alembic upgrade head")
+    return current
+
 async def create_tables():
-    """Создание таблиц (только для dev/test)"""
+    """Создание таблиц без миграций (только для тестов)"""
     import shared.models
     async with engine.begin() as conn:
         await conn.run_sync(shared.models.Base.metadata.create_all)
\ No newline at end of file
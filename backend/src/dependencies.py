@@ -2,10 +2,15 @@
 from fastapi import Depends 
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from .database import get_db
+from .database import get_db, get_read_db, read_session, AsyncSessionLocal
 from .services.cache import CacheService
 from .services.llm import LLMService
 from .services.recommendation import RecommendationService
+from .services.events import EventPublisher
+from .services.search_index import PlaceNameIndex
+from .services.catalog import CatalogCache
+from .services.review_archive import ReviewArchiver
+from .unit_of_work import UnitOfWork
 from shared.config import config
 
 # Инициализация сервисов
@@ -15,6 +20,26 @@ llm_service = LLMService(
     api_key=config.OLLAMA_API_KEY,
     model=config.OLLAMA_MODEL
 )
+event_publisher = EventPublisher(
+    redis_url=config.REDIS_URL,
+    stream=config.REVIEW_EVENTS_STREAM
+)
+place_index = PlaceNameIndex(
+    session_factory=AsyncSessionLocal,
+    refresh_interval=config.PLACE_INDEX_REFRESH_SECONDS
+)
+catalog_cache = CatalogCache(
+    session_factory=read_session,
+    refresh_interval=config.CATALOG_REFRESH_SECONDS,
+    top_limit=config.CATALOG_TOP_LIMIT
+)
+review_archiver = ReviewArchiver(
+    session_factory=AsyncSessionLocal,
+    archive_dir=config.REVIEW_ARCHIVE_DIR,
+    rejected_after_days=config.REVIEW_ARCHIVE_REJECTED_DAYS,
+    approved_after_days=config.REVIEW_ARCHIVE_APPROVED_DAYS,
+    interval=config.REVIEW_ARCHIVE_INTERVAL_SECONDS
+) if config.REVIEW_ARCHIVE_DIR else None
 
 async def get_cache() -> CacheService:
     return cache_service
@@ -22,8 +47,21 @@ async def get_cache() -> CacheService:
 async def get_llm() -> LLMService:
     return llm_service
 
+async def get_events() -> EventPublisher:
+    return event_publisher
+
+async def get_place_index() -> PlaceNameIndex:
+    return place_index
+
+async def get_catalog() -> CatalogCache:
+    return catalog_cache
+
 async def get_recommendation_service(cache: CacheService = Depends(get_cache)) -> RecommendationService:
     return RecommendationService(cache)
 
 # Короткие алиасы для удобства
-get_db_session = get_db
\ No newline at end of file
+get_db_session = get_db
+get_read_session = get_read_db
+
+async def get_uow(db: AsyncSession = Depends(get_db_session)) -> UnitOfWork:
+    return UnitOfWork(db)
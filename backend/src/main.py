@@ -1,8 +1,13 @@
 # backend/src/main.py
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-from .database import create_tables
+from .database import check_schema_version, engine, replicas
+from .dependencies import catalog_cache, place_index, review_archiver
+from .services.db_metrics import QueryCount, request_queries
+from .services.warmup import warm_up
+from shared.config import config
 from .routers import (
     health,
     auth,
@@ -35,34 +40,62 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Query-Count"],
 )
 
+@app.middleware("http")
+async def count_db_queries(request: Request, call_next):
+    """Число запросов к БД за HTTP-запрос — в заголовке X-DB-Query-Count"""
+    counter = QueryCount()
+    token = request_queries.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        request_queries.reset(token)
+    response.headers["X-DB-Query-Count"] = str(counter.queries)
+    return response
+
 # Подключение роутеров
 app.include_router(health.router)
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(places.router, prefix="/api/v1")
 app.include_router(reviews.router, prefix="/api/v1")
 app.include_router(recommendations.router, prefix="/api/v1")
+app.include_router(moderation.router, prefix="/api/v1")
 
 @app.on_event("startup")
 async def startup_event():
     """Действия при запуске приложения"""
     logger.info("🚀 Запуск Travel Recommendation API...")
     
-    # Создаем таблицы (только для разработки!)
-    try:
-        await create_tables()
-        logger.info("✅ Таблицы БД созданы/проверены")
-    except Exception as e:
-        logger.error(f"❌ Ошибка при создании таблиц: {e}")
-        # В продакшене используем миграции Alembic
+    # Схемой управляют миграции (alembic upgrade head), здесь только проверка версии
+    version = await check_schema_version()
+    logger.info(f"✅ Схема БД на версии {version}")
+    
+    # Реплики для чтения: первая проверка отставания и фоновый мониторинг
+    await replicas.start()
+    
+    # Вынос llm_check отклонённых и старых отзывов в архив
+    if review_archiver:
+        await review_archiver.start()
+    
+    # Прогрев в фоне: /health отвечает 503, пока пулы и кэши не готовы
+    app.state.warmup = asyncio.create_task(warm_up(
+        engines=[engine, *replicas.engines],
+        connections=config.DB_POOL_SIZE,
+        caches=[catalog_cache, place_index],
+        timeout=config.WARMUP_TIMEOUT_SECONDS
+    ))
     
-    logger.info("✅ Приложение готово к работе")
+    logger.info("✅ Приложение запущено, идёт прогрев")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Действия при остановке приложения"""
     logger.info("🛑 Остановка приложения...")
+    if review_archiver:
+        await review_archiver.stop()
+    await replicas.stop()
 
 if __name__ == "__main__":
     import uvicorn
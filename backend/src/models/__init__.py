@@ -1,6 +1,6 @@
 # backend/src/models/__init__.py
 # Реэкспортируем модели из shared
-from shared.models import Base, User, Place, Review
+from shared.models import Base, User, Place, Review, PlaceStats
 from shared.models.enums import UserRole, ModerationStatus, PlaceCategory, SourceType
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     'User',
     'Place',
     'Review',
+    'PlaceStats',
     'UserRole',
     'ModerationStatus',
     'PlaceCategory',
@@ -0,0 +1,72 @@
+# backend/src/pagination.py
+"""
+Курсорная (keyset) пагинация.
+
+Курсор — непрозрачная base64url-строка с ключом сортировки последней строки
+страницы (включая id для однозначности). Следующая страница выбирается
+условием WHERE (ключ) < (курсор) по индексу, а не OFFSET: глубина страницы не
+влияет на скорость, и строки не «съезжают» при вставках и смене рейтинга.
+Курсор следующей страницы отдаётся в заголовке X-Next-Cursor; на последней
+странице заголовка нет.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = orjson.dumps([_dump(value) for value in values])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple:
+    """Разобрать курсор в значения нужных типов; 400 при подделке"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if len(values) != len(types):
+            raise ValueError("wrong length")
+        return tuple(_load(value, kind) for value, kind in zip(values, types))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Неверный курсор"
+        )
+
+
+def _load(value, kind: type):
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if kind is UUID:
+        return UUID(value)
+    if kind is float:
+        return float(value)
+    return kind(value)
+
+
+def next_cursor(page: Sequence[dict], limit: int, keys: Sequence[str]) -> Optional[str]:
+    """Курсор после последней строки или None, если страница неполная"""
+    if len(page) < limit:
+        return None
+    last = page[-1]
+    return encode_cursor([last[key] for key in keys])
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> Response:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return response
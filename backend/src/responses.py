@@ -0,0 +1,101 @@
+# backend/src/responses.py
+"""
+Быстрый путь сериализации списков.
+
+Списочные эндпоинты выбирают только нужные колонки (кортежи строк вместо ORM-
+объектов) и отдают их через orjson одним вызовом. Возврат Response из
+эндпоинта отключает повторную валидацию по response_model — он остаётся только
+для документации, поэтому наборы колонок ниже обязаны совпадать со схемами
+PlaceResponse и ReviewResponse.
+"""
+from typing import Dict, Iterable, List
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import JSON, Numeric, case, cast, func, literal_column, select
+
+from .models import Place, PlaceStats, Review
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson с теми же форматами, что у pydantic (UTC как «Z»)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def row_dicts(rows: Iterable) -> List[Dict]:
+    return [row._asdict() for row in rows]
+
+
+def rows_response(rows: Iterable, status_code: int = 200) -> FastJSONResponse:
+    """Строки select(колонки...) → JSON-массив объектов"""
+    return FastJSONResponse(row_dicts(rows), status_code=status_code)
+
+
+def _text(value: str):
+    """Строковая константа прямо в SQL: у json_build_object(variadic "any")
+    тип параметра запроса не выводится"""
+    return literal_column(f"'{value}'")
+
+
+def stats_column(place_id=Place.id):
+    """PlaceStatsResponse одним JSON-объектом: подзапрос по первичному ключу
+    place_stats, без JOIN в запросах списков (NULL, если отзывов не было)"""
+    utc = PlaceStats.last_review_at.op("AT TIME ZONE")(_text("UTC"))
+    stats = func.json_build_object(
+        _text("review_count"), PlaceStats.review_count,
+        _text("approved_count"), PlaceStats.approved_count,
+        _text("rating_histogram"), func.json_build_array(
+            PlaceStats.rating_1, PlaceStats.rating_2, PlaceStats.rating_3, PlaceStats.rating_4, PlaceStats.rating_5
+        ),
+        _text("flagged_ratio"), case(
+            (PlaceStats.review_count > 0, func.round(cast(PlaceStats.flagged_count, Numeric) / PlaceStats.review_count, 4)),
+            else_=literal_column("0"),
+        ),
+        # Формат pydantic/orjson для UTC: ...Z
+        _text("last_review_at"), func.to_char(utc, _text('YYYY-MM-DD"T"HH24:MI:SS.US"Z"')),
+        type_=JSON,
+    )
+    return select(stats).where(PlaceStats.place_id == place_id).scalar_subquery().label("stats")
+
+
+# Колонки PlaceResponse без агрегатов отзывов; значения по умолчанию модели
+# подставляем в SQL, раз схемой они уже не проверяются
+PLACE_BASE_COLUMNS = (
+    Place.id,
+    Place.name,
+    Place.description,
+    Place.category,
+    Place.city,
+    Place.address,
+    Place.latitude,
+    Place.longitude,
+    func.coalesce(Place.price_level, 2).label("price_level"),
+    Place.rating,
+    Place.rating_count,
+    Place.source,
+    Place.external_url,
+    func.coalesce(Place.is_active, True).label("is_active"),
+    Place.created_at,
+    Place.updated_at,
+)
+
+# Колонки PlaceResponse
+PLACE_COLUMNS = PLACE_BASE_COLUMNS + (stats_column(),)
+
+# Колонки ReviewResponse
+REVIEW_COLUMNS = (
+    Review.id,
+    Review.user_id,
+    Review.place_id,
+    Review.rating,
+    Review.text,
+    Review.summary,
+    Review.moderation_status,
+    Review.moderated_by,
+    Review.moderation_notes,
+    Review.llm_check,
+    Review.created_at,
+    Review.updated_at,
+)
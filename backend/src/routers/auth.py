@@ -2,10 +2,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from uuid import uuid4
-from ..dependencies import get_db_session
-from ..models import User, UserRole
+from ..dependencies import get_read_session, get_uow
+from ..models import User
 from ..schemas.user import UserCreate, UserResponse
+from ..unit_of_work import UnitOfWork, upsert_user
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,47 +14,22 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db_session)
+    uow: UnitOfWork = Depends(get_uow)
 ):
     """Регистрация/получение пользователя по Telegram ID"""
-    # Проверяем, существует ли пользователь
-    result = await db.execute(
-        select(User).where(User.telegram_id == user_data.tg_id)
-    )
-    existing_user = result.scalar_one_or_none()
+    # Один запрос: вставка, смена города или существующая строка без записи
+    async with uow:
+        user = await uow.one_or_none(upsert_user(user_data.tg_id, user_data.username, user_data.location))
+        if user is None:
+            user = await uow.one(select(*User.__table__.columns).where(User.telegram_id == user_data.tg_id))
     
-    if existing_user:
-        # Обновляем предпочтения, если нужно
-        if user_data.location and existing_user.preferences.get('city') != user_data.location:
-            existing_user.preferences = existing_user.preferences or {}
-            existing_user.preferences['city'] = user_data.location
-            await db.commit()
-            await db.refresh(existing_user)
-        
-        return UserResponse.model_validate(existing_user)
-    
-    # Создаем нового пользователя
-    new_user = User(
-        id=uuid4(),
-        telegram_id=user_data.tg_id,
-        username=user_data.username,
-        first_name=user_data.username,  # В Telegram боте будет реальное имя
-        role=UserRole.USER,
-        preferences={"city": user_data.location},
-        is_active=True
-    )
-    
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
-    
-    logger.info(f"New user registered: {new_user.telegram_id} in {user_data.location}")
-    return UserResponse.model_validate(new_user)
+    logger.info(f"User registered: {user.telegram_id} in {user_data.location}")
+    return UserResponse.model_validate(user)
 
 @router.get("/by_tg/{telegram_id}", response_model=UserResponse)
 async def get_user_by_telegram_id(
     telegram_id: int,
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Получить пользователя по Telegram ID"""
     result = await db.execute(
@@ -73,7 +48,7 @@ async def get_user_by_telegram_id(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(
     user_id: str,
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Получить пользователя по ID"""
     from uuid import UUID
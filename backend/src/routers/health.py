@@ -1,10 +1,14 @@
 # backend/src/routers/health.py
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
 from ..dependencies import get_db_session, get_llm
 from ..services.llm import LLMService
+from ..services.db_metrics import pool_metrics
+from ..database import replicas
+from ..services.warmup import readiness
 
 router = APIRouter(tags=["Health"])
 
@@ -19,13 +23,26 @@ async def health_check(db: AsyncSession = Depends(get_db_session)):
     except Exception:
         pass
     
-    return {
+    body = {
         "status": "healthy" if db_ok else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "database": "connected" if db_ok else "disconnected",
+        "warmup": readiness.steps,
         "service": "travel-recommendation-api",
         "version": "1.0.0"
     }
+    if not readiness.ready:
+        # Пулы и кэши ещё прогреваются — трафик сюда пока не нужен
+        body["status"] = "starting"
+        return JSONResponse(body, status_code=503)
+    if readiness.error:
+        body["warmup_error"] = readiness.error
+    return body
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Метрики пула соединений БД и реплик в формате Prometheus"""
+    return pool_metrics.render_prometheus() + replicas.render_prometheus()
 
 @router.get("/llm-status")
 async def llm_status(llm: LLMService = Depends(get_llm)):
@@ -1,14 +1,18 @@
 # backend/src/routers/moderation.py
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from typing import List, Optional
 from uuid import UUID
-from ..dependencies import get_db_session
+from datetime import datetime
+from ..dependencies import get_db_session, get_cache, get_events, get_uow
 from ..models import User, Review, ModerationStatus, UserRole
 from ..schemas.review import ReviewResponse, ReviewUpdate
-from ..services.recommendation import RecommendationService
 from ..services.cache import CacheService
+from ..services.events import EventPublisher
+from ..responses import REVIEW_COLUMNS, FastJSONResponse, row_dicts
+from ..pagination import decode_cursor, next_cursor, set_next_cursor
+from ..unit_of_work import UnitOfWork, set_review_status
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,140 +39,119 @@ async def verify_moderator(
     
     return moderator
 
+async def _ensure_status_changed(uow: UnitOfWork, review_id: UUID, review, already: str):
+    """UPDATE не вернул строку: отзыва нет (404) или статус уже такой (400)"""
+    if review:
+        return
+    found = await uow.session.scalar(select(Review.id).where(Review.id == review_id))
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Отзыв не найден"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=already
+    )
+
+async def _publish_moderation_event(events: EventPublisher, review):
+    """Уведомить автора отзыва о решении модератора"""
+    if review.author_telegram_id:
+        await events.publish_review_status(
+            review,
+            author_telegram_id=review.author_telegram_id,
+            actor="moderator"
+        )
+
 @router.get("/queue", response_model=List[ReviewResponse])
 async def get_moderation_queue(
     telegram_id: int = Body(..., embed=True, gt=0),
     limit: int = Body(20, embed=True, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Значение X-Next-Cursor предыдущей страницы"),
     db: AsyncSession = Depends(get_db_session)
 ):
-    """Получить очередь отзывов на модерацию"""
+    """Получить очередь отзывов на модерацию (старые первыми)"""
     await verify_moderator(telegram_id, db)
     
+    query = select(*REVIEW_COLUMNS).where(
+        Review.moderation_status.in_([ModerationStatus.PENDING, ModerationStatus.FLAGGED_BY_LLM])
+    )
+    if cursor:
+        query = query.where(
+            tuple_(Review.created_at, Review.id) > tuple_(*decode_cursor(cursor, (datetime, UUID)))
+        )
     result = await db.execute(
-        select(Review)
-        .where(Review.moderation_status.in_([ModerationStatus.PENDING, ModerationStatus.FLAGGED_BY_LLM]))
-        .order_by(Review.created_at.asc())
-        .limit(limit)
+        query.order_by(Review.created_at.asc(), Review.id.asc()).limit(limit)
     )
-    
-    reviews = result.scalars().all()
-    return [ReviewResponse.model_validate(r) for r in reviews]
+    page = row_dicts(result)
+    return set_next_cursor(FastJSONResponse(page), next_cursor(page, limit, ("created_at", "id")))
 
 @router.post("/reviews/{review_id}/approve", response_model=ReviewResponse)
 async def approve_review(
     review_id: UUID,
     telegram_id: int = Body(..., embed=True, gt=0),
     notes: Optional[str] = Body(None, embed=True),
-    db: AsyncSession = Depends(get_db_session),
-    cache: CacheService = Depends(get_db_session)  # TODO: исправить
+    uow: UnitOfWork = Depends(get_uow),
+    cache: CacheService = Depends(get_cache),
+    events: EventPublisher = Depends(get_events)
 ):
     """Одобрить отзыв"""
-    moderator = await verify_moderator(telegram_id, db)
-    
-    # Находим отзыв
-    result = await db.execute(
-        select(Review).where(Review.id == review_id)
-    )
-    review = result.scalar_one_or_none()
-    
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Отзыв не найден"
-        )
-    
-    if review.moderation_status == ModerationStatus.APPROVED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Отзыв уже одобрен"
-        )
+    moderator = await verify_moderator(telegram_id, uow.session)
     
     try:
-        old_status = review.moderation_status
-        review.moderation_status = ModerationStatus.APPROVED
-        review.moderated_by = moderator.id
-        if notes:
-            review.moderation_notes = notes
-        
-        await db.flush()
-        
-        # Обновляем рейтинг места
-        if old_status != ModerationStatus.APPROVED:
-            rec_service = RecommendationService(cache)
-            await rec_service.update_place_rating(db, review.place_id)
-            
-            # Очищаем кэш рекомендаций для этого места
-            await cache.clear_pattern(f"recs:*:place:{review.place_id}:*")
-        
-        await db.commit()
-        await db.refresh(review)
-        
-        logger.info(f"Review {review_id} approved by moderator {moderator.id}")
-        return ReviewResponse.model_validate(review)
-        
+        # Проверка статуса и смена — один UPDATE ... RETURNING;
+        # рейтинг места и place_stats обновляет триггер на reviews
+        async with uow:
+            review = await uow.one_or_none(
+                set_review_status(review_id, ModerationStatus.APPROVED.value, moderator.id, notes)
+            )
     except Exception as e:
-        await db.rollback()
         logger.error(f"Error approving review: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ошибка при одобрении отзыва"
         )
+    
+    await _ensure_status_changed(uow, review_id, review, "Отзыв уже одобрен")
+    
+    # Очищаем кэш рекомендаций для этого места
+    await cache.clear_pattern(f"recs:*:place:{review.place_id}:*")
+    
+    logger.info(f"Review {review_id} approved by moderator {moderator.id}")
+    await _publish_moderation_event(events, review)
+    return ReviewResponse.model_validate(review)
 
 @router.post("/reviews/{review_id}/reject", response_model=ReviewResponse)
 async def reject_review(
     review_id: UUID,
     telegram_id: int = Body(..., embed=True, gt=0),
     notes: Optional[str] = Body(None, embed=True),
-    db: AsyncSession = Depends(get_db_session),
-    cache: CacheService = Depends(get_db_session)  # TODO: исправить
+    uow: UnitOfWork = Depends(get_uow),
+    cache: CacheService = Depends(get_cache),
+    events: EventPublisher = Depends(get_events)
 ):
     """Отклонить отзыв"""
-    moderator = await verify_moderator(telegram_id, db)
-    
-    result = await db.execute(
-        select(Review).where(Review.id == review_id)
-    )
-    review = result.scalar_one_or_none()
-    
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Отзыв не найден"
-        )
-    
-    if review.moderation_status == ModerationStatus.REJECTED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Отзыв уже отклонен"
-        )
+    moderator = await verify_moderator(telegram_id, uow.session)
     
     try:
-        old_status = review.moderation_status
-        review.moderation_status = ModerationStatus.REJECTED
-        review.moderated_by = moderator.id
-        if notes:
-            review.moderation_notes = notes
-        
-        await db.flush()
-        
-        # Если отзыв был одобрен, обновляем рейтинг места
-        if old_status == ModerationStatus.APPROVED:
-            rec_service = RecommendationService(cache)
-            await rec_service.update_place_rating(db, review.place_id)
-            
-            # Очищаем кэш
-            await cache.clear_pattern(f"recs:*:place:{review.place_id}:*")
-        
-        await db.commit()
-        await db.refresh(review)
-        
-        logger.info(f"Review {review_id} rejected by moderator {moderator.id}")
-        return ReviewResponse.model_validate(review)
-        
+        # Рейтинг места и place_stats обновляет триггер на reviews
+        async with uow:
+            review = await uow.one_or_none(
+                set_review_status(review_id, ModerationStatus.REJECTED.value, moderator.id, notes)
+            )
     except Exception as e:
-        await db.rollback()
         logger.error(f"Error rejecting review: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ошибка при отклонении отзыва"
-        )
\ No newline at end of file
+        )
+    
+    await _ensure_status_changed(uow, review_id, review, "Отзыв уже отклонен")
+    
+    # Если отзыв был одобрен, очищаем кэш
+    if review.old_status == ModerationStatus.APPROVED.value:
+        await cache.clear_pattern(f"recs:*:place:{review.place_id}:*")
+    
+    logger.info(f"Review {review_id} rejected by moderator {moderator.id}")
+    await _publish_moderation_event(events, review)
+    return ReviewResponse.model_validate(review)
@@ -1,17 +1,29 @@
 # backend/src/routers/places.py
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 from typing import List, Optional
 from uuid import UUID
-from ..dependencies import get_db_session
+from datetime import datetime
+from ..dependencies import get_read_session, get_place_index, get_catalog, get_uow
 from ..models import Place, PlaceCategory
-from ..schemas.place import PlaceResponse, PlaceListResponse, PlaceCreate
+from ..schemas.place import PlaceResponse, PlaceListResponse, PlaceCreate, PlaceSuggestion, PlaceNearbyResponse
+from ..services.search_index import PlaceNameIndex
+from ..services.catalog import CatalogCache
+from ..responses import PLACE_COLUMNS, FastJSONResponse, row_dicts
+from ..pagination import decode_cursor, next_cursor, set_next_cursor
+from ..services.nearby import find_nearby
+from ..unit_of_work import UnitOfWork, insert_place
+from shared.config import config
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/places", tags=["Places"])
 
+# Порядок выдачи /places/ (совпадает с индексами ix_places_active_*_rank)
+RANK_KEYS = ("rating", "rating_count", "created_at", "id")
+RANK_TYPES = (float, int, datetime, UUID)
+
 @router.get("/", response_model=List[PlaceResponse])
 async def get_places(
     category: Optional[PlaceCategory] = None,
@@ -20,11 +32,24 @@ async def get_places(
     max_price: Optional[int] = Query(None, ge=1, le=5),
     search: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db_session)
+    offset: int = Query(0, ge=0, description="Устарело: используйте cursor"),
+    cursor: Optional[str] = Query(None, description="Значение X-Next-Cursor предыдущей страницы"),
+    db: AsyncSession = Depends(get_read_session),
+    catalog: CatalogCache = Depends(get_catalog)
 ):
-    """Получить список мест с фильтрацией"""
-    query = select(Place).where(Place.is_active == True)
+    """Получить список мест с фильтрацией.
+
+    Курсор следующей страницы — в заголовке X-Next-Cursor.
+    """
+    # Первые страницы без фильтров (кроме города) — из кэша каталога
+    if category is None and min_rating is None and max_price is None and not search and cursor is None:
+        await catalog.ensure_fresh()
+        cached = catalog.top(city, offset, limit)
+        if cached is not None:
+            return set_next_cursor(FastJSONResponse(cached), next_cursor(cached, limit, RANK_KEYS))
+    
+    # Только колонки ответа, без ORM-объектов и повторной валидации
+    query = select(*PLACE_COLUMNS).where(Place.is_active == True)
     
     # Применяем фильтры
     if category:
@@ -41,22 +66,61 @@ async def get_places(
             func.lower(Place.description).contains(search.lower())
         )
     
-    # Сортировка и пагинация
+    # Сортировка и пагинация: ключ (все по убыванию) + id для однозначности
+    if cursor:
+        query = query.where(
+            tuple_(Place.rating, Place.rating_count, Place.created_at, Place.id)
+            < tuple_(*decode_cursor(cursor, RANK_TYPES))
+        )
+    elif offset:
+        query = query.offset(offset)
     query = query.order_by(
         Place.rating.desc(),
         Place.rating_count.desc(),
-        Place.created_at.desc()
-    ).offset(offset).limit(limit)
+        Place.created_at.desc(),
+        Place.id.desc()
+    ).limit(limit)
     
     result = await db.execute(query)
-    places = result.scalars().all()
-    
-    return [PlaceResponse.model_validate(p) for p in places]
+    page = row_dicts(result)
+    return set_next_cursor(FastJSONResponse(page), next_cursor(page, limit, RANK_KEYS))
+
+@router.get("/autocomplete/", response_model=List[PlaceSuggestion])
+async def autocomplete_places(
+    q: str = Query(..., min_length=1, max_length=100),
+    city: str = Query("Moscow"),
+    limit: int = Query(10, ge=1, le=50),
+    index: PlaceNameIndex = Depends(get_place_index)
+):
+    """Автодополнение названий мест по префиксу (без обращения к БД)"""
+    await index.ensure_fresh()
+    return index.search(city, q, limit)
+
+@router.get("/nearby/", response_model=List[PlaceNearbyResponse])
+async def get_nearby_places(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: int = Query(1000, ge=50, le=50000, description="Радиус в метрах"),
+    category: Optional[PlaceCategory] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Места рядом с точкой: по близости с учётом рейтинга"""
+    places = await find_nearby(
+        db,
+        latitude=lat,
+        longitude=lon,
+        radius_m=radius,
+        category=category,
+        rating_weight=config.NEARBY_RATING_WEIGHT,
+        limit=limit
+    )
+    return FastJSONResponse(places)
 
 @router.get("/{place_id}", response_model=PlaceResponse)
 async def get_place(
     place_id: UUID,
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Получить место по ID"""
     result = await db.execute(
@@ -75,31 +139,17 @@ async def get_place(
 @router.post("/", response_model=PlaceResponse, status_code=status.HTTP_201_CREATED)
 async def create_place(
     place_data: PlaceCreate,
-    db: AsyncSession = Depends(get_db_session)
+    uow: UnitOfWork = Depends(get_uow),
+    catalog: CatalogCache = Depends(get_catalog)
 ):
     """Создать новое место (для парсера/админов)"""
-    # Проверяем, не существует ли уже такое место
-    if place_data.external_id:
-        result = await db.execute(
-            select(Place).where(Place.external_id == place_data.external_id)
-        )
-        existing = result.scalar_one_or_none()
-        if existing:
-            return PlaceResponse.model_validate(existing)
+    # Уже известное место (тот же source + external_id) возвращается тем же запросом
+    async with uow:
+        place = await uow.one(insert_place(place_data.model_dump(exclude_unset=True)))
+    catalog.mark_stale()
     
-    # Создаем новое место
-    from uuid import uuid4
-    new_place = Place(
-        id=uuid4(),
-        **place_data.model_dump(exclude_unset=True)
-    )
-    
-    db.add(new_place)
-    await db.commit()
-    await db.refresh(new_place)
-    
-    logger.info(f"New place created: {new_place.name} in {new_place.city}")
-    return PlaceResponse.model_validate(new_place)
+    logger.info(f"Place saved: {place.name} in {place.city}")
+    return FastJSONResponse(place._asdict(), status_code=status.HTTP_201_CREATED)
 
 @router.get("/categories/", response_model=List[str])
 async def get_categories():
@@ -107,13 +157,7 @@ async def get_categories():
     return [category.value for category in PlaceCategory]
 
 @router.get("/cities/", response_model=List[str])
-async def get_cities(db: AsyncSession = Depends(get_db_session)):
-    """Получить список городов с местами"""
-    result = await db.execute(
-        select(Place.city)
-        .where(Place.is_active == True)
-        .distinct()
-        .order_by(Place.city)
-    )
-    cities = result.scalars().all()
-    return list(cities)
\ No newline at end of file
+async def get_cities(catalog: CatalogCache = Depends(get_catalog)):
+    """Получить список городов с местами (из кэша каталога)"""
+    await catalog.ensure_fresh()
+    return catalog.cities
\ No newline at end of file
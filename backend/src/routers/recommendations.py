@@ -2,8 +2,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
-from ..dependencies import get_db_session, get_llm
+from typing import List, Optional
+from ..dependencies import get_read_session, get_llm, get_cache
 from ..models import User, Place
 from ..schemas.recommendation import RecommendationRequest, RecommendationResponse
 from ..services.recommendation import RecommendationService
@@ -17,9 +17,9 @@ router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 async def get_chat_recommendations(
     request: RecommendationRequest,
     telegram_id: int = Body(..., embed=True, gt=0),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
     llm = Depends(get_llm),
-    cache: CacheService = Depends(get_db_session)  # TODO: исправить
+    cache: CacheService = Depends(get_cache)
 ):
     """Получить рекомендации через LLM-чат"""
     # 1. Находим пользователя
@@ -40,7 +40,9 @@ async def get_chat_recommendations(
         db=db,
         user_id=user.id,
         query=request.query,
-        limit=request.limit
+        limit=request.limit,
+        latitude=request.latitude,
+        longitude=request.longitude
     )
     
     # 3. Генерируем текстовые рекомендации через LLM
@@ -76,8 +78,10 @@ async def search_places(
     query: str = Body(..., embed=True, min_length=2, max_length=200),
     telegram_id: int = Body(..., embed=True, gt=0),
     limit: int = Body(5, embed=True, ge=1, le=20),
-    db: AsyncSession = Depends(get_db_session),
-    cache: CacheService = Depends(get_db_session)  # TODO: исправить
+    latitude: Optional[float] = Body(None, embed=True, ge=-90, le=90),
+    longitude: Optional[float] = Body(None, embed=True, ge=-180, le=180),
+    db: AsyncSession = Depends(get_read_session),
+    cache: CacheService = Depends(get_cache)
 ):
     """Поиск мест по запросу"""
     # Аналогично chat, но без LLM текста
@@ -97,7 +101,9 @@ async def search_places(
         db=db,
         user_id=user.id,
         query=query,
-        limit=limit
+        limit=limit,
+        latitude=latitude,
+        longitude=longitude
     )
     
     city = user.preferences.get('city', 'Moscow') if user.preferences else 'Moscow'
@@ -1,14 +1,18 @@
 # backend/src/routers/reviews.py
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from typing import List, Optional
 from uuid import UUID
-from ..dependencies import get_db_session, get_llm
+from datetime import datetime
+from ..dependencies import get_read_session, get_llm, get_cache, get_events, get_uow
 from ..models import User, Place, Review, ModerationStatus, UserRole
 from ..schemas.review import ReviewCreate, ReviewResponse, ReviewWithRelationsResponse
-from ..services.recommendation import RecommendationService
 from ..services.cache import CacheService
+from ..services.events import EventPublisher
+from ..responses import REVIEW_COLUMNS, FastJSONResponse, row_dicts
+from ..pagination import decode_cursor, next_cursor, set_next_cursor
+from ..unit_of_work import UnitOfWork, insert_review, review_lock, review_precheck
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,45 +22,29 @@ router = APIRouter(prefix="/reviews", tags=["Reviews"])
 async def create_review(
     review_data: ReviewCreate,
     telegram_id: int = Body(..., embed=True, gt=0),
-    db: AsyncSession = Depends(get_db_session),
+    uow: UnitOfWork = Depends(get_uow),
     llm = Depends(get_llm),
-    cache: CacheService = Depends(get_db_session)  # TODO: исправить зависимость
+    cache: CacheService = Depends(get_cache),
+    events: EventPublisher = Depends(get_events)
 ):
     """Создать отзыв"""
-    # 1. Находим пользователя
-    user_result = await db.execute(
-        select(User).where(User.telegram_id == telegram_id)
-    )
-    user = user_result.scalar_one_or_none()
+    # 1-3. Пользователь, место и прежний отзыв — одним запросом
+    found = await uow.one_or_none(review_precheck(telegram_id, review_data.place_id))
     
-    if not user:
+    if not found:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден"
         )
     
-    # 2. Находим место
-    place_result = await db.execute(
-        select(Place).where(Place.id == review_data.place_id, Place.is_active == True)
-    )
-    place = place_result.scalar_one_or_none()
-    
-    if not place:
+    if found.place_name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Место не найдено"
         )
     
-    # 3. Проверяем, не оставлял ли пользователь уже отзыв на это место
-    existing_review_result = await db.execute(
-        select(Review).where(
-            Review.user_id == user.id,
-            Review.place_id == review_data.place_id
-        )
-    )
-    existing_review = existing_review_result.scalar_one_or_none()
-    
-    if existing_review:
+    # Проверка до LLM, чтобы не тратить на повторный отзыв вызовы модели
+    if found.reviewed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Вы уже оставляли отзыв на это место"
@@ -72,51 +60,55 @@ async def create_review(
     else:
         moderation_status = ModerationStatus.FLAGGED_BY_LLM
     
-    # 5. Создаем отзыв
-    from uuid import uuid4
-    new_review = Review(
-        id=uuid4(),
-        user_id=user.id,
-        place_id=review_data.place_id,
-        rating=review_data.rating,
-        text=review_data.text,
-        summary=summary,
-        moderation_status=moderation_status,
-        llm_check=llm_check
-    )
-    
+    # 5. Создаем отзыв; строка возвращается тем же INSERT, без refresh
     try:
-        db.add(new_review)
-        await db.flush()  # Получаем ID без коммита
-        
-        # 6. Обновляем рейтинг места (если отзыв одобрен)
-        if moderation_status == ModerationStatus.APPROVED:
-            from ..services.recommendation import RecommendationService
-            rec_service = RecommendationService(cache)
-            await rec_service.update_place_rating(db, review_data.place_id)
-        
-        await db.commit()
-        await db.refresh(new_review)
-        
-        # 7. Очищаем кэш рекомендаций для этого пользователя
-        await cache.clear_pattern(f"recs:user:{user.id}:*")
-        
-        logger.info(f"Review created: user={user.id}, place={review_data.place_id}, rating={review_data.rating}")
-        return ReviewResponse.model_validate(new_review)
-        
+        async with uow:
+            # Параллельный отзыв того же автора на это место ждёт нашего коммита
+            await uow.one(review_lock(found.user_id, review_data.place_id))
+            # 6. Рейтинг места и place_stats обновляет триггер на reviews
+            review = await uow.one_or_none(insert_review({
+                "user_id": found.user_id,
+                "place_id": review_data.place_id,
+                "rating": review_data.rating,
+                "text": review_data.text,
+                "summary": summary,
+                "moderation_status": moderation_status.value,
+                "llm_check": llm_check,
+            }))
     except Exception as e:
-        await db.rollback()
         logger.error(f"Error creating review: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ошибка при создании отзыва"
         )
+    
+    # Параллельный запрос успел записать отзыв, пока шла проверка LLM
+    if review is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Вы уже оставляли отзыв на это место"
+        )
+    
+    # 7. Очищаем кэш рекомендаций для этого пользователя
+    await cache.clear_pattern(f"recs:user:{found.user_id}:*")
+    
+    # 8. Событие для модераторов (отзыв требует проверки)
+    if moderation_status != ModerationStatus.APPROVED:
+        await events.publish_review_status(
+            review,
+            author_telegram_id=telegram_id,
+            actor="llm",
+            place_name=found.place_name
+        )
+    
+    logger.info(f"Review created: user={found.user_id}, place={review_data.place_id}, rating={review_data.rating}")
+    return ReviewResponse.model_validate(review)
 
 @router.get("/place/{place_id}", response_model=List[ReviewWithRelationsResponse])
 async def get_reviews_by_place(
     place_id: UUID,
     show_pending: bool = Query(False),
-    db: AsyncSession = Depends(get_db_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Получить отзывы по месту"""
     query = select(Review).where(Review.place_id == place_id)
@@ -151,13 +143,18 @@ async def get_reviews_by_place(
 @router.get("/user/{user_id}", response_model=List[ReviewResponse])
 async def get_reviews_by_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db_session)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Значение X-Next-Cursor предыдущей страницы"),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    """Получить отзывы пользователя"""
+    """Получить отзывы пользователя (новые первыми)"""
+    query = select(*REVIEW_COLUMNS).where(Review.user_id == user_id)
+    if cursor:
+        query = query.where(
+            tuple_(Review.created_at, Review.id) < tuple_(*decode_cursor(cursor, (datetime, UUID)))
+        )
     result = await db.execute(
-        select(Review)
-        .where(Review.user_id == user_id)
-        .order_by(Review.created_at.desc())
+        query.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit)
     )
-    reviews = result.scalars().all()
-    return [ReviewResponse.model_validate(r) for r in reviews]
\ No newline at end of file
+    page = row_dicts(result)
+    return set_next_cursor(FastJSONResponse(page), next_cursor(page, limit, ("created_at", "id")))
\ No newline at end of file
@@ -1,5 +1,6 @@
 # backend/src/schemas/place.py
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 from pydantic import Field, field_validator
 from .base import BaseSchema, TimestampSchema
@@ -31,6 +32,14 @@ class PlaceUpdate(BaseSchema):
     price_level: Optional[int] = None
     is_active: Optional[bool] = None
 
+class PlaceStatsResponse(BaseSchema):
+    """Агрегаты отзывов места (таблица place_stats)"""
+    review_count: int
+    approved_count: int
+    rating_histogram: List[int]  # Одобренные оценки 1..5
+    flagged_ratio: float  # Доля отзывов flagged_by_llm и rejected
+    last_review_at: Optional[datetime]
+
 class PlaceResponse(TimestampSchema):
     """Схема ответа с местом"""
     id: UUID
@@ -47,6 +56,20 @@ class PlaceResponse(TimestampSchema):
     source: SourceType
     external_url: Optional[str]
     is_active: bool
+    stats: Optional[PlaceStatsResponse] = None
+
+class PlaceNearbyResponse(PlaceResponse):
+    """Место рядом с точкой"""
+    distance_m: int
+
+class PlaceSuggestion(BaseSchema):
+    """Подсказка автодополнения (inline-режим бота)"""
+    id: UUID
+    name: str
+    category: str
+    address: Optional[str]
+    rating: float
+    rating_count: int
 
 class PlaceListResponse(BaseSchema):
     """Схема для списка мест с пагинацией"""
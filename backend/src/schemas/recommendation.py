@@ -8,6 +8,9 @@ class RecommendationRequest(BaseSchema):
     """Запрос рекомендаций"""
     query: str = Field(..., min_length=2, max_length=200)
     limit: int = Field(default=5, ge=1, le=20)
+    # Точка пользователя: места ранжируются по близости с учётом рейтинга
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
 
 class RecommendationResponse(BaseSchema):
     """Ответ с рекомендациями"""
@@ -0,0 +1,77 @@
+# backend/src/services/catalog.py
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func, select
+import logging
+from ..models import Place
+from ..responses import PLACE_BASE_COLUMNS, PLACE_COLUMNS, stats_column
+from .refresh import BackgroundRefresh
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogCache(BackgroundRefresh):
+    """Горячие данные каталога в памяти: список городов и топ мест.
+
+    Топ — первая страница /places/ без фильтров (общая и по каждому городу) в
+    той же сортировке, что и эндпоинт, уже в виде словарей для orjson.
+    Обновляется в фоне раз в refresh_interval секунд, как PlaceNameIndex.
+    """
+
+    name = "Catalog cache"
+
+    def __init__(self, session_factory: Callable, refresh_interval: float = 60.0, top_limit: int = 50):
+        super().__init__(refresh_interval)
+        self.session_factory = session_factory
+        self.top_limit = top_limit
+        self.cities: List[str] = []
+        self._top: Dict[Optional[str], List[Dict]] = {}
+
+    async def refresh(self):
+        async with self._lock:
+            started = time.perf_counter()
+            order = (Place.rating.desc(), Place.rating_count.desc(), Place.created_at.desc(), Place.id.desc())
+            async with self.session_factory() as session:
+                cities = (await session.execute(
+                    select(Place.city).where(Place.is_active == True).distinct().order_by(Place.city)
+                )).scalars().all()
+
+                top_all = (await session.execute(
+                    select(*PLACE_COLUMNS).where(Place.is_active == True).order_by(*order).limit(self.top_limit)
+                )).all()
+
+                # Топ каждого города одним запросом через row_number(); агрегаты
+                # отзывов — только для попавших в топ
+                ranked = (
+                    select(*PLACE_BASE_COLUMNS, func.row_number().over(partition_by=Place.city, order_by=order).label("pos"))
+                    .where(Place.is_active == True)
+                    .subquery()
+                )
+                columns = [ranked.c[column.key] for column in PLACE_BASE_COLUMNS] + [stats_column(ranked.c.id)]
+                top_city = (await session.execute(
+                    select(*columns).where(ranked.c.pos <= self.top_limit).order_by(ranked.c.city, ranked.c.pos)
+                )).all()
+
+            top: Dict[Optional[str], List[Dict]] = {None: [row._asdict() for row in top_all]}
+            for row in top_city:
+                top.setdefault(row.city, []).append(row._asdict())
+
+            self.cities = list(cities)
+            self._top = top
+            self._loaded_at = time.monotonic()
+            logger.info(
+                f"Catalog cache refreshed: {len(self.cities)} cities, "
+                f"{len(top_city)} top places in {time.perf_counter() - started:.2f}s"
+            )
+
+    def mark_stale(self):
+        """Обновить при следующем обращении (после записи в places)"""
+        if self._loaded_at is not None:
+            self._loaded_at = 0.0
+
+    def top(self, city: Optional[str], offset: int, limit: int) -> Optional[List[Dict]]:
+        """Страница топа или None, если она за пределами кэша"""
+        if not self.loaded or offset + limit > self.top_limit:
+            return None
+        places = self._top.get(city, [])
+        return places[offset:offset + limit]
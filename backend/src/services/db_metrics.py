@@ -0,0 +1,181 @@
+# backend/src/services/db_metrics.py
+"""
+Метрики пула соединений и журнал медленных запросов.
+
+InstrumentedPool замеряет ожидание соединения (_do_get): при исчерпанном
+пуле именно здесь запрос стоит в очереди. События checkout/checkin дают
+число занятых соединений и время удержания. Медленные запросы пишутся в лог
+вместо echo=True, который логировал каждый запрос синхронно.
+
+Число запросов к БД за HTTP-запрос считается в request_queries (ContextVar):
+middleware кладёт туда QueryCount, обработчик события курсора его
+увеличивает. Итог — в заголовке ответа X-DB-Query-Count.
+"""
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger("backend.slow_query")
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.bounds = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        idx = bisect_left(self.bounds, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+
+    def render(self, name: str) -> List[str]:
+        lines = [f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, n in zip(self.bounds, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.total:.6f}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class PoolMetrics:
+    """Агрегаты пула соединений"""
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self.hold_time = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.slow_queries = 0
+        self.pool = None
+
+    def snapshot(self) -> Dict[str, float]:
+        if self.pool is None:
+            return {}
+        capacity = self.pool.size() + self.pool._max_overflow
+        in_use = self.pool.checkedout()
+        return {
+            "size": self.pool.size(),
+            "checked_out": in_use,
+            "overflow": max(self.pool.overflow(), 0),
+            "idle": self.pool.checkedin(),
+            "saturation": round(in_use / capacity, 4) if capacity > 0 else 0.0,
+        }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for key, value in self.snapshot().items():
+            lines.append(f"# TYPE db_pool_{key} gauge")
+            lines.append(f"db_pool_{key} {value}")
+        for name, value in (
+            ("db_pool_checkouts_total", self.checkouts),
+            ("db_pool_timeouts_total", self.timeouts),
+            ("db_pool_connects_total", self.connects),
+            ("db_slow_queries_total", self.slow_queries),
+        ):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        lines += self.checkout_wait.render("db_pool_checkout_wait_seconds")
+        lines += self.hold_time.render("db_pool_connection_hold_seconds")
+        return "\n".join(lines) + "\n"
+
+
+pool_metrics = PoolMetrics()
+
+
+class QueryCount:
+    """Счётчик запросов к БД в рамках одного HTTP-запроса"""
+
+    def __init__(self):
+        self.queries = 0
+
+
+# Объект изменяемый: задачи и greenlet'ы SQLAlchemy видят тот же счётчик
+request_queries: ContextVar[Optional[QueryCount]] = ContextVar("request_queries", default=None)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Пул, замеряющий ожидание свободного соединения"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            # TimeoutError пула: все соединения заняты дольше pool_timeout
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.checkout_wait.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine, slow_query_ms: float, track_pool: bool = True):
+    """Подписать движок на события пула и курсора"""
+    sync_engine = engine.sync_engine
+    _count_queries(sync_engine)
+    if track_pool:
+        _track_pool(sync_engine.pool)
+    if slow_query_ms > 0:
+        _log_slow_queries(sync_engine, slow_query_ms / 1000)
+
+
+def _track_pool(pool):
+    pool_metrics.pool = pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            pool_metrics.hold_time.observe(time.perf_counter() - started)
+
+
+def _count_queries(sync_engine):
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = request_queries.get()
+        if counter is not None:
+            counter.queries += 1
+
+
+def _log_slow_queries(sync_engine, threshold: float):
+    # Начало храним в контексте выполнения, а не в стеке на соединении: при
+    # ошибке запроса after_cursor_execute не вызывается, и стек бы сбился
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= threshold:
+            pool_metrics.slow_queries += 1
+            # Параметры не логируем: в них бывают персональные данные
+            sql = " ".join(statement.split())
+            logger.warning(f"Slow query {elapsed * 1000:.0f} ms: {sql[:1000]}")
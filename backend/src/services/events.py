@@ -0,0 +1,52 @@
+# backend/src/services/events.py
+from typing import Optional
+from uuid import uuid4
+from datetime import datetime
+import redis.asyncio as redis
+import logging
+from ..models import ModerationStatus
+
+logger = logging.getLogger(__name__)
+
+
+class EventPublisher:
+    """Публикация событий отзывов в Redis Streams"""
+
+    def __init__(self, redis_url: str, stream: str, maxlen: int = 100_000):
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.stream = stream
+        self.maxlen = maxlen
+
+    async def publish_review_status(
+        self,
+        review,
+        author_telegram_id: int,
+        actor: str,
+        place_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Опубликовать смену статуса отзыва.
+
+        actor: "llm" — статус выставлен автоматически при создании,
+               "moderator" — решение модератора.
+        """
+        fields = {
+            "event_id": str(uuid4()),
+            "type": "review_status",
+            "review_id": str(review.id),
+            "place_id": str(review.place_id),
+            "place_name": place_name or "",
+            "status": ModerationStatus(review.moderation_status).value,
+            "rating": str(review.rating),
+            "text": (review.text or "")[:200],
+            "notes": review.moderation_notes or "",
+            "author_telegram_id": str(author_telegram_id),
+            "actor": actor,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            return await self.redis.xadd(
+                self.stream, fields, maxlen=self.maxlen, approximate=True
+            )
+        except Exception as e:
+            logger.error(f"Event publish error for review {review.id}: {e}")
+            return None
@@ -0,0 +1,78 @@
+# backend/src/services/geo_rank.py
+"""
+Векторное ранжирование кандидатов по расстоянию и рейтингу (NumPy).
+
+Координаты и рейтинги кандидатов лежат в массивах: сначала дешёвый отсев
+прямоугольником (только сравнения), затем haversine и смешанная оценка для
+оставшихся одним проходом по массивам, top-k — через argpartition за O(n),
+сортируются только k лучших. Формула оценки та же, что была в rank_nearby:
+
+    score = (1 - w) * (1 - distance / radius) + w * rating / 5
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.geo import EARTH_RADIUS_M, bounding_box
+
+
+def haversine_np(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Расстояния в метрах от точки до массива точек"""
+    phi1 = np.radians(latitude)
+    phi2 = np.radians(latitudes)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(longitudes - longitude)
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def bbox_mask(latitude: float, longitude: float, radius_m: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Кандидаты внутри прямоугольника вокруг круга (NaN отсеиваются)"""
+    min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_m)
+    return (
+        (latitudes >= min_lat) & (latitudes <= max_lat)
+        & (longitudes >= min_lon) & (longitudes <= max_lon)
+    )
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Индексы k наибольших оценок по убыванию"""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(scores.size)
+    # Стабильная сортировка: при равной оценке порядок кандидатов сохраняется
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def rank_by_distance(
+    latitudes: Sequence[Optional[float]],
+    longitudes: Sequence[Optional[float]],
+    ratings: Sequence[Optional[float]],
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    rating_weight: float = 0.3,
+    limit: int = 20
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Лучшие кандидаты в радиусе: (индексы во входных массивах, расстояния в метрах).
+
+    None в координатах — место без координат, в выдачу не попадает; None в
+    рейтинге считается нулём.
+    """
+    lats = np.asarray(latitudes, dtype=np.float64)
+    lons = np.asarray(longitudes, dtype=np.float64)
+
+    candidates = np.flatnonzero(bbox_mask(latitude, longitude, radius_m, lats, lons))
+    distances = haversine_np(latitude, longitude, lats[candidates], lons[candidates])
+    inside = distances <= radius_m
+    candidates = candidates[inside]
+    distances = distances[inside]
+
+    rates = np.nan_to_num(np.asarray(ratings, dtype=np.float64)[candidates])
+    scores = (1 - rating_weight) * (1 - distances / radius_m) + rating_weight * rates / 5
+
+    best = top_k(scores, limit)
+    return candidates[best], distances[best]
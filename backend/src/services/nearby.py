@@ -0,0 +1,101 @@
+# backend/src/services/nearby.py
+"""
+Поиск мест рядом с точкой.
+
+Без PostGIS: кандидаты выбираются по префиксам geohash (ячейка точки и 8
+соседних, B-tree индекс ix_places_geohash) плюс прямоугольник по координатам.
+Для радиусов крупнее ячеек geohash остаётся только прямоугольник. Точное
+расстояние и итоговый порядок считаются на стороне приложения (geo_rank):
+это же и запасной путь, не зависящий от возможностей БД.
+"""
+import math
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.geo import bounding_box, geohash_cover
+from ..models import Place
+from ..responses import PLACE_BASE_COLUMNS, stats_column
+from .geo_rank import rank_by_distance
+
+# Верхняя граница кандидатов из БД (ближайшие к точке внутри области)
+MAX_CANDIDATES = 2000
+
+
+def area_filters(latitude: float, longitude: float, radius_m: float) -> list:
+    """Условия WHERE: места в прямоугольнике вокруг круга (и в ячейках geohash)"""
+    min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_m)
+    filters = [
+        Place.latitude.between(min_lat, max_lat),
+        Place.longitude.between(min_lon, max_lon),
+    ]
+    cells = geohash_cover(latitude, longitude, radius_m)
+    if cells:
+        # Префикс как диапазон: индексируется и с параметрами запроса (в collation C
+        # «~» больше любого символа geohash)
+        filters.append(or_(*(and_(Place.geohash >= cell, Place.geohash < cell + "~") for cell in cells)))
+    return filters
+
+
+def distance_order(latitude: float, longitude: float):
+    """Порядок по плоскому приближению расстояния: в плотном районе лимит
+    кандидатов отсекает дальние места, а не ближайшие с невысоким рейтингом"""
+    d_lat = Place.latitude - latitude
+    d_lon = (Place.longitude - longitude) * math.cos(math.radians(latitude))
+    return d_lat * d_lat + d_lon * d_lon
+
+
+def nearby_query(latitude: float, longitude: float, radius_m: float, category: Optional[str] = None):
+    query = select(*PLACE_BASE_COLUMNS).where(Place.is_active == True, *area_filters(latitude, longitude, radius_m))
+    if category:
+        query = query.where(Place.category == category)
+    return query.order_by(distance_order(latitude, longitude)).limit(MAX_CANDIDATES)
+
+
+def rank_nearby(
+    places: List[Dict],
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    rating_weight: float = 0.3,
+    limit: int = 20
+) -> List[Dict]:
+    """Отфильтровать по радиусу и упорядочить по близости с учётом рейтинга.
+
+    score = (1 - w) * (1 - distance / radius) + w * rating / 5
+    """
+    indices, distances = rank_by_distance(
+        [place["latitude"] for place in places],
+        [place["longitude"] for place in places],
+        [place["rating"] for place in places],
+        latitude, longitude, radius_m, rating_weight, limit
+    )
+    ranked = []
+    for index, distance in zip(indices.tolist(), distances.tolist()):
+        place = places[index]
+        place["distance_m"] = round(distance)
+        ranked.append(place)
+    return ranked
+
+
+async def find_nearby(
+    db: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    category: Optional[str] = None,
+    rating_weight: float = 0.3,
+    limit: int = 20
+) -> List[Dict]:
+    result = await db.execute(nearby_query(latitude, longitude, radius_m, category))
+    places = [row._asdict() for row in result]
+    ranked = rank_nearby(places, latitude, longitude, radius_m, rating_weight, limit)
+    if ranked:
+        # Агрегаты отзывов — только для выдачи, а не для всех кандидатов
+        stats = dict((await db.execute(
+            select(Place.id, stats_column()).where(Place.id.in_([place["id"] for place in ranked]))
+        )).all())
+        for place in ranked:
+            place["stats"] = stats.get(place["id"])
+    return ranked
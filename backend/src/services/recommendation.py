@@ -2,14 +2,22 @@
 from typing import List, Dict, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 import logging
-from ..models import Place, User, Review
+from ..models import Place, User
+from shared.config import config
+from shared.geo import geohash_encode
 from shared.models.enums import PlaceCategory
 from .cache import CacheService
+from .geo_rank import rank_by_distance
+from .nearby import area_filters, distance_order
 
 logger = logging.getLogger(__name__)
 
+# Радиус рекомендаций вокруг точки пользователя и потолок кандидатов в нём
+GEO_RADIUS_M = 5000
+GEO_MAX_CANDIDATES = 20_000
+
 class RecommendationService:
     """Сервис рекомендаций"""
     
@@ -21,9 +29,17 @@ class RecommendationService:
         db: AsyncSession,
         user_id: UUID,
         query: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_m: float = GEO_RADIUS_M
     ) -> List[Place]:
-        """Получить рекомендации для пользователя"""
+        """Получить рекомендации для пользователя.
+
+        С координатами места ранжируются по близости к точке с учётом рейтинга
+        (как /places/nearby/), без них — по рейтингу.
+        """
+        has_location = latitude is not None and longitude is not None
         # 1. Получить пользователя и его предпочтения
         user_result = await db.execute(
             select(User).where(User.id == user_id)
@@ -37,39 +53,47 @@ class RecommendationService:
         
         # 2. Попробовать получить из кэша
         cache_key = f"recs:user:{user_id}:city:{city}:query:{query or 'general'}"
+        if has_location:
+            cache_key += f":near:{geohash_encode(latitude, longitude, 6)}"
         cached = await self.cache.get(cache_key)
         if cached:
             # В реальности нужно десериализовать места
             pass
         
         # 3. Базовые рекомендации по городу и рейтингу
-        query_builder = select(Place).where(
+        filters = [
             Place.city == city,
             Place.is_active == True
-        )
+        ]
         
         # 4. Если есть текст запроса, пытаемся понять категорию
         if query:
             category = self._detect_category_from_query(query)
             if category:
-                query_builder = query_builder.where(Place.category == category)
+                filters.append(Place.category == category)
             else:
                 # Поиск по названию или описанию
-                query_builder = query_builder.where(
+                filters.append(
                     or_(
                         Place.name.ilike(f"%{query}%"),
                         Place.description.ilike(f"%{query}%")
                     )
                 )
         
-        # 5. Сортировка по рейтингу
-        query_builder = query_builder.order_by(
-            Place.rating.desc(),
-            Place.rating_count.desc()
-        ).limit(limit)
-        
-        result = await db.execute(query_builder)
-        places = result.scalars().all()
+        # 5. Сортировка по близости или по рейтингу
+        places = []
+        if has_location:
+            places = await self._rank_near(db, filters, latitude, longitude, radius_m, limit)
+        if not places:
+            # Без точки или в радиусе нет мест с координатами (у многих мест
+            # города их нет) — по рейтингу, как раньше
+            query_builder = select(Place).where(*filters).order_by(
+                Place.rating.desc(),
+                Place.rating_count.desc()
+            ).limit(limit)
+            
+            result = await db.execute(query_builder)
+            places = result.scalars().all()
         
         # 6. Сохранить в кэш
         places_data = [self._place_to_dict(p) for p in places]
@@ -77,6 +101,48 @@ class RecommendationService:
         
         return places
     
+    async def _rank_near(
+        self,
+        db: AsyncSession,
+        filters: list,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        limit: int
+    ) -> List[Place]:
+        """Лучшие места рядом с точкой: кандидаты — только колонки для ранжирования.
+
+        Область радиуса отсекается в SQL (прямоугольник и ячейки geohash, как
+        у /places/nearby/), лимит берёт ближайшие; NumPy считает точный радиус.
+        """
+        result = await db.execute(
+            select(Place.id, Place.latitude, Place.longitude, Place.rating)
+            .where(*filters, *area_filters(latitude, longitude, radius_m))
+            .order_by(distance_order(latitude, longitude))
+            .limit(GEO_MAX_CANDIDATES)
+        )
+        ids, latitudes, longitudes, ratings = [], [], [], []
+        for row in result:
+            ids.append(row.id)
+            latitudes.append(row.latitude)
+            longitudes.append(row.longitude)
+            ratings.append(row.rating)
+        
+        indices, _ = rank_by_distance(
+            latitudes, longitudes, ratings,
+            latitude, longitude, radius_m,
+            rating_weight=config.NEARBY_RATING_WEIGHT,
+            limit=limit
+        )
+        best_ids = [ids[i] for i in indices.tolist()]
+        if not best_ids:
+            return []
+        
+        # Полные строки — только для k лучших, в порядке ранжирования
+        result = await db.execute(select(Place).where(Place.id.in_(best_ids)))
+        by_id = {place.id: place for place in result.scalars()}
+        return [by_id[place_id] for place_id in best_ids if place_id in by_id]
+    
     def _detect_category_from_query(self, query: str) -> Optional[PlaceCategory]:
         """Определить категорию из текстового запроса"""
         query_lower = query.lower()
@@ -113,36 +179,4 @@ class RecommendationService:
             "rating": place.rating,
             "rating_count": place.rating_count,
             "price_level": place.price_level,
-        }
-    
-    async def update_place_rating(self, db: AsyncSession, place_id: UUID) -> bool:
-        """Обновить рейтинг места после отзыва"""
-        try:
-            # Получить средний рейтинг и количество одобренных отзывов
-            from sqlalchemy import func
-            
-            result = await db.execute(
-                select(
-                    func.avg(Review.rating).label("avg_rating"),
-                    func.count(Review.id).label("count")
-                ).where(
-                    Review.place_id == place_id,
-                    Review.moderation_status == "approved"
-                )
-            )
-            stats = result.first()
-            
-            if stats and stats.avg_rating is not None:
-                await db.execute(
-                    select(Place)
-                    .where(Place.id == place_id)
-                    .update({
-                        "rating": float(stats.avg_rating),
-                        "rating_count": stats.count
-                    })
-                )
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Error updating place rating: {e}")
-            return False
\ No newline at end of file
+        }
\ No newline at end of file
@@ -0,0 +1,53 @@
+# backend/src/services/refresh.py
+import asyncio
+import time
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresh:
+    """Данные в памяти, которые раз в refresh_interval секунд перечитываются из БД.
+
+    Наследник реализует refresh(): под self._lock читает данные и ставит
+    self._loaded_at. Первая загрузка идёт синхронно (параллельные запросы ждут
+    её), дальше устаревшие данные обновляются в фоне: запросы всё это время
+    обслуживаются по предыдущей версии.
+    """
+
+    name = "In-memory data"
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        raise NotImplementedError
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    async def ensure_fresh(self):
+        """Первая загрузка — синхронно, дальше обновление в фоне"""
+        if self._loaded_at is None:
+            if self._lock.locked():
+                # Данные уже загружает другой запрос — дождаться его
+                async with self._lock:
+                    pass
+            if self._loaded_at is None:
+                await self.refresh()
+            return
+
+        stale = time.monotonic() - self._loaded_at > self.refresh_interval
+        if stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"{self.name} refresh failed: {e}")
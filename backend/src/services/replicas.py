@@ -0,0 +1,133 @@
+# backend/src/services/replicas.py
+"""
+Маршрутизация чтения на реплики PostgreSQL.
+
+Читающие эндпоинты получают сессию реплики (по кругу среди здоровых), пишущие —
+сессию primary. После записи клиент на READ_YOUR_WRITES_SECONDS «прилипает» к
+primary, чтобы сразу увидеть свои изменения. Отставание реплик проверяется в
+фоне; реплика с отставанием больше REPLICA_MAX_LAG_SECONDS или недоступная
+исключается, а если здоровых не осталось — чтение идёт на primary.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Если всё полученное WAL уже применено, реплика догнала primary, даже когда
+# последняя транзакция была давно (на простаивающей базе now() - replay растёт)
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaSet:
+    """Набор реплик с проверкой отставания и «прилипанием» после записи"""
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        sticky_seconds: float = 5.0
+    ):
+        self.engines = engines
+        self.sessionmakers = [
+            async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in engines
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        # Отставание в секундах; None — реплика недоступна или ещё не проверена
+        self.lag: List[Optional[float]] = [None] * len(engines)
+        self._healthy: List[int] = []
+        self._round_robin = itertools.count()
+        self._sticky: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.reads_routed = 0
+        self.reads_on_primary = 0
+
+    def __len__(self):
+        return len(self.engines)
+
+    async def check_lag(self):
+        for idx, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as conn:
+                    lag = float((await conn.execute(LAG_QUERY)).scalar() or 0)
+            except Exception as e:
+                if self.lag[idx] is not None:
+                    logger.warning(f"⚠️ Реплика {idx} недоступна: {e}")
+                lag = None
+            self.lag[idx] = lag
+        self._healthy = [
+            idx for idx, lag in enumerate(self.lag)
+            if lag is not None and lag <= self.max_lag
+        ]
+
+    async def _watch(self):
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self):
+        if not self.engines:
+            return
+        await self.check_lag()
+        self._task = asyncio.create_task(self._watch())
+        logger.info(f"✅ Реплик: {len(self.engines)}, здоровых: {len(self._healthy)}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+    def mark_write(self, client_key: str):
+        self._sticky[client_key] = time.monotonic() + self.sticky_seconds
+        # Чистим протухшие записи, чтобы словарь не рос бесконечно
+        if len(self._sticky) > 10000:
+            now = time.monotonic()
+            self._sticky = {key: until for key, until in self._sticky.items() if until > now}
+
+    def is_sticky(self, client_key: str) -> bool:
+        until = self._sticky.get(client_key)
+        return until is not None and until > time.monotonic()
+
+    def pick(self, client_key: str) -> Optional[async_sessionmaker]:
+        """Фабрика сессий реплики или None, если читать нужно с primary"""
+        healthy = self._healthy
+        if not healthy or self.is_sticky(client_key):
+            self.reads_on_primary += 1
+            return None
+        self.reads_routed += 1
+        return self.sessionmakers[healthy[next(self._round_robin) % len(healthy)]]
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# TYPE db_replica_lag_seconds gauge",
+        ]
+        for idx, lag in enumerate(self.lag):
+            value = lag if lag is not None else -1
+            lines.append(f'db_replica_lag_seconds{{replica="{idx}"}} {value}')
+        lines += [
+            "# TYPE db_replica_healthy gauge",
+            f"db_replica_healthy {len(self._healthy)}",
+            "# TYPE db_reads_total counter",
+            f'db_reads_total{{target="replica"}} {self.reads_routed}',
+            f'db_reads_total{{target="primary"}} {self.reads_on_primary}',
+        ]
+        return "\n".join(lines) + "\n"
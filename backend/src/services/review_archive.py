@@ -0,0 +1,144 @@
+# backend/src/services/review_archive.py
+"""
+Архивация результатов проверки LLM (reviews.llm_check).
+
+JSONB с ответом модели нужен модераторам, пока отзыв в очереди. У отклонённых
+отзывов (через rejected_after_days) и у давно одобренных (через
+approved_after_days) он выносится в холодное хранилище — gzip-файлы NDJSON в
+archive_dir, — а в строке остаётся только имя файла (llm_check_archive).
+Горячие секции reviews от этого не раздуваются TOAST'ом.
+
+Пачка берётся FOR UPDATE SKIP LOCKED, поэтому несколько воркеров бэкенда не
+мешают друг другу. Файл пишется и сбрасывается на диск до коммита: при сбое
+коммита запись в архиве просто повторится в следующем файле.
+"""
+import asyncio
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import orjson
+from sqlalchemy import and_, null, or_, select, update
+
+from ..models import ModerationStatus, Review
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewArchiver:
+    """Фоновый вынос llm_check в архивные файлы"""
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        archive_dir: str,
+        rejected_after_days: int = 7,
+        approved_after_days: int = 90,
+        batch_size: int = 1000,
+        interval: float = 3600.0
+    ):
+        self.session_factory = session_factory
+        self.archive_dir = Path(archive_dir)
+        self.rejected_after = timedelta(days=rejected_after_days)
+        self.approved_after = timedelta(days=approved_after_days)
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def _candidates(self, now: datetime):
+        return (
+            select(Review.id, Review.place_id, Review.moderation_status, Review.created_at, Review.llm_check)
+            .where(
+                Review.llm_check.is_not(None),
+                # Уже вынесенные: в строках, записанных до перехода на SQL NULL,
+                # llm_check остался JSON 'null'
+                Review.llm_check_archive.is_(None),
+                or_(
+                    and_(
+                        Review.moderation_status == ModerationStatus.REJECTED.value,
+                        Review.updated_at < now - self.rejected_after,
+                    ),
+                    and_(
+                        Review.moderation_status == ModerationStatus.APPROVED.value,
+                        Review.created_at < now - self.approved_after,
+                    ),
+                ),
+            )
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def archive_batch(self) -> int:
+        """Вынести одну пачку; число вынесенных отзывов"""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            rows = (await session.execute(self._candidates(now))).all()
+            if not rows:
+                return 0
+
+            name = f"llm_check-{now:%Y%m%d-%H%M%S}-{os.getpid()}-{rows[0].id.hex[:8]}.ndjson.gz"
+            records = [
+                {
+                    "id": row.id,
+                    "place_id": row.place_id,
+                    "moderation_status": row.moderation_status,
+                    "created_at": row.created_at,
+                    "llm_check": row.llm_check,
+                }
+                for row in rows
+            ]
+            await asyncio.to_thread(self._write, self.archive_dir / name, records)
+
+            await session.execute(
+                update(Review)
+                .where(Review.id.in_([row.id for row in rows]))
+                # None в JSONB-колонке записался бы как JSON 'null', а не SQL NULL
+                .values(llm_check=null(), llm_check_archive=name)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _write(path: Path, records: List[Dict]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as stream:
+                for record in records:
+                    stream.write(orjson.dumps(record, option=orjson.OPT_UTC_Z) + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, path)
+
+    async def run_once(self) -> int:
+        """Вынести всё, что накопилось"""
+        started = time.perf_counter()
+        total = 0
+        while archived := await self.archive_batch():
+            total += archived
+        if total:
+            logger.info(f"🗄 Вынесено в архив llm_check: {total} отзывов за {time.perf_counter() - started:.2f}s")
+        return total
+
+    async def start(self):
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"✅ Архиватор отзывов: {self.archive_dir}, раз в {self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Ошибка архивации отзывов: {e}")
+            await asyncio.sleep(self.interval)
+
@@ -0,0 +1,122 @@
+# backend/src/services/search_index.py
+import asyncio
+import re
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import select
+import logging
+from ..models import Place
+from .refresh import BackgroundRefresh
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_name(text: str) -> str:
+    """Нижний регистр, ё → е"""
+    return text.lower().replace("ё", "е")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize_name(text))
+
+
+class _CityIndex:
+    """Отсортированные токены названий мест одного города.
+
+    Префиксный поиск — bisect по отсортированному списку, то же, что обход
+    trie, но без накладных расходов на узлы в Python.
+    """
+
+    def __init__(self, places: List[Dict]):
+        self.places = places
+        pairs: List[Tuple[str, int]] = []
+        self.tokens: List[List[str]] = []
+        for idx, place in enumerate(places):
+            tokens = tokenize(place["name"])
+            self.tokens.append(tokens)
+            pairs.extend((token, idx) for token in set(tokens))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.refs = [ref for _, ref in pairs]
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Кандидаты — по самому длинному слову запроса (самый узкий диапазон)
+        anchor = max(words, key=len)
+        start = bisect_left(self.keys, anchor)
+        end = bisect_left(self.keys, anchor + "\uffff", lo=start)
+
+        seen = set()
+        matches = []
+        for ref in self.refs[start:end]:
+            if ref in seen:
+                continue
+            seen.add(ref)
+            tokens = self.tokens[ref]
+            # Каждое слово запроса должно быть префиксом какого-то слова названия
+            if all(any(t.startswith(w) for t in tokens) for w in words):
+                matches.append(self.places[ref])
+
+        matches.sort(key=lambda p: (p["rating"], p["rating_count"]), reverse=True)
+        return matches[:limit]
+
+
+class PlaceNameIndex(BackgroundRefresh):
+    """In-memory индекс названий мест по городам для автодополнения.
+
+    Перестраивается из таблицы places раз в refresh_interval секунд в фоне:
+    запросы всё это время обслуживаются по предыдущей версии индекса.
+    """
+
+    name = "Place name index"
+
+    def __init__(self, session_factory: Callable, refresh_interval: float = 300.0):
+        super().__init__(refresh_interval)
+        self.session_factory = session_factory
+        self._cities: Dict[str, _CityIndex] = {}
+
+    async def refresh(self):
+        """Перестроить индекс из БД"""
+        async with self._lock:
+            started = time.perf_counter()
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(
+                        Place.id, Place.name, Place.category, Place.city,
+                        Place.address, Place.rating, Place.rating_count
+                    ).where(Place.is_active == True)
+                )
+                rows = result.all()
+
+            by_city: Dict[str, List[Dict]] = {}
+            for row in rows:
+                by_city.setdefault(row.city, []).append({
+                    "id": row.id,
+                    "name": row.name,
+                    "category": row.category,
+                    "address": row.address,
+                    "rating": row.rating or 0.0,
+                    "rating_count": row.rating_count or 0,
+                })
+
+            # Сортировка токенов — CPU-работа, не блокируем event loop
+            self._cities = await asyncio.to_thread(
+                lambda: {city: _CityIndex(places) for city, places in by_city.items()}
+            )
+            self._loaded_at = time.monotonic()
+            logger.info(
+                f"Place name index rebuilt: {len(rows)} places, {len(self._cities)} cities "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+
+    def search(self, city: str, query: str, limit: int = 10) -> List[Dict]:
+        index = self._cities.get(city)
+        if index is None:
+            return []
+        return index.search(query, limit)
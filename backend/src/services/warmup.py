@@ -0,0 +1,62 @@
+# backend/src/services/warmup.py
+"""
+Прогрев бэкенда после старта.
+
+Пока прогрев не закончен, /health отвечает 503 «starting», и балансировщик не
+шлёт воркеру трафик: пулы соединений уже открыты, а горячие кэши (города, топ
+мест, индекс автодополнения) загружены — первые запросы не платят за холодный
+старт.
+"""
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Состояние прогрева для /health"""
+
+    def __init__(self):
+        self.ready = False
+        self.error = None
+        self.steps: Dict[str, float] = {}
+
+
+readiness = Readiness()
+
+
+async def open_pool(engine: AsyncEngine, connections: int):
+    """Открыть connections соединений одновременно, чтобы они остались в пуле"""
+    async with AsyncExitStack() as stack:
+        conns = [await stack.enter_async_context(engine.connect()) for _ in range(connections)]
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+
+
+async def warm_up(engines: List[AsyncEngine], connections: int, caches: List, timeout: float = 60.0):
+    """Прогреть пулы и кэши; readiness.ready — по завершении (даже с ошибками)"""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_run(engines, connections, caches), timeout)
+    except Exception as e:
+        # Без прогрева сервис работает, просто первые запросы медленнее
+        readiness.error = str(e) or type(e).__name__
+        logger.error(f"❌ Ошибка прогрева: {readiness.error}")
+    readiness.ready = True
+    logger.info(f"🔥 Прогрев завершён за {time.perf_counter() - started:.2f}s: {readiness.steps}")
+
+
+async def _run(engines: List[AsyncEngine], connections: int, caches: List):
+    step = time.perf_counter()
+    await asyncio.gather(*(open_pool(engine, connections) for engine in engines))
+    readiness.steps["pool"] = round(time.perf_counter() - step, 3)
+
+    for cache in caches:
+        step = time.perf_counter()
+        await cache.refresh()
+        readiness.steps[type(cache).__name__] = round(time.perf_counter() - step, 3)
@@ -0,0 +1,162 @@
+# backend/src/unit_of_work.py
+"""
+Запись без лишних round trip'ов.
+
+Вместо add() + commit() + refresh() строка ответа возвращается тем же
+запросом, что и пишет: INSERT/UPDATE ... RETURNING. Проверки «уже есть»
+сложены в сам запрос — ON CONFLICT по уникальному ключу, а для reviews, где
+уникальный индекс по (user_id, place_id) невозможен из-за секционирования, —
+INSERT ... SELECT ... WHERE NOT EXISTS под advisory-блокировкой этой пары.
+Поиски перед записью объединены в один SELECT. Сколько запросов ушло в БД за
+HTTP-запрос, видно в заголовке X-DB-Query-Count.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import JSON, and_, cast, exists, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.geo import place_geohash
+from .models import Place, Review, User, UserRole
+from .responses import PLACE_BASE_COLUMNS, REVIEW_COLUMNS, stats_column
+
+
+class UnitOfWork:
+    """Транзакция записи поверх сессии primary.
+
+    async with uow: — commit при выходе, rollback при исключении (в том числе
+    HTTPException). Запросы — построители ниже, каждый отдаёт строку ответа.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.session.commit()
+        else:
+            await self.session.rollback()
+
+    async def one(self, statement) -> Row:
+        return (await self.session.execute(statement)).one()
+
+    async def one_or_none(self, statement) -> Optional[Row]:
+        return (await self.session.execute(statement)).one_or_none()
+
+
+# ========== Пользователи ==========
+
+def upsert_user(telegram_id: int, username: Optional[str], city: str):
+    """Регистрация или смена города одним запросом (ключ — telegram_id).
+
+    Строка переписывается, только если город другой; иначе возвращается
+    существующая. Пустой результат — пользователя создал параллельный запрос
+    уже после снимка этого запроса: повторный SELECT его увидит.
+    """
+    statement = pg_insert(User).values(
+        id=uuid4(),
+        telegram_id=telegram_id,
+        username=username,
+        first_name=username,  # В Telegram боте будет реальное имя
+        role=UserRole.USER,
+        preferences={"city": city},
+        is_active=True,
+    )
+    # preferences — json: склеиваем как jsonb, чтобы не затереть остальные ключи
+    merged = func.coalesce(cast(User.preferences, JSONB), literal({}, JSONB)).op("||")(
+        cast(statement.excluded.preferences, JSONB)
+    )
+    upserted = statement.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={"preferences": cast(merged, JSON), "updated_at": datetime.utcnow()},
+        where=User.preferences["city"].as_string().is_distinct_from(
+            statement.excluded.preferences["city"].as_string()
+        ),
+    ).returning(*User.__table__.columns).cte("upserted")
+    # Без изменений RETURNING пуст — тогда строка из таблицы
+    unchanged = select(*User.__table__.columns).where(
+        User.telegram_id == telegram_id,
+        ~exists(select(upserted.c.id)),
+    )
+    return select(*upserted.c).union_all(unchanged)
+
+
+# ========== Места ==========
+
+def insert_place(values: Dict):
+    """Новое место; с тем же (source, external_id) — уже существующее"""
+    statement = pg_insert(Place).values(
+        id=uuid4(),
+        geohash=place_geohash(values.get("latitude"), values.get("longitude")),
+        **values,
+    )
+    # DO UPDATE без изменений, чтобы RETURNING вернул и существующую строку;
+    # агрегаты отзывов дочитываются в том же запросе через CTE
+    inserted = statement.on_conflict_do_update(
+        constraint="uq_places_source_external_id",
+        set_={"external_id": statement.excluded.external_id},
+    ).returning(*PLACE_BASE_COLUMNS).cte("inserted")
+    return select(*inserted.c, stats_column(inserted.c.id))
+
+
+# ========== Отзывы ==========
+
+def review_precheck(telegram_id: int, place_id: UUID):
+    """Автор, место и наличие отзыва — одним SELECT вместо трёх.
+
+    Строки нет — нет пользователя; place_name NULL — нет активного места.
+    """
+    reviewed = exists().where(Review.user_id == User.id, Review.place_id == place_id)
+    return (
+        select(User.id.label("user_id"), Place.name.label("place_name"), reviewed.label("reviewed"))
+        .select_from(User)
+        .outerjoin(Place, and_(Place.id == place_id, Place.is_active == True))
+        .where(User.telegram_id == telegram_id)
+    )
+
+
+def review_lock(user_id: UUID, place_id: UUID):
+    """Advisory-блокировка пары (автор, место) до конца транзакции.
+
+    Под READ COMMITTED NOT EXISTS в insert_review смотрит в снимок своего
+    запроса, и два параллельных INSERT не видят друг друга. С блокировкой
+    второй ждёт коммита первого, а его INSERT (уже с новым снимком) видит отзыв.
+    """
+    return select(func.pg_advisory_xact_lock(func.hashtext(f"{user_id}{place_id}")))
+
+
+def insert_review(values: Dict):
+    """INSERT ... SELECT ... WHERE NOT EXISTS; строки нет — отзыв уже оставлен"""
+    now = datetime.utcnow()
+    values = {"id": uuid4(), "created_at": now, "updated_at": now, **values}
+    columns = Review.__table__.c
+    row = select(*(literal(value, columns[key].type).label(key) for key, value in values.items())).where(
+        ~exists().where(Review.user_id == values["user_id"], Review.place_id == values["place_id"])
+    )
+    return insert(Review).from_select(list(values), row, include_defaults=False).returning(*REVIEW_COLUMNS)
+
+
+def set_review_status(review_id: UUID, status: str, moderator_id: UUID, notes: Optional[str] = None):
+    """Сменить статус отзыва, если он другой.
+
+    Возвращает отзыв, прежний статус (old_status) и Telegram ID автора для
+    события; строки нет — отзыва нет или статус уже такой.
+    """
+    old = select(Review.id, Review.moderation_status.label("old_status")).where(Review.id == review_id).subquery()
+    author = select(User.telegram_id).where(User.id == Review.user_id).scalar_subquery()
+    values = {"moderation_status": status, "moderated_by": moderator_id}
+    if notes:
+        values["moderation_notes"] = notes
+    return (
+        update(Review)
+        .where(Review.id == old.c.id, old.c.old_status != status)
+        .values(**values)
+        .returning(*REVIEW_COLUMNS, old.c.old_status, author.label("author_telegram_id"))
+        .execution_options(synchronize_session=False)
+    )
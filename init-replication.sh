@@ -0,0 +1,4 @@
+#!/bin/bash
+# init-replication.sh - разрешить реплике подключаться для потоковой репликации
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,63 @@
+# parser/__main__.py
+"""
+Командная строка парсера.
+
+    python -m parser run                        # обход источников (по умолчанию)
+    python -m parser export places.parquet      # снимок каталога
+    python -m parser import places.parquet      # загрузка снимка
+    python -m parser dedup [--dry-run]          # поиск дубликатов
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import config
+
+
+async def _with_session(action, *args, **kwargs):
+    engine = create_async_engine(config.DATABASE_URL, echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            return await action(session, *args, **kwargs)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m parser", description="Парсер мест")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("run", help="обойти источники и записать места")
+
+    export = commands.add_parser("export", help="выгрузить places в снимок")
+    export.add_argument("path", help="файл .parquet, .ndjson.zst или .ndjson.gz")
+
+    load = commands.add_parser("import", help="загрузить снимок через пакетный upsert")
+    load.add_argument("path", help="файл .parquet, .ndjson.zst или .ndjson.gz")
+    load.add_argument("--batch-size", type=int, default=config.INGEST_BATCH_SIZE)
+
+    dedup = commands.add_parser("dedup", help="найти и слить дубликаты мест")
+    dedup.add_argument("--dry-run", action="store_true", help="только показать найденные пары")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=config.LOG_LEVEL)
+
+    if args.command == "export":
+        from .snapshot import export_places
+        asyncio.run(_with_session(export_places, args.path))
+    elif args.command == "import":
+        from .snapshot import import_places
+        asyncio.run(_with_session(import_places, args.path, batch_size=args.batch_size))
+    elif args.command == "dedup":
+        from .dedup import run_batch
+        asyncio.run(run_batch(dry_run=args.dry_run))
+    else:
+        from .parser import main as run
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
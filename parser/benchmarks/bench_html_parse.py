@@ -0,0 +1,108 @@
+# parser/benchmarks/bench_html_parse.py
+"""
+Бенчмарк разбора HTML: в основном процессе против HtmlParsePool.
+
+Корпус — каталог сохранённых страниц рубрик (*.html); без --corpus
+генерируются синтетические страницы с разметкой JSON-LD.
+
+Запуск из корня репозитория:
+    python -m parser.benchmarks.bench_html_parse [--corpus DIR] [--workers 1 2 4] [--chunk-size 8]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from parser.html_parse import HtmlParsePool, parse_listing
+
+
+def synthetic_page(index: int, events: int = 20) -> bytes:
+    rnd = random.Random(index)
+    items = []
+    for i in range(events):
+        items.append({
+            "@type": "ListItem",
+            "item": {
+                "@context": "https://schema.org",
+                "@type": "MusicEvent",
+                "name": f"Концерт №{index}-{i}",
+                "url": f"/moscow/concert/event-{index}-{i}",
+                "description": "Описание события. " * rnd.randint(5, 30),
+                "location": {
+                    "@type": "Place",
+                    "name": f"Клуб {rnd.randint(1, 500)}",
+                    "address": {"streetAddress": f"ул. Тверская, {rnd.randint(1, 40)}"},
+                    "geo": {"latitude": 55.75 + rnd.random() / 10, "longitude": 37.6 + rnd.random() / 10},
+                },
+            },
+        })
+    filler = "".join(
+        f'<div class="card"><a href="/e/{i}"><h2>Событие {i}</h2></a><p>{"текст " * 40}</p></div>'
+        for i in range(events * 5)
+    )
+    ld = json.dumps({"@type": "ItemList", "itemListElement": items}, ensure_ascii=False)
+    html = (
+        f'<html><head><script type="application/ld+json">{ld}</script></head>'
+        f"<body>{filler}</body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def load_corpus(corpus: str, pages: int) -> List[bytes]:
+    if corpus:
+        files = sorted(Path(corpus).glob("*.html"))
+        if not files:
+            raise SystemExit(f"No *.html files in {corpus}")
+        return [path.read_bytes() for path in files]
+    return [synthetic_page(i) for i in range(pages)]
+
+
+async def run_pool(bodies: List[bytes], workers: int, chunk_size: int, concurrency: int) -> int:
+    pool = HtmlParsePool(workers=workers, chunk_size=chunk_size)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(body: bytes) -> int:
+        async with semaphore:
+            return len(await pool.parse("Moscow", "concert", body))
+
+    try:
+        counts = await asyncio.gather(*(one(body) for body in bodies))
+    finally:
+        pool.close()
+    return sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default="", help="каталог с сохранёнными страницами *.html")
+    parser.add_argument("--pages", type=int, default=200, help="синтетических страниц без --corpus")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=64, help="страниц в обработке одновременно")
+    args = parser.parse_args()
+
+    bodies = load_corpus(args.corpus, args.pages)
+    size_mb = sum(map(len, bodies)) / 1024 / 1024
+    print(f"pages: {len(bodies)} ({size_mb:.1f} MB), cpu: {os.cpu_count()}\n")
+
+    started = time.perf_counter()
+    places = sum(len(parse_listing("Moscow", "concert", body)) for body in bodies)
+    baseline = time.perf_counter() - started
+    print(f"{'in-process':<24} {baseline:7.2f}s  {len(bodies) / baseline:7.1f} pages/s  places={places}")
+
+    for workers in args.workers:
+        started = time.perf_counter()
+        places = asyncio.run(run_pool(bodies, workers, args.chunk_size, args.concurrency))
+        elapsed = time.perf_counter() - started
+        print(
+            f"{f'pool workers={workers}':<24} {elapsed:7.2f}s  {len(bodies) / elapsed:7.1f} pages/s  "
+            f"places={places}  x{baseline / elapsed:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
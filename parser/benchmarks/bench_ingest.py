@@ -0,0 +1,216 @@
+# parser/benchmarks/bench_ingest.py
+"""
+Сквозной бенчмарк загрузки: записанный корпус страниц API прогоняется через
+HTTPParser (обход → конвейер → Postgres) при разных размерах пачки записи и
+параллельности обхода.
+
+Корпус: CORPUS/<город>/<категория>/<страница>.json + CORPUS/meta.json.
+Страницы раздаёт локальный HTTP-сервер, поэтому сеть не влияет на результат.
+
+    python -m parser.benchmarks.bench_ingest record CORPUS          # снять живые страницы по config
+    python -m parser.benchmarks.bench_ingest generate CORPUS --pages 300
+    python -m parser.benchmarks.bench_ingest replay CORPUS --batch-sizes 100 500 2000 --concurrency 1 4 16
+
+replay пишет в DATABASE_URL — используйте отдельную базу. Перед каждым
+прогоном места корпуса удаляются (по external_id), чтобы все прогоны
+вставляли одни и те же строки.
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import aiohttp
+from aiohttp import web
+from sqlalchemy import delete
+
+from parser.config import config
+from parser.crawler import CrawlTask
+from parser.models import Place
+from parser.parser import HEADERS, HTTPParser, city_slug
+
+
+def _page_path(corpus: Path, city: str, category: str, page: int) -> Path:
+    return corpus / city_slug(city) / category / f"{page}.json"
+
+
+def _write_meta(corpus: Path, cities: List[str], categories: List[str], pages: int, page_size: int):
+    meta = {"cities": cities, "categories": categories, "pages": pages, "page_size": page_size}
+    (corpus / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+async def record(corpus: Path):
+    """Сохранить страницы API по текущему config (с задержкой REQUEST_DELAY)"""
+    cities = config.PARSE_CITIES or [config.PARSE_CITY]
+    parser = HTTPParser()
+    saved = 0
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        for city in cities:
+            for category in config.PARSE_CATEGORIES:
+                for page in range(config.MAX_PAGES_PER_CATEGORY):
+                    task = CrawlTask(city, category, page)
+                    async with session.get(parser.page_url(task)) as response:
+                        if response.status != 200:
+                            break
+                        body = await response.read()
+                    path = _page_path(corpus, city, category, page)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(body)
+                    saved += 1
+                    await asyncio.sleep(config.REQUEST_DELAY)
+                    if len(parser.parse_page(task, body)) < config.SOURCE_PAGE_SIZE:
+                        break
+    _write_meta(corpus, cities, config.PARSE_CATEGORIES, config.MAX_PAGES_PER_CATEGORY, config.SOURCE_PAGE_SIZE)
+    print(f"recorded {saved} pages into {corpus}")
+
+
+def generate(corpus: Path, pages: int, page_size: int, seed: int = 7):
+    """Синтетический корпус в формате API рубрик"""
+    rnd = random.Random(seed)
+    cities = ["Moscow", "Saint Petersburg"]
+    categories = ["concert", "theatre", "art", "cinema"]
+    per_section = max(1, pages // (len(cities) * len(categories)))
+    for city in cities:
+        for category in categories:
+            for page in range(per_section):
+                items = []
+                for i in range(page_size):
+                    event_id = f"bench-{city_slug(city)}-{category}-{page}-{i}"
+                    items.append({
+                        "event": {
+                            "id": event_id,
+                            "title": f"Событие {category} {page}-{i}",
+                            "url": f"/{city_slug(city)}/{category}/{event_id}",
+                            "argument": "Описание " * rnd.randint(3, 20),
+                        },
+                        "scheduleInfo": {"onlyPlace": {
+                            "title": f"Площадка {rnd.randint(1, 300)}",
+                            "address": f"ул. Тестовая, {rnd.randint(1, 100)}",
+                            "coordinates": {"latitude": 55.7 + rnd.random() / 5, "longitude": 37.5 + rnd.random() / 5},
+                        }},
+                    })
+                path = _page_path(corpus, city, category, page)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps({"data": items}, ensure_ascii=False), encoding="utf-8")
+    _write_meta(corpus, cities, categories, per_section, page_size)
+    print(f"generated {per_section * len(cities) * len(categories)} pages into {corpus}")
+
+
+async def start_server(corpus: Path) -> web.AppRunner:
+    """Отдавать страницы корпуса по тем же URL, что строит HTTPParser.page_url"""
+    meta = json.loads((corpus / "meta.json").read_text(encoding="utf-8"))
+
+    async def handler(request: web.Request) -> web.Response:
+        page = int(request.query.get("offset", 0)) // meta["page_size"]
+        path = corpus / request.query.get("city", "") / request.match_info["category"] / f"{page}.json"
+        if not path.exists():
+            return web.Response(status=404)
+        return web.Response(body=path.read_bytes(), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/{category}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def corpus_ids(corpus: Path, meta: Dict) -> List[str]:
+    parser = HTTPParser()
+    ids = []
+    for city in meta["cities"]:
+        for category in meta["categories"]:
+            for path in sorted((corpus / city_slug(city) / category).glob("*.json")):
+                task = CrawlTask(city, category, int(path.stem))
+                ids.extend(place["external_id"] for place in parser.parse_page(task, path.read_bytes()))
+    return ids
+
+
+async def replay(corpus: Path, batch_sizes: List[int], concurrencies: List[int], dedup: bool):
+    meta = json.loads((corpus / "meta.json").read_text(encoding="utf-8"))
+    ids = corpus_ids(corpus, meta)
+    runner = await start_server(corpus)
+    port = runner.addresses[0][1]
+    workdir = tempfile.mkdtemp(prefix="bench_ingest_")
+
+    config.CRAWL_ENABLED = True
+    config.SOURCE_FORMAT = "api"
+    config.SOURCE_API_URL = f"http://127.0.0.1:{port}"
+    config.PARSE_CITIES = meta["cities"]
+    config.PARSE_CATEGORIES = meta["categories"]
+    config.MAX_PAGES_PER_CATEGORY = meta["pages"]
+    config.SOURCE_PAGE_SIZE = meta["page_size"]
+    config.HOST_RATE_LIMIT = 1_000_000.0
+    config.CRAWL_CHECKPOINT_PATH = ""
+    config.FETCH_CACHE_PATH = ""
+    config.GEOCODER = ""
+    config.DEDUP_ON_INGEST = dedup
+    config.PARSER_METRICS_PATH = str(Path(workdir) / "runs.jsonl")
+    config.PARSER_METRICS_PROM_PATH = ""
+
+    print(f"corpus: {len(ids)} places, telemetry: {config.PARSER_METRICS_PATH}\n")
+    print(f"{'batch':>6} {'conc':>5} {'time s':>8} {'rows':>7} {'rows/s e2e':>11} {'rows/s write':>13} {'pages/s':>8}")
+    try:
+        for batch_size in batch_sizes:
+            for concurrency in concurrencies:
+                await reset(ids)
+                config.INGEST_BATCH_SIZE = batch_size
+                config.CRAWL_CONCURRENCY = concurrency
+                config.HOST_RATE_BURST = concurrency
+                telemetry = await HTTPParser().run()
+                rows = sum(telemetry.rows.values())
+                duration = telemetry.duration_s or 1e-9
+                print(
+                    f"{batch_size:>6} {concurrency:>5} {duration:>8.2f} {rows:>7} {rows / duration:>11.0f} "
+                    f"{telemetry.rows_per_second:>13.0f} {telemetry.crawl.get('fetched', 0) / duration:>8.1f}"
+                )
+    finally:
+        await runner.cleanup()
+
+
+async def reset(ids: List[str]):
+    parser = HTTPParser()
+    await parser.initialize()
+    try:
+        async with parser.async_session() as session:
+            for start in range(0, len(ids), 5000):
+                await session.execute(delete(Place).where(Place.external_id.in_(ids[start:start + 5000])))
+            await session.commit()
+    finally:
+        await parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк загрузки парсера")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record")
+    rec.add_argument("corpus")
+
+    gen = commands.add_parser("generate")
+    gen.add_argument("corpus")
+    gen.add_argument("--pages", type=int, default=200)
+    gen.add_argument("--page-size", type=int, default=20)
+
+    rep = commands.add_parser("replay")
+    rep.add_argument("corpus")
+    rep.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    rep.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    rep.add_argument("--dedup", action="store_true", help="с поиском дубликатов при загрузке")
+
+    args = parser.parse_args()
+    corpus = Path(args.corpus)
+    if args.command == "record":
+        asyncio.run(record(corpus))
+    elif args.command == "generate":
+        corpus.mkdir(parents=True, exist_ok=True)
+        generate(corpus, args.pages, args.page_size)
+    else:
+        asyncio.run(replay(corpus, args.batch_sizes, args.concurrency, args.dedup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# parser/benchmarks/bench_normalize.py
+"""
+Бенчмарк нормализации: прежние функции utils против parser/normalize.py.
+
+Запуск из корня репозитория:
+    python -m parser.benchmarks.bench_normalize [--records 200000] [--processes 4]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Optional
+
+from parser.normalize import (
+    clean_place_name, extract_age_rating, normalize_category, normalize_records, normalize_text,
+)
+
+
+# --- Прежняя реализация (до выноса в normalize.py) ---
+
+def legacy_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n+', ' ', text)
+    return text.strip()
+
+
+def legacy_extract_age_rating(description: str) -> tuple[str, Optional[int]]:
+    age_pattern = r'(\d{1,2})\+'
+    match = re.search(age_pattern, description)
+    if match:
+        age = int(match.group(1))
+        clean_desc = re.sub(age_pattern, '', description).strip()
+        return clean_desc, age
+    return description, None
+
+
+def legacy_clean_place_name(name: str) -> str:
+    if not name:
+        return ""
+    name = name.replace('"', '').replace("'", "")
+    name = re.sub(r'\.{2,}', '.', name)
+    return name.strip()
+
+
+def legacy_normalize_category(category: str) -> str:
+    category_map = {
+        "concert": "concert", "концерт": "concert", "theatre": "theater", "театр": "theater",
+        "спектакль": "theater", "art": "art", "искусство": "art", "выставка": "art",
+        "cinema": "cinema", "кино": "cinema", "фильм": "cinema", "excursions": "excursion",
+        "экскурсия": "excursion", "тур": "excursion", "quest": "quest", "квест": "quest",
+        "приключение": "quest",
+    }
+    return category_map.get(category.lower(), "other")
+
+
+def legacy_normalize_record(record):
+    name = legacy_clean_place_name(legacy_normalize_text(record.get("name") or ""))
+    if not name:
+        return None
+    record["name"] = name
+    if record.get("description"):
+        record["description"] = legacy_normalize_text(record["description"]) or None
+    record["category"] = legacy_normalize_category(record.get("category") or "")
+    return record
+
+
+# --- Данные ---
+
+WORDS = ["Концерт", "группы", "«Кино»", "в", "клубе", "16+", "Большой", "театр", "выставка", "...", "квест"]
+CATEGORIES = ["concert", "театр", "Выставка", "cinema", "квест", "unknown"]
+
+
+def make_records(n: int, seed: int = 42):
+    rnd = random.Random(seed)
+    records = []
+    for i in range(n):
+        name = " ".join(rnd.choices(WORDS, k=4)) + '  "' + str(i) + '"..'
+        description = "\n".join(" ".join(rnd.choices(WORDS, k=12)) for _ in range(3))
+        records.append({"name": name, "description": description, "category": rnd.choice(CATEGORIES)})
+    return records
+
+
+def timed(label: str, fn, n: int) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<42} {elapsed:8.3f}s  {n / elapsed:>12,.0f} rec/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    n = len(records)
+    names = [r["name"] for r in records]
+    descriptions = [r["description"] for r in records]
+    categories = [r["category"] for r in records]
+
+    # Результаты обеих реализаций должны совпадать (кроме категорий-значений PlaceCategory)
+    for name, description in zip(names[:1000], descriptions[:1000]):
+        assert normalize_text(name) == legacy_normalize_text(name)
+        assert clean_place_name(name) == legacy_clean_place_name(name)
+        assert extract_age_rating(description) == legacy_extract_age_rating(description)
+
+    print(f"records: {n}\n")
+    timed("legacy normalize_text", lambda: [legacy_normalize_text(d) for d in descriptions], n)
+    timed("normalize_text", lambda: [normalize_text(d) for d in descriptions], n)
+    timed("legacy extract_age_rating", lambda: [legacy_extract_age_rating(d) for d in descriptions], n)
+    timed("extract_age_rating", lambda: [extract_age_rating(d) for d in descriptions], n)
+    timed("legacy clean_place_name", lambda: [legacy_clean_place_name(s) for s in names], n)
+    timed("clean_place_name", lambda: [clean_place_name(s) for s in names], n)
+    timed("legacy normalize_category", lambda: [legacy_normalize_category(c) for c in categories], n)
+    timed("normalize_category", lambda: [normalize_category(c) for c in categories], n)
+    print()
+    timed("legacy per-record loop", lambda: [legacy_normalize_record(dict(r)) for r in records], n)
+    timed("normalize_records", lambda: normalize_records([dict(r) for r in records]), n)
+    if args.processes > 1:
+        timed(
+            f"normalize_records (processes={args.processes})",
+            lambda: normalize_records([dict(r) for r in records], processes=args.processes),
+            n,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# parser/crawler.py
+"""
+Планировщик обхода источника.
+
+Пары (город, категория, страница) загружаются параллельно через общую
+aiohttp-сессию: число одновременных запросов ограничено пулом воркеров, частота
+запросов к каждому хосту — token bucket'ом. Загруженные страницы отмечаются
+в файле прогресса, поэтому прерванный обход продолжается с того же места.
+С FetchCache запросы условные: неизменившиеся страницы не передаются дальше.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .fetch_cache import CachedPage, FetchCache, body_hash
+from .utils import safe_request
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CrawlTask:
+    """Одна страница выдачи"""
+    city: str
+    category: str
+    page: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.city}:{self.category}:{self.page}"
+
+
+@dataclass
+class CrawlStats:
+    """Итог обхода"""
+    fetched: int = 0
+    failed: int = 0
+    resumed: int = 0
+    exhausted: int = 0
+    bytes: int = 0
+    requests: int = 0
+    retries: int = 0
+    request_seconds: float = 0.0
+    max_request_seconds: float = 0.0
+    not_modified: int = 0  # Ответ 304
+    unchanged: int = 0  # Тело совпало с прошлым обходом
+    bytes_saved: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+@dataclass
+class PageResponse:
+    body: Optional[bytes]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class HostRateLimiter:
+    """Token bucket на каждый хост"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}  # host -> [tokens, last_refill]
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str):
+        """Дождаться токена для хоста"""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            # Под локом запросы к хосту выстраиваются в очередь, а не будят друг друга
+            bucket = self._buckets.setdefault(host, [float(self.burst), time.monotonic()])
+            while True:
+                now = time.monotonic()
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                await asyncio.sleep((1 - bucket[0]) / self.rate)
+
+
+class CrawlCheckpoint:
+    """Файл прогресса: ключи загруженных страниц и исчерпанных разделов"""
+
+    def __init__(self, path: Optional[str], save_every: int = 10):
+        self.path = Path(path) if path else None
+        self.save_every = save_every
+        self.done: Set[str] = set()
+        self.exhausted: Set[str] = set()
+        self._unsaved = 0
+
+    def load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.done = set(data.get("done", []))
+            self.exhausted = set(data.get("exhausted", []))
+            logger.info(f"♻️ Продолжаем обход: уже загружено {len(self.done)} страниц")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Checkpoint {self.path} is unreadable, starting over: {e}")
+
+    def mark_done(self, task: CrawlTask):
+        self.done.add(task.key)
+        self._tick()
+
+    def mark_exhausted(self, task: CrawlTask):
+        self.exhausted.add(f"{task.city}:{task.category}")
+        self._tick()
+
+    def is_exhausted(self, task: CrawlTask) -> bool:
+        return f"{task.city}:{task.category}" in self.exhausted
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"done": sorted(self.done), "exhausted": sorted(self.exhausted)}),
+            encoding="utf-8"
+        )
+        os.replace(tmp, self.path)  # Атомарно: файл не останется полузаписанным
+        self._unsaved = 0
+
+    def clear(self):
+        """Обход завершён полностью — следующий начнётся заново"""
+        self.done.clear()
+        self.exhausted.clear()
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+    def _tick(self):
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+
+# Обработчик страницы: False — дальше страниц в разделе нет
+PageHandler = Callable[[CrawlTask, bytes], Awaitable[bool]]
+
+
+class CrawlScheduler:
+    """Параллельный обход страниц с ограничением частоты по хостам"""
+
+    def __init__(
+        self,
+        url_for: Callable[[CrawlTask], str],
+        concurrency: int = 4,
+        host_rate: float = 0.5,
+        host_burst: int = 2,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+        timeout: float = 30.0,
+        checkpoint_path: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        fetch_cache: Optional[FetchCache] = None
+    ):
+        self.url_for = url_for
+        self.concurrency = concurrency
+        self.limiter = HostRateLimiter(host_rate, host_burst)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.checkpoint = CrawlCheckpoint(checkpoint_path)
+        self.headers = headers or {}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = CrawlStats()
+        self.auto_ack = True
+        self.fetch_cache = fetch_cache
+        # Валидаторы страниц, ещё не подтверждённых через ack()
+        self._pending: Dict[str, CachedPage] = {}
+
+    @staticmethod
+    def build_tasks(cities: Iterable[str], categories: Iterable[str], max_pages: int) -> List[CrawlTask]:
+        """Страницы в порядке номера: сначала первые страницы всех разделов"""
+        sections = [(city, category) for city in cities for category in categories]
+        return [CrawlTask(city, category, page) for page in range(max_pages) for city, category in sections]
+
+    async def fetch(self, url: str, cached: Optional[CachedPage] = None) -> Optional[PageResponse]:
+        """Загрузить страницу. None — страницы нет (404)"""
+        await self.limiter.acquire(urlsplit(url).netloc)
+        headers = FetchCache.conditional_headers(cached)
+        self.stats.requests += 1
+        started = time.monotonic()
+        try:
+            async with self.session.get(url, headers=headers, timeout=self.timeout) as response:
+                if response.status == 404:
+                    return None
+                if response.status == 304 and cached is not None:
+                    return PageResponse(body=None, not_modified=True)
+                # 429 и 5xx уходят на повтор в safe_request, прочие 4xx — сразу в ошибку
+                response.raise_for_status()
+                return PageResponse(
+                    body=await response.read(),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+        finally:
+            elapsed = time.monotonic() - started
+            self.stats.request_seconds += elapsed
+            self.stats.max_request_seconds = max(self.stats.max_request_seconds, elapsed)
+
+    async def run(self, tasks: List[CrawlTask], handle_page: PageHandler, auto_ack: bool = True) -> CrawlStats:
+        """Обойти страницы, передавая каждую в handle_page.
+
+        auto_ack=False — страница попадает в чекпоинт не после handle_page,
+        а когда вызывающий подтвердит её через ack() (например, после записи
+        в БД); завершить обход тогда нужно вызовом finish().
+        """
+        self.checkpoint.load()
+        self.stats = CrawlStats()
+        self.auto_ack = auto_ack
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for task in tasks:
+            if task.key in self.checkpoint.done:
+                self.stats.resumed += 1
+            else:
+                queue.put_nowait(task)
+
+        logger.info(
+            f"🕷 Обход: {queue.qsize()} страниц, параллельно {self.concurrency}, "
+            f"пропущено по чекпоинту {self.stats.resumed}"
+        )
+
+        async with aiohttp.ClientSession(headers=self.headers) as session:
+            self.session = session
+            workers = [
+                asyncio.create_task(self._worker(queue, handle_page))
+                for _ in range(self.concurrency)
+            ]
+            try:
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                self.session = None
+                self.checkpoint.save()
+
+        logger.info(
+            f"🕷 Обход завершён за {self.stats.elapsed:.1f}s: загружено {self.stats.fetched}, "
+            f"ошибок {self.stats.failed}, {self.stats.bytes / 1024:.0f} KB"
+        )
+        if self.fetch_cache:
+            logger.info(
+                f"♻️ Без изменений: {self.stats.not_modified} по 304, {self.stats.unchanged} по хэшу; "
+                f"не скачано {self.stats.bytes_saved / 1024:.0f} KB"
+            )
+        if auto_ack:
+            self.finish()
+        return self.stats
+
+    def ack(self, task: CrawlTask):
+        """Страница обработана полностью"""
+        self.checkpoint.mark_done(task)
+        page = self._pending.pop(task.key, None)
+        if page is not None and not page.has_more:
+            # Раздел закрываем тоже только после записи: если последняя
+            # страница не записалась, следующий обход загрузит её снова
+            self.checkpoint.mark_exhausted(task)
+        if page is not None and self.fetch_cache:
+            # Валидаторы сохраняем только после записи: иначе сбой записи
+            # спрятал бы страницу от следующего обхода
+            self.fetch_cache.put(page)
+
+    def finish(self):
+        """Сохранить прогресс; если ошибок не было — следующий обход начнётся заново"""
+        if self.stats.failed:
+            self.checkpoint.save()
+        else:
+            self.checkpoint.clear()
+
+    async def _worker(self, queue: asyncio.Queue, handle_page: PageHandler):
+        while True:
+            task = await queue.get()
+            try:
+                await self._process(task, handle_page)
+            finally:
+                queue.task_done()
+
+    async def _process(self, task: CrawlTask, handle_page: PageHandler):
+        if self.checkpoint.is_exhausted(task):
+            self.stats.exhausted += 1
+            return
+
+        url = self.url_for(task)
+        cached = self.fetch_cache.get(url) if self.fetch_cache else None
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.stats.retries += 1
+            return self.fetch(url, cached)
+
+        try:
+            response = await safe_request(
+                attempt,
+                max_retries=self.max_retries,
+                delay=self.retry_delay
+            )
+        except Exception as e:
+            # Страница не отмечена в чекпоинте — загрузится при следующем запуске
+            self.stats.failed += 1
+            logger.error(f"Crawl {task.key} failed: {e}")
+            return
+
+        if response is None:
+            self.checkpoint.mark_exhausted(task)
+            self.checkpoint.mark_done(task)
+            return
+
+        if not response.not_modified:
+            self.stats.fetched += 1
+            self.stats.bytes += len(response.body)
+            digest = body_hash(response.body)
+
+        if response.not_modified or (cached is not None and cached.body_hash == digest):
+            # Страница та же, что в прошлый раз: разбирать и писать нечего
+            if response.not_modified:
+                self.stats.not_modified += 1
+                self.stats.bytes_saved += cached.size
+            else:
+                self.stats.unchanged += 1
+            if not cached.has_more:
+                self.checkpoint.mark_exhausted(task)
+            self.checkpoint.mark_done(task)
+            return
+
+        try:
+            has_more = await handle_page(task, response.body)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Page {task.key} handling failed: {e}")
+            return
+
+        self._pending[task.key] = CachedPage(
+            url=url,
+            etag=response.etag,
+            last_modified=response.last_modified,
+            body_hash=digest,
+            size=len(response.body),
+            has_more=has_more is not False,
+        )
+        if self.auto_ack:
+            self.ack(task)
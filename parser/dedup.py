@@ -0,0 +1,441 @@
+# parser/dedup.py
+"""
+Поиск дубликатов мест из разных источников (entity resolution).
+
+Кандидаты сравниваются только внутри блока: ячейка geohash и соседние с ней
+(для мест без координат — город + нормализованный адрес). Поэтому работа
+растёт почти линейно, а не как O(n²). Пары оцениваются по Jaro-Winkler и
+триграммам нормализованных названий и адресов; найденные дубликаты сливаются
+в основное место с записью в place_merges.
+
+Пакетный запуск: python -m parser.dedup [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, exists, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import config
+from .models import Place, PlaceMerge, Review
+from shared.geo import geohash_bounds, geohash_encode, geohash_neighbors, haversine_m
+
+logger = logging.getLogger(__name__)
+
+_QUOTES_RE = re.compile(r"[«»\"'“”„`]")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACES_RE = re.compile(r"\s+")
+
+# Родовые слова не отличают одно заведение от другого
+NAME_STOPWORDS = {
+    "кафе", "ресторан", "бар", "кофейня", "театр", "музей", "клуб", "галерея",
+    "кинотеатр", "парк", "ооо", "ип", "the", "cafe", "restaurant", "bar",
+}
+
+ADDRESS_ABBREVIATIONS = {
+    "улица": "ул", "проспект": "пр", "просп": "пр", "переулок": "пер",
+    "площадь": "пл", "бульвар": "б", "бул": "б", "шоссе": "ш", "набережная": "наб",
+    "дом": "", "д": "", "город": "", "г": "", "москва": "", "строение": "с", "стр": "с",
+    "корпус": "к", "корп": "к",
+}
+
+# Чем ниже, тем предпочтительнее источник для основной записи
+SOURCE_PRIORITY = {"yandex_afisha": 0, "google_maps": 0, "api": 1, "telegram": 2, "user": 3}
+
+# Ячейка 6 знаков — 0,61 км по широте и 1,22 км × cos(широты) по долготе (в
+# Москве ~0,68 км). До широты 60° обе стороны не меньше ~600 м, поэтому ячейка
+# с соседями покрывает max_distance_m до 600 м. Точность 7 (~150 × 86 м в
+# Москве) при 150 м уже не покрывала
+GEOHASH_PRECISION = 6
+
+
+def normalize_name(name: str) -> str:
+    text = _QUOTES_RE.sub(" ", (name or "").lower().replace("ё", "е"))
+    words = _PUNCT_RE.sub(" ", text).split()
+    kept = [word for word in words if word not in NAME_STOPWORDS]
+    return " ".join(kept or words)
+
+
+def normalize_address(address: Optional[str]) -> str:
+    text = _PUNCT_RE.sub(" ", (address or "").lower().replace("ё", "е"))
+    words = (ADDRESS_ABBREVIATIONS.get(word, word) for word in text.split())
+    return _SPACES_RE.sub(" ", " ".join(word for word in words if word)).strip()
+
+
+def address_key(address: str) -> str:
+    """Самое длинное слово нормализованного адреса (обычно название улицы):
+    им сужается выборка мест без координат"""
+    words = [word for word in address.split() if not word.isdigit()]
+    return max(words, key=len) if words else ""
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """Сходство Jaro-Winkler (0..1)"""
+    if a == b:
+        return 1.0 if a else 0.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    matched_a = [False] * len_a
+    matched_b = [False] * len_b
+    matches = 0
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len_b, i + window + 1)):
+            if not matched_b[j] and b[j] == char:
+                matched_a[i] = matched_b[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+
+    transpositions = 0
+    j = 0
+    for i in range(len_a):
+        if matched_a[i]:
+            while not matched_b[j]:
+                j += 1
+            if a[i] != b[j]:
+                transpositions += 1
+            j += 1
+
+    jaro = (matches / len_a + matches / len_b + (matches - transpositions / 2) / matches) / 3
+    prefix = 0
+    for char_a, char_b in zip(a[:4], b[:4]):
+        if char_a != char_b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Коэффициент Жаккара по триграммам (как pg_trgm similarity)"""
+    if not a or not b:
+        return 0.0
+    ta, tb = trigrams(a), trigrams(b)
+    return len(ta & tb) / len(ta | tb)
+
+
+@dataclass
+class PlaceRecord:
+    """Поля места, нужные для сравнения"""
+    id: object
+    name: str
+    address: str
+    city: str
+    source: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    rating_count: int = 0
+    created_at: Optional[datetime] = None
+    geohash: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> "PlaceRecord":
+        has_coords = row.latitude is not None and row.longitude is not None
+        return cls(
+            id=row.id,
+            name=normalize_name(row.name),
+            address=normalize_address(row.address),
+            city=row.city,
+            source=str(getattr(row.source, "value", row.source)),
+            latitude=row.latitude,
+            longitude=row.longitude,
+            rating_count=row.rating_count or 0,
+            created_at=row.created_at,
+            geohash=geohash_encode(row.latitude, row.longitude, GEOHASH_PRECISION) if has_coords else None,
+        )
+
+
+@dataclass
+class Match:
+    canonical: PlaceRecord
+    duplicate: PlaceRecord
+    score: float
+    details: Dict = field(default_factory=dict)
+
+
+class EntityResolver:
+    """Оценка пар внутри блоков и кластеризация дубликатов"""
+
+    def __init__(
+        self,
+        threshold: float = 0.88,
+        max_distance_m: float = 150.0,
+        cross_source_only: bool = True
+    ):
+        self.threshold = threshold
+        self.max_distance_m = max_distance_m
+        self.cross_source_only = cross_source_only
+
+    def score(self, a: PlaceRecord, b: PlaceRecord) -> Optional[Dict]:
+        """Оценка пары или None, если это точно разные места"""
+        distance = None
+        if a.geohash and b.geohash:
+            distance = haversine_m(a.latitude, a.longitude, b.latitude, b.longitude)
+            if distance > self.max_distance_m:
+                return None
+
+        name = max(jaro_winkler(a.name, b.name), trigram_similarity(a.name, b.name))
+        if a.address and b.address:
+            address = max(jaro_winkler(a.address, b.address), trigram_similarity(a.address, b.address))
+            total = 0.7 * name + 0.3 * address
+        else:
+            address = None
+            total = name
+
+        return {
+            "score": round(total, 4),
+            "name": round(name, 4),
+            "address": round(address, 4) if address is not None else None,
+            "distance_m": round(distance, 1) if distance is not None else None,
+        }
+
+    def candidate_pairs(
+        self,
+        records: Sequence[PlaceRecord],
+        focus: Optional[Set] = None
+    ) -> Iterable[Tuple[PlaceRecord, PlaceRecord]]:
+        """Пары внутри блоков; focus — сравнивать только пары с этими id"""
+        cells: Dict[str, List[PlaceRecord]] = {}
+        by_address: Dict[Tuple[str, str], List[PlaceRecord]] = {}
+        for record in records:
+            if record.geohash:
+                cells.setdefault(record.geohash, []).append(record)
+            elif record.address:
+                by_address.setdefault((record.city, record.address), []).append(record)
+
+        seen = set()
+
+        def allowed(a: PlaceRecord, b: PlaceRecord) -> bool:
+            if a.id == b.id:
+                return False
+            if self.cross_source_only and a.source == b.source:
+                return False
+            if focus is not None and a.id not in focus and b.id not in focus:
+                return False
+            key = (a.id, b.id) if str(a.id) < str(b.id) else (b.id, a.id)
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+        for cell, members in cells.items():
+            neighbors = [other for n in geohash_neighbors(cell) for other in cells.get(n, ())]
+            for a in members:
+                for b in neighbors:
+                    if allowed(a, b):
+                        yield a, b
+
+        for members in by_address.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if allowed(a, b):
+                        yield a, b
+
+    def resolve(self, records: Sequence[PlaceRecord], focus: Optional[Set] = None) -> List[Match]:
+        """Кластеры дубликатов → пары (основное место, дубликат).
+
+        Место попадает в кластер, только если само совпало с его основным
+        местом: цепочка A~B~C не сливает A и C, которые друг с другом не
+        совпадают. При cross_source_only в кластере не бывает двух мест
+        одного источника.
+        """
+        pairs: Dict = {}
+        linked: Dict = {}
+        for a, b in self.candidate_pairs(records, focus):
+            details = self.score(a, b)
+            if details is None or details["score"] < self.threshold:
+                continue
+            pairs[frozenset((a.id, b.id))] = details
+            linked.setdefault(a.id, []).append(b)
+            linked.setdefault(b.id, []).append(a)
+
+        # Кандидаты в основные места идут первыми, поэтому основное место
+        # кластера всегда обработано раньше своих дубликатов
+        candidates = sorted((record for record in records if record.id in linked), key=self._canonical_key)
+        canonical_of: Dict = {}
+        sources: Dict = {}
+        matches = []
+        for record in candidates:
+            best = None
+            for other in linked[record.id]:
+                if canonical_of.get(other.id) != other.id:
+                    continue  # other — не основное место (ещё не обработано или уже дубликат)
+                if self.cross_source_only and record.source in sources[other.id]:
+                    continue
+                details = pairs[frozenset((record.id, other.id))]
+                if best is None or details["score"] > best[1]["score"]:
+                    best = (other, details)
+
+            if best is None:
+                canonical_of[record.id] = record.id
+                sources[record.id] = {record.source}
+                continue
+            canonical, details = best
+            canonical_of[record.id] = canonical.id
+            sources[canonical.id].add(record.source)
+            matches.append(Match(canonical, record, details["score"], details))
+        return matches
+
+    @staticmethod
+    def _canonical_key(record: PlaceRecord):
+        """Основное место: проверенный источник, больше оценок, раньше создано"""
+        return (
+            SOURCE_PRIORITY.get(record.source, 1),
+            -record.rating_count,
+            record.created_at or datetime.max,
+            str(record.id),
+        )
+
+
+_COLUMNS = (
+    Place.id, Place.name, Place.address, Place.city, Place.source,
+    Place.latitude, Place.longitude, Place.rating_count, Place.created_at,
+)
+
+
+async def load_places(session: AsyncSession) -> List[PlaceRecord]:
+    result = await session.execute(select(*_COLUMNS).where(Place.is_active == True))
+    return [PlaceRecord.from_row(row) for row in result]
+
+
+async def apply_merges(session: AsyncSession, matches: List[Match], method: str) -> int:
+    """Слить дубликаты: перенести отзывы, деактивировать, записать в place_merges"""
+    if not matches:
+        return 0
+
+    existing = aliased(Review)
+    for match in matches:
+        # Один отзыв автора на место: если автор уже оценил основное место,
+        # его отзыв остаётся на деактивированном дубликате
+        await session.execute(
+            update(Review)
+            .where(
+                Review.place_id == match.duplicate.id,
+                ~exists().where(existing.place_id == match.canonical.id, existing.user_id == Review.user_id),
+            )
+            .values(place_id=match.canonical.id)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            update(Place)
+            .where(Place.id == match.duplicate.id)
+            .values(
+                is_active=False,
+                additional_data=func.coalesce(Place.additional_data, literal({}, JSONB)).op("||")(
+                    literal({"merged_into": str(match.canonical.id)}, JSONB)
+                ),
+            )
+        )
+        session.add(PlaceMerge(
+            canonical_id=match.canonical.id,
+            duplicate_id=match.duplicate.id,
+            score=match.score,
+            method=method,
+            details=match.details,
+        ))
+
+    # Рейтинг основного места и place_stats пересчитывает триггер на reviews
+    # (перенос отзыва = вычитание у дубликата и прибавление у основного)
+    await session.commit()
+    return len(matches)
+
+
+async def resolve_ingested(session: AsyncSession, places: List[Dict], resolver: EntityResolver) -> int:
+    """Инкрементальный режим: сравнить только что записанные места с соседями из БД"""
+    keys = [
+        (str(getattr(p.get("source"), "value", p.get("source"))), p["external_id"])
+        for p in places if p.get("external_id")
+    ]
+    if not keys:
+        return 0
+
+    result = await session.execute(
+        select(*_COLUMNS).where(
+            tuple_(Place.source, Place.external_id).in_(keys),
+            Place.is_active == True,
+        )
+    )
+    fresh = [PlaceRecord.from_row(row) for row in result]
+    focus = {record.id for record in fresh}
+
+    # Соседи — места в ячейках geohash вокруг новых (и с тем же адресом)
+    boxes = set()
+    for record in fresh:
+        if record.geohash:
+            boxes.update(geohash_neighbors(record.geohash))
+    conditions = []
+    for cell in boxes:
+        min_lat, min_lon, max_lat, max_lon = geohash_bounds(cell)
+        conditions.append(and_(Place.latitude.between(min_lat, max_lat), Place.longitude.between(min_lon, max_lon)))
+    # Без координат блок — город + адрес; из БД берём только адреса с тем же
+    # ключевым словом, а не все места города без координат
+    address = func.replace(func.lower(Place.address), "ё", "е")
+    for city, key in {(r.city, address_key(r.address)) for r in fresh if not r.geohash and r.address}:
+        if key:
+            conditions.append(and_(
+                Place.latitude.is_(None),
+                Place.city == city,
+                address.contains(key, autoescape=True),
+            ))
+    if not conditions:
+        return 0
+
+    result = await session.execute(select(*_COLUMNS).where(Place.is_active == True, or_(*conditions)))
+    records = {record.id: record for record in fresh}
+    for row in result:
+        records.setdefault(row.id, PlaceRecord.from_row(row))
+
+    matches = resolver.resolve(list(records.values()), focus=focus)
+    merged = await apply_merges(session, matches, method="ingest")
+    if merged:
+        logger.info(f"🔗 Слито дубликатов при загрузке: {merged}")
+    return merged
+
+
+async def run_batch(dry_run: bool = False) -> List[Match]:
+    """Пакетный поиск дубликатов по всему каталогу"""
+    engine = create_async_engine(config.DATABASE_URL, echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    resolver = EntityResolver(threshold=config.DEDUP_THRESHOLD, max_distance_m=config.DEDUP_MAX_DISTANCE_M)
+    try:
+        async with session_factory() as session:
+            records = await load_places(session)
+            matches = await asyncio.to_thread(resolver.resolve, records)
+            logger.info(f"🔍 Проверено мест: {len(records)}, найдено дубликатов: {len(matches)}")
+            for match in matches:
+                logger.info(
+                    f"  {match.duplicate.name!r} ({match.duplicate.source}) → "
+                    f"{match.canonical.name!r} ({match.canonical.source}): {match.details}"
+                )
+            if not dry_run:
+                await apply_merges(session, matches, method="batch")
+        return matches
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск и слияние дубликатов мест")
+    parser.add_argument("--dry-run", action="store_true", help="только показать найденные пары")
+    args = parser.parse_args()
+    logging.basicConfig(level=config.LOG_LEVEL)
+    asyncio.run(run_batch(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# parser/fetch_cache.py
+"""
+Кэш загрузок парсера.
+
+Для каждого URL хранит ETag, Last-Modified и хэш тела последнего ответа.
+Повторный обход отправляет условные запросы: на 304 страница не качается,
+а страница с тем же хэшем тела не разбирается и не пишется в БД.
+"""
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class CachedPage:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    size: int
+    has_more: bool
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+class FetchCache:
+    """Хранилище валидаторов страниц в локальном SQLite"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                has_more INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        row = self.conn.execute(
+            "SELECT url, etag, last_modified, body_hash, size, has_more FROM pages WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(row[0], row[1], row[2], row[3], row[4], bool(row[5]))
+
+    def put(self, page: CachedPage):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (page.url, page.etag, page.last_modified, page.body_hash, page.size, int(page.has_more), time.time())
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def conditional_headers(page: Optional[CachedPage]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since для повторного запроса"""
+        headers = {}
+        if page is not None:
+            if page.etag:
+                headers["If-None-Match"] = page.etag
+            if page.last_modified:
+                headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def close(self):
+        self.conn.close()
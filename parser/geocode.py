@@ -0,0 +1,237 @@
+# parser/geocode.py
+"""
+Геокодирование адресов мест.
+
+Стадия конвейера между dedupe и write: места без координат, но с адресом,
+собираются в пачки, адреса ищутся сначала в локальном кэше (SQLite), и только
+промахи уходят в геокодер — с ограничением параллельности и частоты запросов.
+Ответ кэшируется вместе с «не найдено», так что один адрес не разрешается
+дважды. Геокодер подключаемый: Nominatim (OSM) или детерминированная
+заглушка для тестов и локального запуска.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .crawler import HostRateLimiter
+from .normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Optional[Tuple[float, float]]
+
+# Центры городов для заглушки
+CITY_CENTERS = {
+    "Moscow": (55.7558, 37.6173),
+    "Saint Petersburg": (59.9343, 30.3351),
+}
+
+
+def address_key(city: str, address: str) -> str:
+    return f"{city}|{normalize_text(address).lower()}"
+
+
+class Geocoder:
+    """Базовый геокодер"""
+
+    name = "base"
+
+    async def geocode(self, city: str, address: str) -> Coordinates:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class StubGeocoder(Geocoder):
+    """Заглушка: стабильные координаты в пределах ~5 км от центра города"""
+
+    name = "stub"
+
+    async def geocode(self, city: str, address: str) -> Coordinates:
+        center = CITY_CENTERS.get(city, CITY_CENTERS["Moscow"])
+        digest = hashlib.sha1(address_key(city, address).encode("utf-8")).digest()
+        d_lat = (digest[0] / 255 - 0.5) * 0.09
+        d_lon = (digest[1] / 255 - 0.5) * 0.16
+        return round(center[0] + d_lat, 6), round(center[1] + d_lon, 6)
+
+
+class NominatimGeocoder(Geocoder):
+    """OpenStreetMap Nominatim (политика сервиса — не чаще 1 запроса в секунду)"""
+
+    name = "nominatim"
+
+    def __init__(self, base_url: str, rate: float = 1.0, user_agent: str = "GidRecBot-parser/1.0"):
+        self.base_url = base_url
+        self.limiter = HostRateLimiter(rate, burst=1)
+        self.session = aiohttp.ClientSession(
+            headers={"User-Agent": user_agent},
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+
+    async def geocode(self, city: str, address: str) -> Coordinates:
+        await self.limiter.acquire("nominatim")
+        params = {"q": f"{address}, {city}", "format": "json", "limit": "1"}
+        async with self.session.get(self.base_url, params=params) as response:
+            response.raise_for_status()
+            results = await response.json()
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+    async def close(self):
+        await self.session.close()
+
+
+def make_geocoder(kind: str, **options) -> Optional[Geocoder]:
+    if kind == "stub":
+        return StubGeocoder()
+    if kind == "nominatim":
+        return NominatimGeocoder(**options)
+    if kind:
+        raise ValueError(f"Unknown geocoder: {kind}")
+    return None
+
+
+class GeocodeCache:
+    """Постоянный кэш адрес → координаты (включая «не найдено»)"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode (
+                key TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                provider TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Coordinates]:
+        """Найденные в кэше ключи (значение None — адрес не геокодируется)"""
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, latitude, longitude FROM geocode WHERE key IN ({placeholders})", chunk
+            )
+            for key, lat, lon in rows:
+                found[key] = (lat, lon) if lat is not None else None
+        return found
+
+    def put_many(self, results: Dict[str, Coordinates], provider: str):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+            [
+                (key, coords[0] if coords else None, coords[1] if coords else None, provider, now)
+                for key, coords in results.items()
+            ]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class GeocodeStage:
+    """Стадия конвейера: дополнить места координатами"""
+
+    def __init__(
+        self,
+        geocoder: Geocoder,
+        cache: GeocodeCache,
+        batch_size: int = 50,
+        concurrency: int = 1,
+        max_buffer: int = 1000
+    ):
+        self.geocoder = geocoder
+        self.cache = cache
+        self.batch_size = batch_size
+        # Предел буфера: страница без адресов к геокодированию не держит пачку
+        self.max_buffer = max_buffer
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.cache_hits = 0
+        self.resolved = 0
+        self.not_found = 0
+        self.errors = 0
+
+    async def __call__(self, source: AsyncIterator) -> AsyncIterator:
+        # После первого места без координат буферизуем всё подряд (и маркеры
+        # страниц), чтобы не менять порядок
+        buffer = []
+        pending = 0
+        async for item in source:
+            if not buffer and not self._needs_geocoding(item):
+                yield item
+                continue
+            buffer.append(item)
+            if self._needs_geocoding(item):
+                pending += 1
+            if pending >= self.batch_size or len(buffer) >= self.max_buffer:
+                await self._enrich(buffer)
+                for buffered in buffer:
+                    yield buffered
+                buffer, pending = [], 0
+
+        if buffer:
+            await self._enrich(buffer)
+            for buffered in buffer:
+                yield buffered
+
+        logger.info(
+            f"🗺 Геокодирование: из кэша {self.cache_hits}, найдено {self.resolved}, "
+            f"не найдено {self.not_found}, ошибок {self.errors}"
+        )
+
+    @staticmethod
+    def _needs_geocoding(item) -> bool:
+        return isinstance(item, dict) and item.get("latitude") is None and bool(item.get("address"))
+
+    async def _enrich(self, items: List):
+        places = [item for item in items if self._needs_geocoding(item)]
+        if not places:
+            return
+
+        keys = {address_key(p.get("city") or "", p["address"]): p for p in places}
+        known = self.cache.get_many(list(keys))
+        self.cache_hits += len(known)
+
+        misses = [key for key in keys if key not in known]
+        if misses:
+            results = await asyncio.gather(*(self._resolve(keys[key]) for key in misses))
+            fresh = {key: coords for key, (coords, ok) in zip(misses, results) if ok}
+            # Ошибки геокодера не кэшируем — адрес попробуем в следующий раз
+            self.cache.put_many(fresh, self.geocoder.name)
+            known.update(fresh)
+
+        for place in places:
+            coords = known.get(address_key(place.get("city") or "", place["address"]))
+            if coords:
+                place["latitude"], place["longitude"] = coords
+
+    async def _resolve(self, place: Dict) -> Tuple[Coordinates, bool]:
+        async with self.semaphore:
+            try:
+                coords = await self.geocoder.geocode(place.get("city") or "", place["address"])
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Geocoding failed for {place['address']!r}: {e}")
+                return None, False
+        if coords:
+            self.resolved += 1
+        else:
+            self.not_found += 1
+        return coords, True
@@ -0,0 +1,162 @@
+# parser/html_parse.py
+"""
+Разбор HTML-страниц Афиши в пуле процессов.
+
+BeautifulSoup/lxml нагружает CPU и блокировал бы event loop, на котором идёт
+загрузка страниц. Поэтому сырые байты страниц уходят в ProcessPoolExecutor,
+а сеть остаётся в основном процессе. Страницы отправляются пачками по
+chunk_size, чтобы сериализация между процессами не съедала выигрыш.
+"""
+import asyncio
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .models import SourceType
+from .utils import generate_external_id
+
+logger = logging.getLogger(__name__)
+
+# (город, категория, тело страницы)
+PageJob = Tuple[str, str, bytes]
+
+
+def _events_from_ld(data) -> List[Dict]:
+    """Объекты schema.org Event из JSON-LD (в том числе внутри @graph и списков)"""
+    if isinstance(data, list):
+        return [event for item in data for event in _events_from_ld(item)]
+    if not isinstance(data, dict):
+        return []
+    if "@graph" in data:
+        return _events_from_ld(data["@graph"])
+    if data.get("@type") == "ItemList":
+        return _events_from_ld([item.get("item", item) for item in data.get("itemListElement", [])])
+    kind = data.get("@type")
+    kinds = kind if isinstance(kind, list) else [kind]
+    return [data] if any(str(k).endswith("Event") for k in kinds) else []
+
+
+def _place_from_event(event: Dict, city: str, category: str) -> Optional[Dict]:
+    url = event.get("url") or ""
+    name = event.get("name")
+    if not name or not url:
+        return None
+
+    location = event.get("location") or {}
+    if isinstance(location, list):
+        location = location[0] if location else {}
+    address = location.get("address") or {}
+    if isinstance(address, dict):
+        address = address.get("streetAddress")
+    geo = location.get("geo") or {}
+
+    source_id = url.rstrip("/").rsplit("/", 1)[-1]
+    return {
+        "name": name,
+        "description": event.get("description"),
+        "category": category,
+        "city": city,
+        "address": address or None,
+        "latitude": _to_float(geo.get("latitude")),
+        "longitude": _to_float(geo.get("longitude")),
+        "source": SourceType.YANDEX_AFISHA,
+        "external_id": generate_external_id(SourceType.YANDEX_AFISHA.value, source_id),
+        "external_url": url if url.startswith("http") else f"https://afisha.yandex.ru{url}",
+        "additional_data": {"venue": location.get("name")} if location.get("name") else {},
+    }
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_listing(city: str, category: str, body: bytes) -> List[Dict]:
+    """Места со страницы рубрики (по разметке JSON-LD)"""
+    soup = BeautifulSoup(body, "lxml")
+    places = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for event in _events_from_ld(data):
+            place = _place_from_event(event, city, category)
+            if place:
+                places.append(place)
+    return places
+
+
+def parse_chunk(jobs: List[PageJob]) -> List[List[Dict]]:
+    """Выполняется в процессе пула: разобрать пачку страниц"""
+    results = []
+    for city, category, body in jobs:
+        try:
+            results.append(parse_listing(city, category, body))
+        except Exception as e:
+            # Одна битая страница не должна ронять всю пачку
+            logger.error(f"HTML parse failed ({city}/{category}): {e}")
+            results.append([])
+    return results
+
+
+class HtmlParsePool:
+    """Пул процессов для разбора HTML с группировкой страниц в пачки"""
+
+    def __init__(self, workers: int = 0, chunk_size: int = 8, max_wait: float = 0.05):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_wait = max_wait
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._buffer: List[Tuple[PageJob, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def parse(self, city: str, category: str, body: bytes) -> List[Dict]:
+        """Разобрать страницу. Без пула — прямо в текущем процессе"""
+        if self.executor is None:
+            return parse_listing(city, category, body)
+
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append(((city, category, body), future))
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+        elif self._flush_handle is None:
+            # Неполная пачка уходит по таймауту, чтобы страницы не ждали бесконечно
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        jobs = [job for job, _ in batch]
+        futures = [future for _, future in batch]
+        pending = asyncio.get_running_loop().run_in_executor(self.executor, parse_chunk, jobs)
+        pending.add_done_callback(lambda done: self._resolve(done, futures))
+
+    @staticmethod
+    def _resolve(done: asyncio.Future, futures: List[asyncio.Future]):
+        if done.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        if done.exception() is not None:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(done.exception())
+            return
+        for future, places in zip(futures, done.result()):
+            if not future.done():
+                future.set_result(places)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
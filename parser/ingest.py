@@ -0,0 +1,181 @@
+# parser/ingest.py
+"""
+Пакетная запись мест в БД.
+
+Каждая пачка — один INSERT ... ON CONFLICT (source, external_id) DO UPDATE.
+Хэш содержимого хранится в additional_data["content_hash"]: строки, у которых
+он не изменился, не переписываются. Места без external_id под ограничение не
+попадают (NULL не конфликтует) и всегда вставляются новыми строками — их
+сводит дедупликация.
+"""
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import func, literal, literal_column
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Place, PlaceCategory, SourceType
+from shared.geo import place_geohash
+
+logger = logging.getLogger(__name__)
+
+# Поля из источника: по ним считается хэш, их обновляем при изменениях.
+# rating / rating_count не трогаем — их пересчитывает бэкенд по отзывам.
+SOURCE_FIELDS = (
+    "name", "description", "category", "city", "address",
+    "latitude", "longitude", "price_level", "external_url",
+)
+
+# Полный набор колонок INSERT (у всех строк пачки должен быть одинаковый)
+ROW_DEFAULTS = {
+    "description": None,
+    "category": PlaceCategory.OTHER,
+    "city": "Moscow",
+    "address": None,
+    "latitude": None,
+    "longitude": None,
+    "price_level": 2,
+    "rating": 0.0,
+    "rating_count": 0,
+    "source": SourceType.USER,
+    "external_id": None,
+    "external_url": None,
+    "is_active": True,
+}
+
+
+# Предел asyncpg на число параметров в одном запросе; запас — под параметры
+# вне VALUES (ON CONFLICT ... SET)
+MAX_QUERY_PARAMS = 32767 - 100
+
+
+def rows_per_statement(rows: List[Dict]) -> int:
+    """Сколько строк помещается в один INSERT ... VALUES (...), (...)"""
+    columns = max(len(row) for row in rows)
+    return max(1, MAX_QUERY_PARAMS // columns)
+
+
+@dataclass
+class UpsertStats:
+    """Итог записи: сколько строк вставлено, обновлено и пропущено без изменений.
+
+    merged — повторы одного (source, external_id) внутри пачки: в БД уходит
+    только последняя версия.
+    """
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    merged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged + self.merged
+
+    def __iadd__(self, other: "UpsertStats") -> "UpsertStats":
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.merged += other.merged
+        return self
+
+
+def content_hash(place: Dict) -> str:
+    """Хэш полей источника (и его additional_data) для обнаружения изменений"""
+    extra = {k: v for k, v in (place.get("additional_data") or {}).items() if k != "content_hash"}
+    payload = {field: place.get(field) for field in SOURCE_FIELDS}
+    payload["additional_data"] = extra
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _prepare_row(place: Dict, now: datetime) -> Dict:
+    row = {**ROW_DEFAULTS, **place}
+    row["additional_data"] = {**(place.get("additional_data") or {}), "content_hash": content_hash(place)}
+    row.setdefault("id", uuid.uuid4())
+    row["geohash"] = place_geohash(row["latitude"], row["longitude"])
+    row["created_at"] = now
+    row["updated_at"] = now
+    return row
+
+
+def _row_key(row: Dict):
+    """Ключ ON CONFLICT; место без external_id ни с чем не сливается"""
+    if row["external_id"] is None:
+        return row["id"]
+    return row["source"], row["external_id"]
+
+
+def _chunks(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _upsert_statement(rows: List[Dict]):
+    stmt = insert(Place).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[Place.source, Place.external_id],
+        set_={
+            **{field: excluded[field] for field in SOURCE_FIELDS},
+            "geohash": excluded.geohash,
+            "additional_data": func.coalesce(Place.additional_data, literal({}, JSONB)).op("||")(excluded.additional_data),
+            "updated_at": excluded.updated_at,
+        },
+        # Неизменившиеся строки не переписываем (и они не попадают в RETURNING)
+        where=Place.additional_data["content_hash"].astext.is_distinct_from(
+            excluded.additional_data["content_hash"].astext
+        ),
+    ).returning(literal_column("(xmax = 0)").label("inserted"))
+
+
+async def bulk_upsert_places(
+    session: AsyncSession,
+    places: Iterable[Dict],
+    batch_size: int = 500
+) -> UpsertStats:
+    """Записать места пачками; каждая пачка коммитится отдельно.
+
+    Пачка больше предела параметров asyncpg уходит несколькими INSERT в
+    одной транзакции.
+    """
+    stats = UpsertStats()
+    now = datetime.utcnow()
+
+    for batch in _chunks(places, batch_size):
+        # Одна и та же строка не может обновиться дважды в одном ON CONFLICT
+        rows = {}
+        for place in batch:
+            row = _prepare_row(place, now)
+            rows[_row_key(row)] = row
+
+        values = list(rows.values())
+        step = rows_per_statement(values)
+        flags = []
+        for start in range(0, len(values), step):
+            result = await session.execute(_upsert_statement(values[start:start + step]))
+            flags += result.scalars().all()
+        await session.commit()
+
+        inserted = sum(1 for flag in flags if flag)
+        batch_stats = UpsertStats(
+            inserted=inserted,
+            updated=len(flags) - inserted,
+            unchanged=len(rows) - len(flags),
+            merged=len(batch) - len(rows),
+        )
+        stats += batch_stats
+        logger.debug(f"Upsert batch: {batch_stats}")
+
+    return stats
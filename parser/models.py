@@ -12,8 +12,8 @@ shared_path = Path(__file__).parent.parent / "shared"
 if str(shared_path) not in sys.path:
     sys.path.insert(0, str(shared_path))
 
-from shared.models import Place, SourceType, PlaceCategory
+from shared.models import Place, PlaceMerge, Review, SourceType, PlaceCategory
 from shared.models.base import Base
 
 # Реэкспортируем для удобства
-__all__ = ['Place', 'SourceType', 'PlaceCategory', 'Base']
\ No newline at end of file
+__all__ = ['Place', 'PlaceMerge', 'Review', 'SourceType', 'PlaceCategory', 'Base']
\ No newline at end of file
@@ -0,0 +1,110 @@
+# parser/normalize.py
+"""
+Нормализация полей мест.
+
+Регулярные выражения компилируются и таблицы строятся один раз при импорте
+модуля. normalize_records обрабатывает списки записей целиком, для больших
+дампов — в пуле процессов.
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .models import PlaceCategory
+
+_AGE_RE = re.compile(r"(\d{1,2})\+")
+_DOTS_RE = re.compile(r"\.{2,}")
+
+CATEGORY_MAP = {
+    "concert": "concert",
+    "концерт": "concert",
+    "theatre": "theater",
+    "театр": "theater",
+    "спектакль": "theater",
+    "art": "art",
+    "искусство": "art",
+    "выставка": "art",
+    "cinema": "cinema",
+    "кино": "cinema",
+    "фильм": "cinema",
+    "excursions": "excursion",
+    "экскурсия": "excursion",
+    "тур": "excursion",
+    "quest": "quest",
+    "квест": "quest",
+    "приключение": "quest",
+}
+# Значения PlaceCategory уже нормализованы
+CATEGORY_MAP.update({category.value: category.value for category in PlaceCategory})
+
+# Ниже этого размера пул процессов дороже самой работы
+PROCESS_POOL_MIN_RECORDS = 20_000
+
+
+def normalize_text(text: str) -> str:
+    """Нормализация текста: удаление лишних пробелов, переносов"""
+    if not text:
+        return ""
+    # split() без аргументов режет по тем же пробельным символам, что и \s, но без regex
+    return " ".join(text.split())
+
+
+def extract_age_rating(description: str) -> tuple[str, Optional[int]]:
+    """Извлечение возрастного рейтинга из описания"""
+    match = _AGE_RE.search(description)
+    if match:
+        # Убираем рейтинг из описания
+        return _AGE_RE.sub("", description).strip(), int(match.group(1))
+    return description, None
+
+
+def clean_place_name(name: str) -> str:
+    """Очистка названия места от лишних символов"""
+    if not name:
+        return ""
+    name = name.replace('"', "").replace("'", "")
+    if ".." in name:
+        name = _DOTS_RE.sub(".", name)
+    return name.strip()
+
+
+def normalize_category(category: str) -> str:
+    """Нормализация категории места"""
+    return CATEGORY_MAP.get(category.lower(), "other")
+
+
+def normalize_record(record: Dict) -> Optional[Dict]:
+    """Очистка названия, описания и категории. None — запись без названия"""
+    name = clean_place_name(normalize_text(record.get("name") or ""))
+    if not name:
+        return None
+    record["name"] = name
+    if record.get("description"):
+        record["description"] = normalize_text(record["description"]) or None
+    category = record.get("category")
+    record["category"] = normalize_category(getattr(category, "value", category) or "")
+    return record
+
+
+def _normalize_chunk(records: List[Dict]) -> List[Dict]:
+    return [record for record in map(normalize_record, records) if record is not None]
+
+
+def _chunks(records: List[Dict], size: int) -> Iterable[List[Dict]]:
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
+def normalize_records(records: List[Dict], processes: int = 0, chunk_size: int = 5000) -> List[Dict]:
+    """Нормализовать список записей; записи без названия отбрасываются.
+
+    processes > 1 — в пуле процессов (для дампов от PROCESS_POOL_MIN_RECORDS записей).
+    """
+    if processes <= 1 or len(records) < PROCESS_POOL_MIN_RECORDS:
+        return _normalize_chunk(records)
+
+    result: List[Dict] = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for chunk in pool.map(_normalize_chunk, _chunks(records, chunk_size)):
+            result.extend(chunk)
+    return result
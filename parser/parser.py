@@ -3,21 +3,39 @@
 Парсер через HTTP запросы (без Selenium)
 """
 import asyncio
+import json
 import logging
 from datetime import datetime
-import uuid
 import aiohttp
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select
 
 from .config import config
-from .models import Place, SourceType, PlaceCategory
+from .crawler import CrawlScheduler, CrawlTask
+from .dedup import EntityResolver, resolve_ingested
+from .fetch_cache import FetchCache
+from .geocode import GeocodeCache, GeocodeStage, make_geocoder
+from .html_parse import HtmlParsePool
+from .ingest import bulk_upsert_places, UpsertStats
+from .models import SourceType, PlaceCategory
+from .pipeline import PageDone, iterate, run_pipeline
+from .telemetry import RunTelemetry
+from .utils import generate_external_id
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "application/json, text/html;q=0.9",
+}
+
+
+def city_slug(city: str) -> str:
+    """Moscow -> moscow, Saint Petersburg -> saint-petersburg"""
+    return "-".join(city.lower().split())
+
 
 class HTTPParser:
     """Парсер через HTTP API"""
@@ -25,6 +43,14 @@ class HTTPParser:
     def __init__(self):
         self.db_engine = None
         self.async_session = None
+        self.fetch_cache = None
+        self.html_pool = None
+        self.geocoder = None
+        self.geocode_cache = None
+        self.resolver = EntityResolver(
+            threshold=config.DEDUP_THRESHOLD,
+            max_distance_m=config.DEDUP_MAX_DISTANCE_M
+        )
         
     async def initialize(self):
         """Инициализация БД"""
@@ -57,45 +83,195 @@ class HTTPParser:
             # ... остальные места
         ]
     
-    async def save_places(self, places: List[Dict]) -> int:
-        """Сохранение мест в БД"""
-        saved = 0
-        async with self.async_session() as session:
-            for place_data in places:
-                try:
-                    # Проверяем, существует ли уже
-                    result = await session.execute(
-                        select(Place).where(Place.external_id == place_data["external_id"])
-                    )
-                    if result.scalar_one_or_none():
-                        continue
-                    
-                    place = Place(id=uuid.uuid4(), **place_data)
-                    session.add(place)
-                    saved += 1
-                except Exception as e:
-                    logger.error(f"Error saving place: {e}")
-            
-            await session.commit()
+    def page_url(self, task: CrawlTask) -> str:
+        """URL страницы рубрики в API Афиши"""
+        if config.SOURCE_FORMAT == "html":
+            return config.SOURCE_HTML_URL.format(
+                city=city_slug(task.city), category=task.category, page=task.page + 1
+            )
+        offset = task.page * config.SOURCE_PAGE_SIZE
+        return (
+            f"{config.SOURCE_API_URL}/{task.category}"
+            f"?city={city_slug(task.city)}&limit={config.SOURCE_PAGE_SIZE}&offset={offset}"
+        )
+    
+    def parse_page(self, task: CrawlTask, body: bytes) -> List[Dict]:
+        """Места из ответа API рубрики (очистка полей — на стадии normalize)"""
+        items = json.loads(body).get("data") or []
+        places = []
+        for item in items:
+            event = item.get("event") or {}
+            if not event.get("id") or not event.get("title"):
+                continue
+            venue = (item.get("scheduleInfo") or {}).get("onlyPlace") or {}
+            coordinates = venue.get("coordinates") or {}
+            url = event.get("url") or ""
+            places.append({
+                "name": event["title"],
+                "description": event.get("argument"),
+                "category": task.category,
+                "city": task.city,
+                "address": venue.get("address"),
+                "latitude": coordinates.get("latitude"),
+                "longitude": coordinates.get("longitude"),
+                "source": SourceType.YANDEX_AFISHA,
+                "external_id": generate_external_id(SourceType.YANDEX_AFISHA.value, str(event["id"])),
+                "external_url": f"https://afisha.yandex.ru{url}" if url.startswith("/") else url or None,
+                "additional_data": {"venue": venue.get("title")} if venue.get("title") else {},
+            })
+        return places
+    
+    def make_scheduler(self) -> CrawlScheduler:
+        if config.FETCH_CACHE_PATH and self.fetch_cache is None:
+            self.fetch_cache = FetchCache(config.FETCH_CACHE_PATH)
+        return CrawlScheduler(
+            url_for=self.page_url,
+            concurrency=config.CRAWL_CONCURRENCY,
+            host_rate=config.HOST_RATE_LIMIT,
+            host_burst=config.HOST_RATE_BURST,
+            max_retries=config.CRAWL_MAX_RETRIES,
+            retry_delay=config.REQUEST_DELAY,
+            timeout=config.PAGE_LOAD_TIMEOUT,
+            checkpoint_path=config.CRAWL_CHECKPOINT_PATH,
+            headers=HEADERS,
+            fetch_cache=self.fetch_cache,
+        )
+    
+    async def crawl(self, scheduler: CrawlScheduler) -> AsyncIterator:
+        """Стадия fetch: места по мере загрузки страниц, за каждой страницей — маркер PageDone"""
+        cities = config.PARSE_CITIES or [config.PARSE_CITY]
+        tasks = scheduler.build_tasks(cities, config.PARSE_CATEGORIES, config.MAX_PAGES_PER_CATEGORY)
+        queue: asyncio.Queue = asyncio.Queue(config.PIPELINE_QUEUE_SIZE)
+        
+        async def handle_page(task: CrawlTask, body: bytes) -> bool:
+            if self.html_pool is not None:
+                # CPU-разбор HTML — в пуле процессов, event loop продолжает качать
+                places = await self.html_pool.parse(task.city, task.category, body)
+            else:
+                places = self.parse_page(task, body)
+            for place in places:
+                await queue.put(place)
+            # Страница уйдёт в чекпоинт, только когда маркер дойдёт до записи
+            await queue.put(PageDone(task))
+            if self.html_pool is not None:
+                return bool(places)
+            return len(places) >= config.SOURCE_PAGE_SIZE
         
-        return saved
+        async def produce():
+            try:
+                await scheduler.run(tasks, handle_page, auto_ack=False)
+            finally:
+                await queue.put(None)
+        
+        producer = asyncio.create_task(produce())
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            await producer
+        finally:
+            producer.cancel()
+    
+    async def resolve_duplicates(self, session: AsyncSession, places: List[Dict]):
+        """Слияние только что записанных мест с дубликатами из других источников"""
+        try:
+            await resolve_ingested(session, places, self.resolver)
+        except Exception as e:
+            # Дубликаты подберёт пакетный запуск, загрузку из-за них не останавливаем
+            await session.rollback()
+            logger.error(f"Dedup on ingest failed: {e}")
     
-    async def run(self):
+    async def save_places(self, places: List[Dict]) -> UpsertStats:
+        """Сохранение мест в БД пакетным upsert'ом"""
+        async with self.async_session() as session:
+            return await bulk_upsert_places(session, places, batch_size=config.INGEST_BATCH_SIZE)
+    
+    async def run(self) -> RunTelemetry:
         """Основной метод"""
         await self.initialize()
+        telemetry = RunTelemetry(mode=config.SOURCE_FORMAT if config.CRAWL_ENABLED else "demo")
+        telemetry.start()
         
         logger.info("🔄 Получение данных...")
-        places = await self.fetch_places_from_api()
+        scheduler = None
+        if config.CRAWL_ENABLED:
+            if config.SOURCE_FORMAT == "html":
+                self.html_pool = HtmlParsePool(workers=config.PARSE_WORKERS, chunk_size=config.PARSE_CHUNK_SIZE)
+            scheduler = self.make_scheduler()
+            source = self.crawl(scheduler)
+        else:
+            source = iterate(await self.fetch_places_from_api())
         
-        logger.info(f"📥 Найдено {len(places)} мест")
+        extra_stages = []
+        geocode_stage = None
+        if config.GEOCODER:
+            options = {"base_url": config.NOMINATIM_URL, "rate": config.GEOCODE_RATE_LIMIT} \
+                if config.GEOCODER == "nominatim" else {}
+            self.geocoder = make_geocoder(config.GEOCODER, **options)
+            self.geocode_cache = GeocodeCache(config.GEOCODE_CACHE_PATH)
+            geocode_stage = GeocodeStage(
+                self.geocoder,
+                self.geocode_cache,
+                batch_size=config.GEOCODE_BATCH_SIZE,
+                concurrency=config.GEOCODE_CONCURRENCY
+            )
+            extra_stages.append(("geocode", geocode_stage))
         
-        saved = await self.save_places(places)
-        logger.info(f"💾 Сохранено {saved} мест")
+        stages = []
+        stats = None
+        try:
+            stats = await run_pipeline(
+                source,
+                self.async_session,
+                batch_size=config.INGEST_BATCH_SIZE,
+                queue_size=config.PIPELINE_QUEUE_SIZE,
+                ack=scheduler.ack if scheduler else None,
+                after_write=self.resolve_duplicates if config.DEDUP_ON_INGEST else None,
+                extra_stages=extra_stages,
+                stages=stages
+            )
+            if scheduler:
+                scheduler.finish()
+            
+            logger.info(
+                f"💾 Сохранено: новых {stats.inserted}, обновлено {stats.updated}, "
+                f"без изменений {stats.unchanged}, повторов в пачках {stats.merged}"
+            )
+        except Exception:
+            logger.exception("Parser run failed")
+            raise
+        finally:
+            telemetry.finish(
+                upsert=stats,
+                stages=stages,
+                crawl=scheduler.stats if scheduler else None,
+                geocode=geocode_stage
+            )
+            self.report(telemetry)
+            await self.close()
         
-        await self.close()
+        return telemetry
+    
+    def report(self, telemetry: RunTelemetry):
+        """Записать телеметрию запуска"""
+        logger.info(f"📈 {telemetry.summary()}")
+        try:
+            if config.PARSER_METRICS_PATH:
+                telemetry.write_json(config.PARSER_METRICS_PATH)
+            if config.PARSER_METRICS_PROM_PATH:
+                telemetry.write_prometheus(config.PARSER_METRICS_PROM_PATH)
+        except OSError as e:
+            logger.warning(f"Telemetry not written: {e}")
     
     async def close(self):
         """Закрытие"""
+        if self.fetch_cache:
+            self.fetch_cache.close()
+        if self.html_pool:
+            self.html_pool.close()
+        if self.geocoder:
+            await self.geocoder.close()
+        if self.geocode_cache:
+            self.geocode_cache.close()
         if self.db_engine:
             await self.db_engine.dispose()
 
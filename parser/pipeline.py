@@ -0,0 +1,238 @@
+# parser/pipeline.py
+"""
+Потоковый конвейер загрузки мест.
+
+fetch → normalize → dedupe → write: каждая стадия — асинхронный генератор,
+между стадиями стоят ограниченные очереди. Стадии работают одновременно
+(запись в БД идёт, пока качаются следующие страницы), а заполненная очередь
+притормаживает быструю стадию, так что в памяти не копится весь обход.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .ingest import UpsertStats, bulk_upsert_places
+from .normalize import normalize_record
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PageDone:
+    """Маркер конца страницы: идёт по конвейеру вслед за её местами.
+
+    Стадия записи подтверждает страницу (ack), когда все места перед
+    маркером записаны в БД.
+    """
+    task: object
+
+
+Item = Union[Dict, PageDone]
+
+
+class StageStats:
+    """Пропускная способность стадии"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.blocked = 0.0  # Ожидание места в очереди (следующая стадия не успевает)
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # Задержка операций стадии (например, одной пачки записи)
+        self.operations = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def observe(self, seconds: float):
+        self.operations += 1
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+
+    def tick(self):
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        self.finished = now
+        self.items += 1
+
+    @property
+    def rate(self) -> float:
+        if not self.items or self.finished == self.started:
+            return 0.0
+        return self.items / (self.finished - self.started)
+
+    def as_dict(self) -> Dict:
+        return {
+            "items": self.items,
+            "rate": round(self.rate, 2),
+            "blocked_s": round(self.blocked, 3),
+            "operations": self.operations,
+            "latency_avg_s": round(self.latency_total / self.operations, 4) if self.operations else None,
+            "latency_max_s": round(self.latency_max, 4) if self.operations else None,
+        }
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.items} шт, {self.rate:.1f}/s, ожидание очереди {self.blocked:.1f}s"
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_END = object()
+
+
+async def buffered(source: AsyncIterator[Item], maxsize: int, stats: StageStats) -> AsyncIterator[Item]:
+    """Выполнять стадию в отдельной задаче, отдавая результаты через очередь maxsize"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def pump():
+        try:
+            async for item in source:
+                if isinstance(item, dict):
+                    stats.tick()
+                started = time.monotonic()
+                await queue.put(item)
+                stats.blocked += time.monotonic() - started
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_END)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def normalize_stage(source: AsyncIterator[Item]) -> AsyncIterator[Item]:
+    """Очистка названия, описания и категории"""
+    async for item in source:
+        if isinstance(item, dict) and normalize_record(item) is None:
+            continue
+        yield item
+
+
+async def dedupe_stage(source: AsyncIterator[Item]) -> AsyncIterator[Item]:
+    """Отбросить повторы (source, external_id) в рамках запуска"""
+    seen = set()
+    async for item in source:
+        if isinstance(item, dict) and item.get("external_id"):
+            key = (getattr(item.get("source"), "value", item.get("source")), item["external_id"])
+            if key in seen:
+                continue
+            seen.add(key)
+        yield item
+
+
+async def write_stage(
+    source: AsyncIterator[Item],
+    session_factory: Callable,
+    batch_size: int,
+    stats: StageStats,
+    ack: Optional[Callable[[object], None]] = None,
+    after_write: Optional[Callable[..., Awaitable]] = None
+) -> UpsertStats:
+    """Запись пачками; после коммита подтверждаются страницы, чьи места записаны.
+
+    after_write(session, batch) вызывается после записи каждой пачки
+    (например, поиск дубликатов среди только что записанных мест).
+    """
+    result = UpsertStats()
+    batch: List[Dict] = []
+    pending: List[PageDone] = []
+
+    async def flush():
+        nonlocal result
+        if batch:
+            started = time.monotonic()
+            async with session_factory() as session:
+                result += await bulk_upsert_places(session, batch, batch_size=batch_size)
+                if after_write:
+                    await after_write(session, batch)
+            stats.observe(time.monotonic() - started)
+            for _ in batch:
+                stats.tick()
+            batch.clear()
+        if ack:
+            for marker in pending:
+                ack(marker.task)
+        pending.clear()
+
+    async for item in source:
+        if isinstance(item, PageDone):
+            if batch:
+                pending.append(item)
+            elif ack:
+                ack(item.task)
+            continue
+        if stats.started is None:
+            # Скорость записи считаем от прихода первой строки, а не от первого коммита
+            stats.started = time.monotonic()
+        batch.append(item)
+        if len(batch) >= batch_size:
+            await flush()
+
+    await flush()
+    return result
+
+
+async def iterate(items) -> AsyncIterator[Item]:
+    """Обычный список как источник конвейера"""
+    for item in items:
+        yield item
+
+
+async def run_pipeline(
+    source: AsyncIterator[Item],
+    session_factory: Callable,
+    batch_size: int = 500,
+    queue_size: int = 1000,
+    ack: Optional[Callable[[object], None]] = None,
+    after_write: Optional[Callable[..., Awaitable]] = None,
+    extra_stages: Sequence[Tuple[str, Callable[[AsyncIterator[Item]], AsyncIterator[Item]]]] = (),
+    stages: Optional[List[StageStats]] = None
+) -> UpsertStats:
+    """Собрать и прогнать конвейер fetch → normalize → dedupe → [extra_stages] → write.
+
+    stages — список, в который складывается статистика стадий (для телеметрии).
+    """
+    fetch_stats, normalize_stats, dedupe_stats = StageStats("fetch"), StageStats("normalize"), StageStats("dedupe")
+    if stages is None:
+        stages = []
+    stages += [fetch_stats, normalize_stats, dedupe_stats]
+
+    stream = buffered(source, queue_size, fetch_stats)
+    stream = buffered(normalize_stage(stream), queue_size, normalize_stats)
+    stream = buffered(dedupe_stage(stream), queue_size, dedupe_stats)
+    for name, stage in extra_stages:
+        stats = StageStats(name)
+        stages.append(stats)
+        stream = buffered(stage(stream), queue_size, stats)
+
+    write_stats = StageStats("write")
+    stages.append(write_stats)
+    try:
+        result = await write_stage(
+            stream, session_factory, batch_size, write_stats, ack=ack, after_write=after_write
+        )
+    finally:
+        await stream.aclose()
+
+    for stage in stages:
+        logger.info(f"📊 {stage}")
+    return result
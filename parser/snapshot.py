@@ -0,0 +1,173 @@
+# parser/snapshot.py
+"""
+Снимок каталога мест: выгрузка таблицы places в файл и загрузка обратно.
+
+Форматы по расширению файла:
+  .parquet        — колоночный Parquet со сжатием zstd (нужен pyarrow)
+  .ndjson.zst     — построчный JSON, сжатый zstd (нужен zstandard)
+  .ndjson.gz      — построчный JSON, сжатый gzip (без зависимостей)
+
+Выгрузка и загрузка идут потоком пачек: Parquet читается через memory map
+по row group'ам, NDJSON — построчно, так что память не растёт с размером
+снимка. Загрузка идёт через bulk_upsert_places и годится как быстрая
+фикстура для тестового окружения.
+"""
+import gzip
+import io
+import json
+import logging
+import time
+import uuid
+from typing import Dict, Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .ingest import UpsertStats, bulk_upsert_places, rows_per_statement
+from .models import Place
+from shared.geo import place_geohash
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "id", "name", "description", "category", "city", "address", "latitude", "longitude",
+    "price_level", "rating", "rating_count", "source", "external_id", "external_url",
+    "additional_data", "is_active",
+)
+READ_BATCH_SIZE = 10_000
+
+
+def _format(path: str) -> str:
+    if path.endswith(".parquet"):
+        return "parquet"
+    if path.endswith(".ndjson.zst"):
+        return "zstd"
+    if path.endswith(".ndjson.gz"):
+        return "gzip"
+    raise ValueError(f"Unknown snapshot format: {path} (expected .parquet, .ndjson.zst or .ndjson.gz)")
+
+
+def _require(module: str, fmt: str):
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError:
+        raise RuntimeError(f"{fmt} snapshots need the '{module}' package (pip install {module.split('.')[0]})")
+
+
+def _to_record(row) -> Dict:
+    record = {column: getattr(row, column) for column in COLUMNS}
+    record["id"] = str(record["id"])
+    # В Parquet JSONB хранится строкой: у разных мест разный набор ключей
+    record["additional_data"] = json.dumps(record["additional_data"] or {}, ensure_ascii=False)
+    return record
+
+
+def _from_record(record: Dict) -> Dict:
+    place = dict(record)
+    place["id"] = uuid.UUID(place["id"])
+    extra = place.get("additional_data")
+    place["additional_data"] = json.loads(extra) if isinstance(extra, str) else (extra or {})
+    return place
+
+
+async def export_places(session: AsyncSession, path: str, batch_size: int = READ_BATCH_SIZE) -> int:
+    """Выгрузить places в файл снимка. Возвращает число строк"""
+    fmt = _format(path)
+    columns = [getattr(Place, column) for column in COLUMNS]
+    result = await session.stream(
+        select(*columns).order_by(Place.id).execution_options(yield_per=batch_size)
+    )
+
+    total = 0
+    started = time.perf_counter()
+    if fmt == "parquet":
+        pa = _require("pyarrow", "Parquet")
+        pq = _require("pyarrow.parquet", "Parquet")
+        schema = pa.schema([
+            ("id", pa.string()), ("name", pa.string()), ("description", pa.string()),
+            ("category", pa.string()), ("city", pa.string()), ("address", pa.string()),
+            ("latitude", pa.float64()), ("longitude", pa.float64()), ("price_level", pa.int32()),
+            ("rating", pa.float64()), ("rating_count", pa.int32()), ("source", pa.string()),
+            ("external_id", pa.string()), ("external_url", pa.string()),
+            ("additional_data", pa.string()), ("is_active", pa.bool_()),
+        ])
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            async for rows in result.partitions():
+                records = [_to_record(row) for row in rows]
+                writer.write_table(pa.Table.from_pylist(records, schema=schema))
+                total += len(records)
+    else:
+        with _open_ndjson(path, "w") as out:
+            async for rows in result.partitions():
+                for row in rows:
+                    out.write(json.dumps(_to_record(row), ensure_ascii=False, default=str))
+                    out.write("\n")
+                total += len(rows)
+
+    logger.info(f"📦 Выгружено {total} мест в {path} за {time.perf_counter() - started:.1f}s")
+    return total
+
+
+def _open_ndjson(path: str, mode: str):
+    if _format(path) == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    zstd = _require("zstandard", "zstd")
+    raw = open(path, mode + "b")
+    if mode == "w":
+        stream = zstd.ZstdCompressor(level=9).stream_writer(raw, closefd=True)
+    else:
+        stream = zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def iter_snapshot(path: str, batch_size: int = READ_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """Пачки мест из файла снимка (без чтения файла целиком)"""
+    if _format(path) == "parquet":
+        pq = _require("pyarrow.parquet", "Parquet")
+        parquet = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet.iter_batches(batch_size=batch_size):
+            yield [_from_record(record) for record in batch.to_pylist()]
+        return
+
+    with _open_ndjson(path, "r") as stream:
+        batch = []
+        for line in stream:
+            if line.strip():
+                batch.append(_from_record(json.loads(line)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+async def import_places(session: AsyncSession, path: str, batch_size: int = 500) -> UpsertStats:
+    """Загрузить снимок через пакетный upsert"""
+    stats = UpsertStats()
+    started = time.perf_counter()
+    for places in iter_snapshot(path):
+        keyed = [place for place in places if place.get("external_id")]
+        # Места без external_id (добавленные пользователями) — ключ только id
+        keyless = [
+            {**place, "geohash": place_geohash(place.get("latitude"), place.get("longitude"))}
+            for place in places if not place.get("external_id")
+        ]
+        if keyed:
+            stats += await bulk_upsert_places(session, keyed, batch_size=batch_size)
+        step = min(batch_size, rows_per_statement(keyless)) if keyless else batch_size
+        for start in range(0, len(keyless), step):
+            chunk = keyless[start:start + step]
+            result = await session.execute(
+                insert(Place).values(chunk).on_conflict_do_nothing(index_elements=[Place.id]).returning(Place.id)
+            )
+            inserted = len(result.all())
+            await session.commit()
+            stats += UpsertStats(inserted=inserted, unchanged=len(chunk) - inserted)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"📥 Загружено из {path}: новых {stats.inserted}, обновлено {stats.updated}, "
+        f"без изменений {stats.unchanged} за {elapsed:.1f}s ({stats.total / max(elapsed, 1e-9):.0f} строк/с)"
+    )
+    return stats
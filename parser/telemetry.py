@@ -0,0 +1,132 @@
+# parser/telemetry.py
+"""
+Телеметрия запуска парсера.
+
+По итогам запуска собирается одна запись: страницы, байты, повторы, ошибки,
+статистика стадий конвейера и скорость записи. Запись дописывается JSON-
+строкой в PARSER_METRICS_PATH и, если задан PARSER_METRICS_PROM_PATH,
+выгружается в текстовом формате Prometheus (для textfile collector
+node_exporter — парсер живёт недолго, опрашивать его некому).
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorCounter(logging.Handler):
+    """Считает записи лога уровня ERROR и выше за время запуска"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+        self.by_logger: Dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+        self.by_logger[record.name] = self.by_logger.get(record.name, 0) + 1
+
+
+@dataclass
+class RunTelemetry:
+    """Итоги одного запуска"""
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    mode: str = "demo"
+    started_at: float = field(default_factory=time.time)
+    duration_s: float = 0.0
+    crawl: Dict = field(default_factory=dict)
+    stages: Dict[str, Dict] = field(default_factory=dict)
+    rows: Dict[str, int] = field(default_factory=dict)
+    rows_per_second: float = 0.0
+    geocode: Dict = field(default_factory=dict)
+    errors: int = 0
+    errors_by_logger: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._errors = ErrorCounter()
+        self._started = time.monotonic()
+
+    def start(self):
+        logging.getLogger().addHandler(self._errors)
+
+    def finish(self, upsert=None, stages: Optional[List] = None, crawl=None, geocode=None):
+        logging.getLogger().removeHandler(self._errors)
+        self.duration_s = round(time.monotonic() - self._started, 3)
+        self.errors = self._errors.count
+        self.errors_by_logger = dict(self._errors.by_logger)
+
+        if crawl is not None:
+            self.crawl = {
+                key: round(value, 4) if isinstance(value, float) else value
+                for key, value in asdict(crawl).items() if key != "started_at"
+            }
+        for stage in stages or []:
+            self.stages[stage.name] = stage.as_dict()
+        if upsert is not None:
+            self.rows = {
+                "inserted": upsert.inserted,
+                "updated": upsert.updated,
+                "unchanged": upsert.unchanged,
+                "merged": upsert.merged,
+            }
+            write = self.stages.get("write", {})
+            # Скорость записи — по времени самих пачек, а не всего запуска
+            busy = (write.get("latency_avg_s") or 0) * write.get("operations", 0)
+            self.rows_per_second = round(upsert.total / busy, 1) if busy else 0.0
+        if geocode is not None:
+            self.geocode = {
+                "cache_hits": geocode.cache_hits,
+                "resolved": geocode.resolved,
+                "not_found": geocode.not_found,
+                "errors": geocode.errors,
+            }
+
+    def to_dict(self) -> Dict:
+        return {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+
+    def write_json(self, path: str):
+        """Дописать запись JSON-строкой"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+    def render_prometheus(self) -> str:
+        lines = [
+            f"parser_last_run_timestamp_seconds {self.started_at:.0f}",
+            f"parser_last_run_duration_seconds {self.duration_s}",
+            f"parser_last_run_errors {self.errors}",
+            f"parser_last_run_rows_per_second {self.rows_per_second}",
+        ]
+        for result, count in self.rows.items():
+            lines.append(f'parser_last_run_rows{{result="{result}"}} {count}')
+        for key, value in self.crawl.items():
+            lines.append(f"parser_last_run_crawl_{key} {value}")
+        for stage, values in self.stages.items():
+            for key, value in values.items():
+                if value is not None:
+                    lines.append(f'parser_last_run_stage_{key}{{stage="{stage}"}} {value}')
+        for key, value in self.geocode.items():
+            lines.append(f"parser_last_run_geocode_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Атомарно заменить .prom-файл (textfile collector читает его целиком)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def summary(self) -> str:
+        crawl = self.crawl
+        return (
+            f"run {self.run_id}: {self.duration_s:.1f}s, страниц {crawl.get('fetched', 0)}, "
+            f"{crawl.get('bytes', 0) / 1024:.0f} KB, повторов {crawl.get('retries', 0)}, "
+            f"строк {sum(self.rows.values())} ({self.rows_per_second:.0f}/s записи), ошибок {self.errors}"
+        )
@@ -2,90 +2,74 @@
 """
 Вспомогательные утилиты для парсера
 """
-import re
+import random
 import logging
 from typing import Optional
-from urllib.parse import urljoin
 import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
-logger = logging.getLogger(__name__)
-
+import aiohttp
 
-def normalize_text(text: str) -> str:
-    """Нормализация текста: удаление лишних пробелов, переносов"""
-    if not text:
-        return ""
-    
-    # Заменяем множественные пробелы и переносы
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n+', ' ', text)
-    
-    return text.strip()
+# Нормализация полей вынесена в normalize.py (скомпилированные выражения, пакетный API);
+# имена остаются доступны из utils для старых импортов
+from .normalize import clean_place_name, extract_age_rating, normalize_category, normalize_text
 
+__all__ = [
+    'retry_after', 'is_retryable', 'safe_request', 'generate_external_id',
+    'clean_place_name', 'extract_age_rating', 'normalize_category', 'normalize_text',
+]
 
-def extract_age_rating(description: str) -> tuple[str, Optional[int]]:
-    """Извлечение возрастного рейтинга из описания"""
-    age_pattern = r'(\d{1,2})\+'
-    match = re.search(age_pattern, description)
-    
-    if match:
-        age = int(match.group(1))
-        # Убираем рейтинг из описания
-        clean_desc = re.sub(age_pattern, '', description).strip()
-        return clean_desc, age
-    
-    return description, None
+logger = logging.getLogger(__name__)
 
 
-def clean_place_name(name: str) -> str:
-    """Очистка названия места от лишних символов"""
-    if not name:
-        return ""
-    
-    # Удаляем кавычки, лишние точки
-    name = name.replace('"', '').replace("'", "")
-    name = re.sub(r'\.{2,}', '.', name)
-    
-    return name.strip()
+def retry_after(error: Exception) -> Optional[float]:
+    """Секунды из заголовка Retry-After ответа с ошибкой (число или HTTP-дата)"""
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
 
 
-def normalize_category(category: str) -> str:
-    """Нормализация категории места"""
-    category_map = {
-        "concert": "concert",
-        "концерт": "concert",
-        "theatre": "theater",
-        "театр": "theater",
-        "спектакль": "theater",
-        "art": "art",
-        "искусство": "art",
-        "выставка": "art",
-        "cinema": "cinema",
-        "кино": "cinema",
-        "фильм": "cinema",
-        "excursions": "excursion",
-        "экскурсия": "excursion",
-        "тур": "excursion",
-        "quest": "quest",
-        "квест": "quest",
-        "приключение": "quest"
-    }
-    
-    return category_map.get(category.lower(), "other")
+def is_retryable(error: Exception) -> bool:
+    """Ошибки клиента (4xx) повтором не исправить — кроме 429"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return not (400 <= error.status < 500) or error.status == 429
+    return True
 
 
-async def safe_request(coro, max_retries: int = 3, delay: float = 1.0):
+async def safe_request(request, max_retries: int = 3, delay: float = 1.0, max_delay: float = 60.0):
     """
-    Безопасный вызов асинхронной функции с повторными попытками
+    Безопасный вызов асинхронной функции с повторными попытками.
+    
+    request — фабрика корутины (вызывается заново на каждую попытку)
+    или сама корутина (её можно выполнить только один раз).
+    Ответы 4xx (кроме 429) не повторяются; Retry-After сервера соблюдается,
+    а если он длиннее max_delay — попытки прекращаются.
     """
     for attempt in range(max_retries):
         try:
-            return await coro
+            return await (request() if callable(request) else request)
         except Exception as e:
-            if attempt == max_retries - 1:
+            if attempt == max_retries - 1 or not callable(request) or not is_retryable(e):
+                raise
+            wait = retry_after(e)
+            if wait is not None and wait > max_delay:
                 raise
-            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
-            await asyncio.sleep(delay * (attempt + 1))  # Экспоненциальная задержка
+            if wait is None:
+                # Экспоненциальная задержка с джиттером
+                wait = min(max_delay, delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {wait:.1f}s...")
+            await asyncio.sleep(wait)
 
 
 def generate_external_id(source: str, source_id: str) -> str:
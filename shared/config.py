@@ -54,6 +54,148 @@ class Config(BaseSettings):
         validation_alias="REDIS_URL"
     )
 
+    # Лимиты исходящих сообщений Telegram (бот)
+    BOT_GLOBAL_RATE_LIMIT: float = Field(
+        default=30.0,
+        validation_alias="BOT_GLOBAL_RATE_LIMIT"
+    )
+    BOT_CHAT_RATE_LIMIT: float = Field(
+        default=1.0,
+        validation_alias="BOT_CHAT_RATE_LIMIT"
+    )
+    BOT_CHAT_BURST: int = Field(
+        default=3,
+        validation_alias="BOT_CHAT_BURST"
+    )
+
+    # Метрики и логирование бота
+    BOT_METRICS_PORT: int = Field(
+        default=9100,
+        validation_alias="BOT_METRICS_PORT"
+    )
+    BOT_METRICS_SUMMARY_INTERVAL: float = Field(
+        default=60.0,
+        validation_alias="BOT_METRICS_SUMMARY_INTERVAL"
+    )
+    BOT_LOG_SAMPLE_RATE: float = Field(
+        default=0.1,
+        validation_alias="BOT_LOG_SAMPLE_RATE"
+    )
+
+    # События модерации (Redis Streams)
+    REVIEW_EVENTS_STREAM: str = Field(
+        default="reviews:events",
+        validation_alias="REVIEW_EVENTS_STREAM"
+    )
+    MODERATOR_CHAT_IDS: list[int] = Field(
+        default_factory=list,
+        validation_alias="MODERATOR_CHAT_IDS"
+    )
+
+    # Автодополнение и inline-режим
+    PLACE_INDEX_REFRESH_SECONDS: float = Field(
+        default=300.0,
+        validation_alias="PLACE_INDEX_REFRESH_SECONDS"
+    )
+    INLINE_CACHE_TIME: int = Field(
+        default=300,
+        validation_alias="INLINE_CACHE_TIME"
+    )
+
+    # Пул соединений и запросы к БД (бэкенд)
+    DB_ECHO: bool = Field(
+        default=False,
+        validation_alias="DB_ECHO"
+    )
+    DB_POOL_SIZE: int = Field(
+        default=10,
+        validation_alias="DB_POOL_SIZE"
+    )
+    DB_MAX_OVERFLOW: int = Field(
+        default=10,
+        validation_alias="DB_MAX_OVERFLOW"
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        default=10.0,
+        validation_alias="DB_POOL_TIMEOUT"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        default=1800,
+        validation_alias="DB_POOL_RECYCLE"
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        default=True,
+        validation_alias="DB_POOL_PRE_PING"
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=100,
+        validation_alias="DB_STATEMENT_CACHE_SIZE"
+    )
+    DB_STATEMENT_TIMEOUT_MS: int = Field(
+        default=15000,
+        validation_alias="DB_STATEMENT_TIMEOUT_MS"
+    )
+    DB_SLOW_QUERY_MS: float = Field(
+        default=500.0,
+        validation_alias="DB_SLOW_QUERY_MS"
+    )
+
+    # Реплики для чтения (JSON-список URL; пусто — всё читается с primary)
+    DATABASE_REPLICA_URLS: list[str] = Field(
+        default_factory=list,
+        validation_alias="DATABASE_REPLICA_URLS"
+    )
+    REPLICA_MAX_LAG_SECONDS: float = Field(
+        default=5.0,
+        validation_alias="REPLICA_MAX_LAG_SECONDS"
+    )
+    REPLICA_LAG_CHECK_SECONDS: float = Field(
+        default=5.0,
+        validation_alias="REPLICA_LAG_CHECK_SECONDS"
+    )
+    READ_YOUR_WRITES_SECONDS: float = Field(
+        default=5.0,
+        validation_alias="READ_YOUR_WRITES_SECONDS"
+    )
+
+    # Кэш каталога (города, топ мест) и прогрев при старте бэкенда
+    CATALOG_REFRESH_SECONDS: float = Field(
+        default=60.0,
+        validation_alias="CATALOG_REFRESH_SECONDS"
+    )
+    CATALOG_TOP_LIMIT: int = Field(
+        default=50,
+        validation_alias="CATALOG_TOP_LIMIT"
+    )
+    WARMUP_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        validation_alias="WARMUP_TIMEOUT_SECONDS"
+    )
+
+    # Поиск мест рядом: вес рейтинга против близости (0 — только расстояние)
+    NEARBY_RATING_WEIGHT: float = Field(
+        default=0.3,
+        validation_alias="NEARBY_RATING_WEIGHT"
+    )
+
+    # Архив llm_check отзывов (пустой каталог — архиватор выключен)
+    REVIEW_ARCHIVE_DIR: str = Field(
+        default="",
+        validation_alias="REVIEW_ARCHIVE_DIR"
+    )
+    REVIEW_ARCHIVE_REJECTED_DAYS: int = Field(
+        default=7,
+        validation_alias="REVIEW_ARCHIVE_REJECTED_DAYS"
+    )
+    REVIEW_ARCHIVE_APPROVED_DAYS: int = Field(
+        default=90,
+        validation_alias="REVIEW_ARCHIVE_APPROVED_DAYS"
+    )
+    REVIEW_ARCHIVE_INTERVAL_SECONDS: float = Field(
+        default=3600.0,
+        validation_alias="REVIEW_ARCHIVE_INTERVAL_SECONDS"
+    )
+
     # URLs
     API_BASE_URL: str = Field(
         default="http://localhost:8001/api/v1",  # ← docker-compose:8001 → backend:8000
@@ -0,0 +1,119 @@
+# shared/geo.py
+"""
+Геоутилиты: geohash и расстояние между точками.
+"""
+import math
+from typing import List, Optional, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: idx for idx, char in enumerate(_BASE32)}
+
+EARTH_RADIUS_M = 6_371_000
+METERS_PER_DEGREE = 111_320
+
+# Точность geohash в places.geohash (ячейка ~5 x 5 м); поиск рядом берёт префиксы
+PLACE_GEOHASH_PRECISION = 9
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 7) -> str:
+    """Geohash точки (precision 7 — ячейка примерно 150 x 150 м)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def place_geohash(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """Значение places.geohash (None без координат)"""
+    if latitude is None or longitude is None:
+        return None
+    return geohash_encode(latitude, longitude, PLACE_GEOHASH_PRECISION)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Границы ячейки: (min_lat, min_lon, max_lat, max_lon)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _DECODE[char]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """Сама ячейка и 8 соседних (на полюсах и у антимеридиана — меньше)"""
+    min_lat, min_lon, max_lat, max_lon = geohash_bounds(geohash)
+    d_lat = max_lat - min_lat
+    d_lon = max_lon - min_lon
+    center_lat = (min_lat + max_lat) / 2
+    center_lon = (min_lon + max_lon) / 2
+
+    cells = []
+    for i in (-1, 0, 1):
+        lat = center_lat + i * d_lat
+        if not -90 <= lat <= 90:
+            continue
+        for j in (-1, 0, 1):
+            lon = (center_lon + j * d_lon + 180) % 360 - 180
+            cell = geohash_encode(lat, lon, len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние между точками в метрах"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def geohash_cover(latitude: float, longitude: float, radius_m: float, min_precision: int = 3) -> Optional[List[str]]:
+    """Ячейки (своя + соседние), покрывающие круг радиуса radius_m.
+
+    Берётся самая мелкая точность, у которой ячейка не уже радиуса, — тогда
+    круг целиком лежит в 3 x 3 ячейках. None, если круг больше ячеек min_precision.
+    """
+    for precision in range(PLACE_GEOHASH_PRECISION, min_precision - 1, -1):
+        min_lat, min_lon, max_lat, max_lon = geohash_bounds(geohash_encode(latitude, longitude, precision))
+        height = (max_lat - min_lat) * METERS_PER_DEGREE
+        width = (max_lon - min_lon) * METERS_PER_DEGREE * math.cos(math.radians(latitude))
+        if min(height, width) >= radius_m:
+            return geohash_neighbors(geohash_encode(latitude, longitude, precision))
+    return None
+
+
+def bounding_box(latitude: float, longitude: float, radius_m: float) -> Tuple[float, float, float, float]:
+    """Прямоугольник вокруг круга: (min_lat, min_lon, max_lat, max_lon)"""
+    d_lat = radius_m / METERS_PER_DEGREE
+    d_lon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return latitude - d_lat, longitude - d_lon, latitude + d_lat, longitude + d_lon
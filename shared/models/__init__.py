@@ -3,6 +3,8 @@ from .base import Base
 from .user import User
 from .place import Place
 from .review import Review
+from .place_merge import PlaceMerge
+from .place_stats import PlaceStats
 from .enums import UserRole, ModerationStatus, PlaceCategory, SourceType
 
 __all__ = [
@@ -10,6 +12,8 @@ __all__ = [
     'User', 
     'Place',
     'Review',
+    'PlaceMerge',
+    'PlaceStats',
     'UserRole',
     'ModerationStatus',
     'PlaceCategory',
@@ -1,14 +1,30 @@
 # shared/models/place.py
 import uuid
-from sqlalchemy import Column, String, Text, Float, Integer, Boolean
+from sqlalchemy import Column, String, Text, Float, Integer, Boolean, UniqueConstraint, Index, text, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 from .enums import PlaceCategory, SourceType
+from ..geo import place_geohash
 
 class Place(Base, TimestampMixin):
     """Модель места/мероприятия"""
     __tablename__ = "places"
+    __table_args__ = (
+        # Ключ идемпотентной загрузки парсером (INSERT ... ON CONFLICT)
+        UniqueConstraint("source", "external_id", name="uq_places_source_external_id"),
+        # Keyset-пагинация /places/: порядок выдачи + id, только активные места
+        Index(
+            "ix_places_active_rank",
+            text("rating DESC, rating_count DESC, created_at DESC, id DESC"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_places_active_city_rank",
+            text("city, rating DESC, rating_count DESC, created_at DESC, id DESC"),
+            postgresql_where=text("is_active"),
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False)
@@ -18,9 +34,12 @@ class Place(Base, TimestampMixin):
     address = Column(Text)
     latitude = Column(Float)
     longitude = Column(Float)
+    # Geohash координат для поиска рядом: префикс = ячейка; collation C, чтобы
+    # LIKE 'prefix%' шёл по B-tree индексу
+    geohash = Column(String(12, collation="C"), index=True)
     price_level = Column(Integer, default=2)  # 1-5
-    rating = Column(Float, default=0.0)
-    rating_count = Column(Integer, default=0)
+    rating = Column(Float, default=0.0, server_default="0", nullable=False)
+    rating_count = Column(Integer, default=0, server_default="0", nullable=False)
     source = Column(String(50), default=SourceType.USER, nullable=False)
     external_id = Column(String(255))  # ID из внешнего источника
     external_url = Column(Text)
@@ -29,6 +48,14 @@ class Place(Base, TimestampMixin):
     
     # Связи
     reviews = relationship("Review", back_populates="place")
+    # Агрегаты отзывов (ведёт триггер); грузится вместе с местом одним JOIN
+    stats = relationship("PlaceStats", uselist=False, lazy="joined", viewonly=True)
     
     def __repr__(self):
-        return f"<Place(id={self.id}, name={self.name[:30]}, category={self.category})>"
\ No newline at end of file
+        return f"<Place(id={self.id}, name={self.name[:30]}, category={self.category})>"
+
+@event.listens_for(Place, "before_insert")
+@event.listens_for(Place, "before_update")
+def _sync_geohash(mapper, connection, place):
+    """geohash вслед за координатами (Core-вставки парсера считают его сами)"""
+    place.geohash = place_geohash(place.latitude, place.longitude)
\ No newline at end of file
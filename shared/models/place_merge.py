@@ -0,0 +1,19 @@
+# shared/models/place_merge.py
+import uuid
+from sqlalchemy import Column, String, Float, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from .base import Base, TimestampMixin
+
+class PlaceMerge(Base, TimestampMixin):
+    """Запись о слиянии дубликата места с основным (entity resolution)"""
+    __tablename__ = "place_merges"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    canonical_id = Column(UUID(as_uuid=True), ForeignKey("places.id"), nullable=False, index=True)
+    duplicate_id = Column(UUID(as_uuid=True), ForeignKey("places.id"), nullable=False, unique=True)
+    score = Column(Float, nullable=False)
+    method = Column(String(20), nullable=False)  # batch / ingest
+    details = Column(JSONB)  # Оценки по имени, адресу, расстояние
+    
+    def __repr__(self):
+        return f"<PlaceMerge({self.duplicate_id} -> {self.canonical_id}, score={self.score:.2f})>"
\ No newline at end of file
@@ -0,0 +1,39 @@
+# shared/models/place_stats.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+
+class PlaceStats(Base):
+    """Агрегаты отзывов места.
+    
+    Таблицу ведёт триггер на reviews (миграция 0004): каждая вставка, смена
+    статуса/оценки/места и удаление отзыва применяются как приращение, так что
+    при чтении отзывы не агрегируются. Он же обновляет places.rating и
+    rating_count, пока у места есть одобренные отзывы.
+    """
+    __tablename__ = "place_stats"
+    
+    place_id = Column(UUID(as_uuid=True), ForeignKey("places.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, default=0, server_default="0", nullable=False)  # Все статусы
+    approved_count = Column(Integer, default=0, server_default="0", nullable=False)
+    flagged_count = Column(Integer, default=0, server_default="0", nullable=False)  # flagged_by_llm и rejected
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)  # Сумма одобренных оценок
+    # Распределение одобренных оценок
+    rating_1 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_2 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_3 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_4 = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_5 = Column(Integer, default=0, server_default="0", nullable=False)
+    last_review_at = Column(DateTime(timezone=True))  # Последний одобренный отзыв
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    @property
+    def rating_histogram(self) -> list:
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
+    
+    @property
+    def flagged_ratio(self) -> float:
+        return round(self.flagged_count / self.review_count, 4) if self.review_count else 0.0
+    
+    def __repr__(self):
+        return f"<PlaceStats(place_id={self.place_id}, approved={self.approved_count}, flagged={self.flagged_count})>"
\ No newline at end of file
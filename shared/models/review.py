@@ -1,16 +1,43 @@
 # shared/models/review.py
 import uuid
-from sqlalchemy import Column, String, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index, PrimaryKeyConstraint, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 from .enums import ModerationStatus
 
+# Секции reviews (LIST по moderation_status): очередь модерации и одобренные
+# отзывы — горячие, отклонённые — архив, в который горячие запросы не заходят
+REVIEW_PARTITIONS = {
+    "reviews_queue": (ModerationStatus.PENDING.value, ModerationStatus.FLAGGED_BY_LLM.value),
+    "reviews_approved": (ModerationStatus.APPROVED.value,),
+    "reviews_rejected": (ModerationStatus.REJECTED.value,),
+}
+
 class Review(Base, TimestampMixin):
     """Модель отзыва"""
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Ключ секционирования обязан входить в первичный ключ; id уникален сам
+        # по себе (uuid4), смена статуса переносит строку в другую секцию
+        PrimaryKeyConstraint("id", "moderation_status", name="reviews_pkey"),
+        # Keyset-пагинация очереди модерации и отзывов пользователя
+        Index(
+            "ix_reviews_moderation_queue",
+            "created_at", "id",
+            postgresql_where=text("moderation_status IN ('pending', 'flagged_by_llm')"),
+        ),
+        Index("ix_reviews_user_recent", text("user_id, created_at DESC, id DESC")),
+        # Одобренные отзывы места (лента отзывов, последний отзыв для place_stats)
+        Index(
+            "ix_reviews_place_approved",
+            text("place_id, created_at DESC"),
+            postgresql_where=text("moderation_status = 'approved'"),
+        ),
+        {"postgresql_partition_by": "LIST (moderation_status)"},
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     place_id = Column(UUID(as_uuid=True), ForeignKey("places.id"), nullable=False)
     rating = Column(Integer, nullable=False)  # 1-5
@@ -20,6 +47,7 @@ class Review(Base, TimestampMixin):
     moderated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     moderation_notes = Column(Text)
     llm_check = Column(JSONB)  # Результат проверки LLM
+    llm_check_archive = Column(String(255))  # Файл архива, куда вынесен llm_check
     photos = Column(JSONB)  # Ссылки на фотографии
     
     # Связи
@@ -27,5 +55,19 @@ class Review(Base, TimestampMixin):
     moderator = relationship("User", foreign_keys=[moderated_by], back_populates="moderated_reviews")
     place = relationship("Place", back_populates="reviews")
     
+    # Для ORM отзыв определяется одним id
+    __mapper_args__ = {"primary_key": [id]}
+    
     def __repr__(self):
-        return f"<Review(id={self.id}, rating={self.rating}, status={self.moderation_status})>"
\ No newline at end of file
+        return f"<Review(id={self.id}, rating={self.rating}, status={self.moderation_status})>"
+
+# Секции для create_all (тестовые базы); в рабочей базе их создаёт миграция 0005
+for _name, _statuses in REVIEW_PARTITIONS.items():
+    event.listen(
+        Review.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE {_name} PARTITION OF reviews FOR VALUES IN "
+            f"({', '.join(repr(status) for status in _statuses)})"
+        ).execute_if(dialect="postgresql"),
+    )
\ No newline at end of file
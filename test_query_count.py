@@ -0,0 +1,73 @@
+# test_query_count.py
+import asyncio
+import random
+import uuid
+
+import httpx
+
+# Сколько запросов к БД уходит на пишущий эндпоинт (заголовок X-DB-Query-Count)
+EXPECTED = {
+    "register": 1,        # upsert_user: вставка, смена города или строка как есть
+    "register_again": 1,
+    "create_place": 1,    # insert_place с агрегатами отзывов в том же запросе
+    "create_review": 3,   # review_precheck, review_lock, insert_review
+    "duplicate_review": 1,  # отказ по review_precheck, до LLM
+}
+
+
+def _queries(resp: httpx.Response) -> int:
+    return int(resp.headers["X-DB-Query-Count"])
+
+
+async def test_query_count():
+    base_url = "http://localhost:8000/api/v1"
+    telegram_id = random.randint(10**9, 2 * 10**9)
+    counts = {}
+
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        print("🧪 Тестирование числа запросов к БД...")
+
+        # 1. Регистрация и повторная регистрация с тем же городом
+        print("1. Регистрация пользователя...")
+        user = {"telegram_id": telegram_id, "location": "Moscow", "username": "query_count_test"}
+        resp = await client.post(f"{base_url}/auth/", json=user)
+        assert resp.status_code == 201, resp.text
+        counts["register"] = _queries(resp)
+        resp = await client.post(f"{base_url}/auth/", json=user)
+        assert resp.status_code == 201, resp.text
+        counts["register_again"] = _queries(resp)
+
+        # 2. Новое место
+        print("2. Создание места...")
+        resp = await client.post(f"{base_url}/places/", json={
+            "name": "Кафе для теста запросов",
+            "category": "cafe",
+            "city": "Moscow",
+            "source": "api",
+            "external_id": f"query-count-{uuid.uuid4().hex}",
+        })
+        assert resp.status_code == 201, resp.text
+        counts["create_place"] = _queries(resp)
+        place_id = resp.json()["id"]
+
+        # 3. Отзыв и повторный отзыв на то же место
+        print("3. Создание отзыва...")
+        review = {
+            "review_data": {"place_id": place_id, "rating": 5, "text": "Уютно, вкусный кофе и быстрое обслуживание"},
+            "telegram_id": telegram_id,
+        }
+        resp = await client.post(f"{base_url}/reviews/", json=review)
+        assert resp.status_code == 201, resp.text
+        counts["create_review"] = _queries(resp)
+        resp = await client.post(f"{base_url}/reviews/", json=review)
+        assert resp.status_code == 400, resp.text
+        counts["duplicate_review"] = _queries(resp)
+
+    for name, expected in EXPECTED.items():
+        print(f"   {'✅' if counts[name] == expected else '❌'} {name}: {counts[name]} (ожидалось {expected})")
+    assert counts == EXPECTED, counts
+
+    print("\n✅ Тестирование числа запросов завершено!")
+
+if __name__ == "__main__":
+    asyncio.run(test_query_count())
\ No newline at end of file